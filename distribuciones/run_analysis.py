@@ -3,22 +3,32 @@
 Script auxiliar para ejecutar el análisis de la Actividad 1
 Distribución de Poisson - Radiación Natural
 
-Este script ejecuta el notebook automáticamente y genera todos los archivos.
+Este script ejecuta el análisis del notebook en el mismo proceso (ver
+`src/pipeline.py`) y genera todos los archivos. Solo se regeneran los archivos
+cuyo hash de datos o parámetros cambió; con --notebook se ejecuta el notebook
+con jupyter como antes.
 """
 
+import argparse
+import importlib.util
 import subprocess
 import sys
 import os
+import time
 
-def check_dependencies():
+from src.pipeline import run_pipeline
+
+def check_dependencies(notebook=False):
     """Verifica que todas las dependencias estén instaladas"""
-    required_packages = ['numpy', 'scipy', 'matplotlib', 'pandas', 'seaborn', 'jupyter']
+    required_packages = ['numpy', 'scipy', 'matplotlib', 'pandas']
+    if notebook:
+        required_packages += ['seaborn', 'jupyter']
     missing = []
 
     for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
+        # Solo se busca el paquete, sin importarlo (importar pandas o scipy
+        # tarda más que una ejecución con todo al día)
+        if importlib.util.find_spec(package) is None:
             missing.append(package)
 
     if missing:
@@ -31,10 +41,8 @@ def check_dependencies():
     print("✅ Todas las dependencias están instaladas")
     return True
 
-def check_data_file():
+def check_data_file(data_file):
     """Verifica que el archivo de datos exista"""
-    data_file = 'datosGeigerRadNatural_20251126.txt'
-
     if not os.path.exists(data_file):
         print(f"❌ No se encuentra el archivo de datos: {data_file}")
         return False
@@ -78,6 +86,25 @@ def run_notebook():
         print(f"❌ Error inesperado: {e}")
         return False
 
+def run_analysis(data_file, force=False, seed=42):
+    """Ejecuta el análisis en el mismo proceso, regenerando solo lo desactualizado"""
+    print(f"\n📊 Ejecutando análisis de {data_file}")
+    start = time.perf_counter()
+
+    try:
+        report = run_pipeline(data_file, force=force, seed=seed)
+    except Exception as e:
+        print(f"❌ Error al ejecutar el análisis: {e}")
+        return False
+
+    for name in report['built']:
+        print(f"   🔄 {name} (regenerado)")
+    if report['skipped']:
+        print(f"   ⏭️  {len(report['skipped'])} archivo(s) al día, no se regeneraron")
+
+    print(f"✅ Análisis completado en {time.perf_counter() - start:.2f} s")
+    return True
+
 def check_output_files():
     """Verifica que se hayan generado los archivos de salida"""
     expected_files = [
@@ -144,8 +171,25 @@ def compile_latex():
         print(f"⚠️  Error al compilar: {e}")
         return False
 
-def main():
+def parse_args(argv=None):
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Análisis de la Actividad 1 (Poisson)")
+    parser.add_argument("--data-file", default="datosGeigerRadNatural_20251126.txt",
+                        help="Archivo del contador Geiger")
+    parser.add_argument("--force", action="store_true",
+                        help="Regenerar todos los archivos aunque estén al día")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Semilla de la simulación de Poisson (por defecto: 42)")
+    parser.add_argument("--notebook", action="store_true",
+                        help="Ejecutar el notebook con jupyter nbconvert en lugar del pipeline")
+    parser.add_argument("--no-latex", action="store_true",
+                        help="No intentar compilar el reporte LaTeX")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Función principal"""
+    args = parse_args(argv)
+
     print("="*60)
     print("  Actividad 1: Distribución de Poisson")
     print("  Análisis de Radiación Natural con Contador Geiger")
@@ -153,28 +197,32 @@ def main():
     print()
 
     # 1. Verificar dependencias
-    if not check_dependencies():
+    if not check_dependencies(notebook=args.notebook):
         sys.exit(1)
 
     print()
 
     # 2. Verificar archivo de datos
-    if not check_data_file():
+    if not check_data_file(args.data_file):
         sys.exit(1)
 
     print()
 
-    # 3. Ejecutar notebook
-    if not run_notebook():
-        print("\n⚠️  El notebook no se ejecutó correctamente.")
-        print("    Puedes ejecutarlo manualmente con: jupyter notebook")
+    # 3. Ejecutar el análisis (o el notebook)
+    if args.notebook:
+        if not run_notebook():
+            print("\n⚠️  El notebook no se ejecutó correctamente.")
+            print("    Puedes ejecutarlo manualmente con: jupyter notebook")
+            sys.exit(1)
+    elif not run_analysis(args.data_file, force=args.force, seed=args.seed):
         sys.exit(1)
 
     # 4. Verificar archivos de salida
     check_output_files()
 
     # 5. Intentar compilar LaTeX
-    compile_latex()
+    if not args.no_latex:
+        compile_latex()
 
     print("\n" + "="*60)
     print("✅ Análisis completado")
@@ -0,0 +1,5 @@
+"""
+Módulo de análisis de la distribución de Poisson en datos del contador Geiger
+"""
+
+__version__ = "1.0.0"
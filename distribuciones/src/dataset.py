@@ -0,0 +1,227 @@
+"""
+Índice de registros del contador Geiger por fecha, con caché binaria.
+
+Cada archivo `datosGeiger..._AAAAMMDD.txt` se indexa por su fecha de toma.
+Las cuentas por intervalo se leen una sola vez (con `geiger_io`, reinicios
+empalmados) y se guardan como `.npy` con el tipo entero más pequeño que las
+contiene; las lecturas siguientes abren el `.npy` con memmap sin volver a
+interpretar el texto. La caché se invalida si cambia el tamaño o la fecha de
+modificación del archivo de texto.
+
+Las cuentas se pueden reagrupar en intervalos múltiplos del intervalo base
+(10 s → 30 s, 60 s, 10 min) sumando bloques con `reshape`, sin bucles sobre
+los datos. Los intervalos no cruzan de un archivo a otro (cada archivo es
+una toma distinta) y los intervalos incompletos al final se descartan.
+"""
+
+import datetime
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+
+from .geiger_io import load_interval_counts
+from .online_stats import OnlinePoissonStats
+
+
+# Intervalo de muestreo de los registros (s)
+BASE_INTERVAL = 10
+
+# Ventana de los eventos esperados de la tabla resumen (3 min)
+WINDOW_SECONDS = 180
+
+DEFAULT_PATTERN = 'datosGeiger*.txt'
+CACHE_DIR_NAME = '.geiger_cache'
+
+_DATE = re.compile(r'(\d{8})')
+
+
+def rebin(counts, factor):
+    """
+    Suma bloques de `factor` intervalos consecutivos.
+
+    Parameters:
+    -----------
+    counts : numpy.ndarray
+        Cuentas por intervalo
+    factor : int
+        Intervalos base por intervalo nuevo
+
+    Returns:
+    --------
+    rebinned : numpy.ndarray
+        Cuentas por intervalo nuevo (int64); se descartan los intervalos
+        base sobrantes al final
+    """
+    counts = np.asarray(counts)
+    n_bins = counts.size // factor
+    return counts[:n_bins * factor].reshape(n_bins, factor).sum(axis=1, dtype=np.int64)
+
+
+def acquisition_date(path):
+    """Fecha de toma a partir del nombre del archivo (AAAAMMDD), o None"""
+    match = _DATE.search(Path(path).stem)
+    if match is None:
+        return None
+    try:
+        return datetime.datetime.strptime(match.group(1), '%Y%m%d').date()
+    except ValueError:
+        return None
+
+
+def _as_date(value):
+    """Acepta datetime.date o texto 'AAAAMMDD' / 'AAAA-MM-DD'"""
+    if value is None or isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(value) if '-' in value else \
+        datetime.datetime.strptime(value, '%Y%m%d').date()
+
+
+class GeigerDataset:
+    """
+    Colección de registros del contador Geiger indexada por fecha.
+
+    Parameters:
+    -----------
+    directory : str or pathlib.Path
+        Directorio con los registros
+    pattern : str
+        Patrón de nombres de archivo
+    cache_dir : str or pathlib.Path, optional
+        Directorio de la caché `.npy` (por defecto, `.geiger_cache` dentro
+        de `directory`)
+    base_interval : int
+        Intervalo de muestreo de los registros (s)
+    """
+
+    def __init__(self, directory, pattern=DEFAULT_PATTERN, cache_dir=None,
+                 base_interval=BASE_INTERVAL):
+        self.directory = Path(directory)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.directory / CACHE_DIR_NAME
+        self.base_interval = base_interval
+
+        self.index = {}
+        for path in sorted(self.directory.glob(pattern)):
+            date = acquisition_date(path)
+            if date is not None:
+                self.index.setdefault(date, []).append(path)
+
+    def __len__(self):
+        return sum(len(paths) for paths in self.index.values())
+
+    def __repr__(self):
+        dates = self.dates
+        span = f"{dates[0]} a {dates[-1]}" if dates else "vacío"
+        return f"GeigerDataset({len(self)} archivo(s), {span})"
+
+    @property
+    def dates(self):
+        """Fechas de toma disponibles, en orden"""
+        return sorted(self.index)
+
+    def files(self, start=None, end=None):
+        """Archivos con fecha entre `start` y `end` (inclusive), en orden"""
+        start, end = _as_date(start), _as_date(end)
+        return [path for date in self.dates
+                if (start is None or date >= start) and (end is None or date <= end)
+                for path in self.index[date]]
+
+    def _cache_path(self, path):
+        """Archivo de caché ligado al tamaño y la fecha de modificación del texto"""
+        st = path.stat()
+        return self.cache_dir / f"{path.stem}_{st.st_size}_{st.st_mtime_ns}.npy"
+
+    def load(self, path):
+        """
+        Cuentas por intervalo base de un archivo, desde la caché si está al día.
+
+        Returns:
+        --------
+        counts : numpy.ndarray
+            Cuentas por intervalo (memmap de solo lectura)
+        """
+        path = Path(path)
+        cache_path = self._cache_path(path)
+        if cache_path.exists():
+            try:
+                return np.load(cache_path, mmap_mode='r')
+            except (ValueError, OSError):
+                # Caché dañada (p. ej. truncada a mano o por un disco lleno):
+                # se reconstruye
+                cache_path.unlink()
+
+        counts, _ = load_interval_counts(path)
+        dtype = np.min_scalar_type(int(counts.max())) if counts.size else np.uint8
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Se borran las cachés anteriores del mismo archivo
+        for old in self.cache_dir.glob(f"{path.stem}_*_*.npy"):
+            if re.fullmatch(rf"{re.escape(path.stem)}_\d+_\d+", old.stem):
+                old.unlink()
+        # Escritura atómica: una escritura interrumpida nunca deja un `.npy`
+        # truncado con el nombre definitivo (como la caché de imágenes de
+        # `proyecto_final`)
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, counts.astype(dtype))
+        os.replace(tmp_path, cache_path)
+
+        return np.load(cache_path, mmap_mode='r')
+
+    def _factor(self, interval):
+        """Número de intervalos base por intervalo de `interval` segundos"""
+        factor, remainder = divmod(interval, self.base_interval)
+        if remainder or factor < 1:
+            raise ValueError(f"El intervalo ({interval} s) debe ser múltiplo de "
+                             f"{self.base_interval} s")
+        return int(factor)
+
+    def segments(self, interval=None, start=None, end=None):
+        """
+        Cuentas reagrupadas de cada archivo por separado.
+
+        Returns:
+        --------
+        segments : list of numpy.ndarray
+            Un arreglo por archivo, en orden de fecha
+        """
+        factor = self._factor(interval or self.base_interval)
+        return [rebin(self.load(path), factor) for path in self.files(start, end)]
+
+    def counts(self, interval=None, start=None, end=None):
+        """
+        Cuentas por intervalo de `interval` segundos de todos los archivos
+        entre `start` y `end`.
+
+        Parameters:
+        -----------
+        interval : int, optional
+            Duración del intervalo en s (múltiplo de `base_interval`)
+        start, end : datetime.date or str, optional
+            Rango de fechas (inclusive), p. ej. '20251126'
+
+        Returns:
+        --------
+        counts : numpy.ndarray
+            Cuentas por intervalo (int64)
+        """
+        segments = self.segments(interval, start, end)
+        return np.concatenate(segments) if segments else np.empty(0, dtype=np.int64)
+
+    def summary(self, interval=None, start=None, end=None, **kwargs):
+        """
+        Estadísticas de Poisson (`OnlinePoissonStats.snapshot`) para un
+        intervalo; `kwargs` se pasan a `OnlinePoissonStats`. Por defecto la
+        ventana de eventos esperados sigue siendo de 3 minutos.
+        """
+        interval = interval or self.base_interval
+        kwargs.setdefault('window_intervals', WINDOW_SECONDS / interval)
+        online = OnlinePoissonStats(**kwargs)
+        for segment in self.segments(interval, start, end):
+            online.update_many(segment)
+        return online.snapshot()
+
+    def summaries(self, intervals=(10, 30, 60, 600), start=None, end=None, **kwargs):
+        """Estadísticas de Poisson para varias duraciones de intervalo"""
+        return {interval: self.summary(interval, start, end, **kwargs) for interval in intervals}
@@ -0,0 +1,217 @@
+"""
+Lectura por bloques de los registros del contador Geiger.
+
+Los archivos (p. ej. `datosGeigerRadNatural_20251126.txt`) tienen una cuenta
+acumulada por línea, mezclada con mensajes del sistema. `load_geiger_data`
+del notebook los lee línea por línea con `int(line)` y luego descarta las
+diferencias negativas, con lo que se pierde el intervalo siguiente a cada
+reinicio del contador.
+
+Aquí el archivo se lee en bloques de bytes que se convierten a enteros de
+forma vectorizada, así que registros de varios días (millones de líneas) se
+procesan con memoria acotada por `chunk_bytes`. Los reinicios se empalman:
+tras un reinicio el contador vuelve a cero, de modo que las cuentas del
+intervalo son el nuevo valor acumulado.
+"""
+
+import numpy as np
+
+
+# Tamaño por defecto de los bloques leídos del archivo (bytes)
+DEFAULT_CHUNK_BYTES = 4 * 2 ** 20
+
+# Un int64 admite hasta 18 dígitos sin desbordarse
+_MAX_DIGITS = 18
+
+_POWERS_OF_TEN = 10 ** np.arange(_MAX_DIGITS + 1, dtype=np.int64)
+_NEWLINE = ord('\n')
+_WHITESPACE = np.zeros(256, dtype=bool)
+_WHITESPACE[list(b' \t\r\n\v\f')] = True
+
+
+def parse_counts(buffer):
+    """
+    Convierte un bloque de líneas completas en enteros, sin bucles de Python.
+
+    Solo se aceptan las líneas formadas por un número de dígitos (con
+    espacios opcionales alrededor); las demás (mensajes del sistema, líneas
+    vacías) se ignoran, como el `try: int(line)` del notebook.
+
+    Parameters:
+    -----------
+    buffer : bytes
+        Texto del archivo (ASCII) con líneas completas
+
+    Returns:
+    --------
+    values : numpy.ndarray
+        Valores de las líneas válidas, en orden (int64)
+    """
+    b = np.frombuffer(buffer, dtype=np.uint8)
+    if b.size == 0:
+        return np.empty(0, dtype=np.int64)
+
+    newline = b == _NEWLINE
+    # Línea a la que pertenece cada byte (el salto de línea cierra su línea)
+    line = np.cumsum(newline, dtype=np.int32)
+    line -= newline
+    n_lines = int(line[-1]) + 1
+
+    digit = (b >= ord('0')) & (b <= ord('9'))
+    other = ~(digit | _WHITESPACE[b])
+    run_start = digit.copy()
+    run_start[1:] &= ~digit[:-1]
+
+    # Válida: un solo grupo de dígitos y ningún otro carácter
+    valid = np.bincount(line[run_start], minlength=n_lines) == 1
+    valid &= np.bincount(line[other], minlength=n_lines) == 0
+
+    positions = np.flatnonzero(digit & valid[line])
+    if positions.size == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Los dígitos de cada línea son contiguos: inicio y longitud de cada grupo
+    starts = np.flatnonzero(run_start[positions])
+    lengths = np.diff(np.append(starts, positions.size))
+
+    # Exponente de cada dígito: dígitos que le siguen en su grupo (los grupos
+    # demasiado largos se descartan al final)
+    exponent = np.repeat(positions[starts + lengths - 1], lengths) - positions
+    np.minimum(exponent, _MAX_DIGITS, out=exponent)
+    weighted = (b[positions] - ord('0')) * _POWERS_OF_TEN[exponent]
+    values = np.add.reduceat(weighted, starts)
+    return values[lengths <= _MAX_DIGITS]
+
+
+def iter_cumulative_counts(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Recorre las cuentas acumuladas de un registro en bloques.
+
+    Parameters:
+    -----------
+    path : str or pathlib.Path
+        Archivo del contador Geiger
+    chunk_bytes : int
+        Bytes leídos por bloque (acota la memoria usada)
+
+    Yields:
+    -------
+    values : numpy.ndarray
+        Cuentas acumuladas de las líneas válidas del bloque (int64, no vacío)
+    """
+    tail = b''
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b'\n') + 1
+            # Una línea incompleta al final del bloque pasa al siguiente
+            tail = block[cut:]
+            values = parse_counts(block[:cut])
+            if values.size:
+                yield values
+
+    values = parse_counts(tail)
+    if values.size:
+        yield values
+
+
+def splice_resets(cumulative, previous=None):
+    """
+    Cuentas por intervalo a partir de cuentas acumuladas, empalmando reinicios.
+
+    Una diferencia negativa indica que el contador se reinició a cero durante
+    el intervalo; las cuentas de ese intervalo son entonces el nuevo valor
+    acumulado (en lugar de descartarlo).
+
+    Parameters:
+    -----------
+    cumulative : numpy.ndarray
+        Cuentas acumuladas
+    previous : int, optional
+        Último valor acumulado del bloque anterior. Si no se da, el primer
+        valor solo sirve de referencia (como `np.diff` en el notebook).
+
+    Returns:
+    --------
+    intervals : numpy.ndarray
+        Cuentas por intervalo (int64)
+    resets : numpy.ndarray
+        Máscara booleana de los intervalos con reinicio
+    """
+    cumulative = np.asarray(cumulative, dtype=np.int64)
+    if previous is None:
+        intervals = np.diff(cumulative)
+        current = cumulative[1:]
+    else:
+        intervals = np.diff(cumulative, prepend=previous)
+        current = cumulative
+
+    resets = intervals < 0
+    intervals[resets] = current[resets]
+    return intervals, resets
+
+
+def iter_interval_counts(path, chunk_bytes=DEFAULT_CHUNK_BYTES, with_resets=False):
+    """
+    Recorre las cuentas por intervalo de un registro en bloques.
+
+    El último valor acumulado de cada bloque se usa como referencia del
+    siguiente, así que el resultado no depende de `chunk_bytes`.
+
+    Parameters:
+    -----------
+    path : str or pathlib.Path
+        Archivo del contador Geiger
+    chunk_bytes : int
+        Bytes leídos por bloque
+    with_resets : bool
+        Si True, también se entregan los índices (globales) de los
+        intervalos con reinicio del contador
+
+    Yields:
+    -------
+    intervals : numpy.ndarray
+        Cuentas por intervalo del bloque (int64)
+    reset_indices : numpy.ndarray
+        Solo si with_resets=True: índices de los intervalos con reinicio
+    """
+    previous = None
+    offset = 0
+    for cumulative in iter_cumulative_counts(path, chunk_bytes):
+        intervals, resets = splice_resets(cumulative, previous)
+        previous = cumulative[-1]
+        if intervals.size:
+            if with_resets:
+                yield intervals, np.flatnonzero(resets) + offset
+            else:
+                yield intervals
+        offset += intervals.size
+
+
+def load_cumulative_counts(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Todas las cuentas acumuladas del archivo (reemplaza `load_geiger_data`)"""
+    chunks = list(iter_cumulative_counts(path, chunk_bytes))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+
+def load_interval_counts(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Todas las cuentas por intervalo del archivo, con los reinicios empalmados.
+
+    Returns:
+    --------
+    intervals : numpy.ndarray
+        Cuentas por intervalo (int64)
+    reset_indices : numpy.ndarray
+        Índices de los intervalos con reinicio del contador
+    """
+    intervals, resets = [], []
+    for chunk, reset_indices in iter_interval_counts(path, chunk_bytes, with_resets=True):
+        intervals.append(chunk)
+        resets.append(reset_indices)
+    if not intervals:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.intp)
+    return np.concatenate(intervals), np.concatenate(resets)
@@ -0,0 +1,257 @@
+"""
+Pruebas de bondad de ajuste a Poisson con distribuciones nulas de Monte Carlo.
+
+El notebook cuenta las frecuencias con `np.sum(data == v)` para cada valor
+(O(N·K)), cuenta las rachas con un bucle y compara con una sola simulación
+(`np.random.seed(42)`). Aquí:
+
+- Las frecuencias salen de `np.bincount` y las rachas de diferencias de
+  arreglos. Todas las estadísticas aceptan un arreglo (B, n) y se calculan a
+  la vez para los B experimentos.
+- Las distribuciones nulas de χ², varianza/media y número de rachas se
+  obtienen simulando miles de experimentos de Poisson en lotes (B, n). El
+  número de filas B se ajusta a un presupuesto de elementos por lote, así
+  que la memoria no crece con la longitud n de la serie. Cada lote usa su
+  propio flujo `SeedSequence`, así que los resultados son reproducibles e
+  independientes del número de procesos (pero sí dependen del tamaño de
+  los lotes).
+- En cada experimento simulado λ se vuelve a estimar con su propia media, como
+  se hace con los datos (bootstrap paramétrico), para que los p-valores
+  tengan en cuenta el parámetro ajustado.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import stats
+
+
+# Frecuencia esperada mínima de los bins del χ² (como en el notebook)
+MIN_EXPECTED = 5
+
+# Máximo de experimentos simulados por lote
+BATCH_SIZE = 1000
+
+# Elementos (experimentos × intervalos) por lote: un arreglo int64 de 16 MB,
+# unos 30 MB de pico con las copias de la mediana, las rachas y el bincount. Para
+# series largas (una semana de intervalos de 10 s, n ≈ 60 000) los lotes
+# tienen menos de BATCH_SIZE filas.
+BATCH_ELEMENTS = 2 ** 21
+
+
+def observed_frequencies(data, minlength=0):
+    """
+    Frecuencias de cada número de cuentas con `np.bincount`.
+
+    Parameters:
+    -----------
+    data : numpy.ndarray
+        Cuentas por intervalo (n,) o experimentos (B, n)
+    minlength : int
+        Número mínimo de bins
+
+    Returns:
+    --------
+    frequencies : numpy.ndarray
+        frequencies[..., k] = número de intervalos con k cuentas
+    """
+    data = np.asarray(data, dtype=np.int64)
+    if data.ndim == 1:
+        return np.bincount(data, minlength=minlength)
+
+    n_bins = max(minlength, int(data.max()) + 1 if data.size else 0)
+    # Un bincount para todos los experimentos: cada fila en su propio rango
+    offsets = np.arange(data.shape[0])[:, np.newaxis] * n_bins
+    flat = np.bincount((data + offsets).ravel(), minlength=data.shape[0] * n_bins)
+    return flat.reshape(data.shape[0], n_bins)
+
+
+def count_runs(data):
+    """
+    Número de rachas por encima/debajo de la mediana (`runs_test` del
+    notebook). Restar λ no cambia las rachas, así que se puede pasar la serie
+    o sus residuos.
+
+    Parameters:
+    -----------
+    data : numpy.ndarray
+        Serie (n,) o experimentos (B, n)
+
+    Returns:
+    --------
+    runs : int or numpy.ndarray
+        Número de rachas (uno por experimento)
+    """
+    data = np.asarray(data)
+    above = data > np.median(data, axis=-1, keepdims=True)
+    return 1 + np.count_nonzero(above[..., 1:] != above[..., :-1], axis=-1)
+
+
+def dispersion_index(data):
+    """Razón varianza/media (ddof=1) de la serie o de cada experimento"""
+    data = np.asarray(data)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.var(data, axis=-1, ddof=1) / np.mean(data, axis=-1)
+
+
+def chi_square_statistic(data, lam=None, min_expected=MIN_EXPECTED):
+    """
+    Estadístico χ² de bondad de ajuste, como en el notebook: se usan los
+    valores observados cuya frecuencia esperada es al menos `min_expected` y
+    las esperadas se reescalan para que sumen lo mismo que las observadas.
+
+    Parameters:
+    -----------
+    data : numpy.ndarray
+        Cuentas por intervalo (n,) o experimentos (B, n)
+    lam : float or numpy.ndarray, optional
+        λ de la Poisson (por defecto, la media de cada experimento)
+    min_expected : float
+        Frecuencia esperada mínima de un bin
+
+    Returns:
+    --------
+    chi2 : float or numpy.ndarray
+        Estadístico χ² (NaN si ningún bin cumple la condición)
+    """
+    data = np.asarray(data, dtype=np.int64)
+    batch = np.atleast_2d(data)
+    n = batch.shape[1]
+    lam = batch.mean(axis=1) if lam is None else np.broadcast_to(lam, batch.shape[:1])
+
+    observed = observed_frequencies(batch).astype(float)
+    k = np.arange(observed.shape[1])
+    expected = n * stats.poisson.pmf(k, lam[:, np.newaxis])
+
+    mask = (observed > 0) & (expected >= min_expected)
+    observed *= mask
+    expected *= mask
+    with np.errstate(invalid='ignore', divide='ignore'):
+        expected *= (observed.sum(axis=1) / expected.sum(axis=1))[:, np.newaxis]
+        terms = np.where(mask, (observed - expected) ** 2 / expected, 0.0)
+    chi2 = np.where(mask.any(axis=1), terms.sum(axis=1), np.nan)
+
+    return chi2 if data.ndim > 1 else float(chi2[0])
+
+
+def poisson_statistics(data, min_expected=MIN_EXPECTED):
+    """
+    Estadísticos de bondad de ajuste de una serie o de un lote de experimentos.
+
+    Returns:
+    --------
+    statistics : dict
+        'chi2', 'dispersion' (varianza/media) y 'runs'
+    """
+    return {
+        'chi2': chi_square_statistic(data, min_expected=min_expected),
+        'dispersion': dispersion_index(data),
+        'runs': count_runs(data),
+    }
+
+
+def _simulate_batch(seed_sequence, lam, n, size, min_expected):
+    """Simula `size` experimentos de n intervalos y calcula sus estadísticos"""
+    rng = np.random.default_rng(seed_sequence)
+    return poisson_statistics(rng.poisson(lam, size=(size, n)), min_expected)
+
+
+def batch_rows(n, batch_elements=BATCH_ELEMENTS, max_rows=BATCH_SIZE):
+    """Experimentos por lote para series de n intervalos (al menos uno)"""
+    return max(1, min(max_rows, batch_elements // max(n, 1)))
+
+
+def simulate_null(lam, n, n_experiments=10000, seed=42, batch_size=None,
+                  n_jobs=None, min_expected=MIN_EXPECTED):
+    """
+    Distribuciones nulas de los estadísticos bajo Poisson(λ).
+
+    Parameters:
+    -----------
+    lam : float
+        λ de la Poisson simulada
+    n : int
+        Intervalos por experimento (el tamaño de la serie observada)
+    n_experiments : int
+        Número de experimentos simulados
+    seed : int
+        Semilla raíz; cada lote usa un flujo hijo de `SeedSequence(seed)`.
+        Los valores simulados dependen de la semilla y del tamaño de los
+        lotes: con otro `batch_size` (o, por defecto, otro n que cambie
+        `batch_rows(n)`) la misma semilla da otra muestra
+    batch_size : int, optional
+        Experimentos por lote (arreglo (batch_size, n)); por defecto
+        `batch_rows(n)`, limitado por `BATCH_ELEMENTS`
+    n_jobs : int, optional
+        Si es mayor que 1, los lotes se reparten en un pool de procesos. El
+        resultado no depende de n_jobs.
+    min_expected : float
+        Frecuencia esperada mínima de los bins del χ²
+
+    Returns:
+    --------
+    null : dict
+        'chi2', 'dispersion' y 'runs': arreglos de n_experiments valores
+    """
+    batch_size = batch_size or batch_rows(n)
+    sizes = [min(batch_size, n_experiments - start)
+             for start in range(0, n_experiments, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(child, lam, n, size, min_expected) for child, size in zip(seeds, sizes)]
+
+    if not n_jobs or n_jobs <= 1:
+        batches = [_simulate_batch(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            batches = list(pool.map(_simulate_batch, *zip(*args)))
+
+    return {key: np.concatenate([batch[key] for batch in batches]) for key in batches[0]}
+
+
+def _p_value(null, observed, alternative):
+    """p-valor de Monte Carlo con la corrección (1 + r)/(1 + B)"""
+    null = null[np.isfinite(null)]
+    upper = (1 + np.count_nonzero(null >= observed)) / (1 + null.size)
+    if alternative == 'greater':
+        return upper
+    lower = (1 + np.count_nonzero(null <= observed)) / (1 + null.size)
+    return min(1.0, 2 * min(upper, lower))
+
+
+def monte_carlo_test(data, n_experiments=10000, seed=42, batch_size=None, n_jobs=None,
+                     min_expected=MIN_EXPECTED):
+    """
+    Pruebas de Monte Carlo de que la serie sigue una distribución de Poisson.
+
+    El χ² es de una cola (valores grandes indican mal ajuste); la razón
+    varianza/media y las rachas son de dos colas (sobre- o subdispersión,
+    demasiadas o muy pocas rachas).
+
+    Parameters:
+    -----------
+    data : numpy.ndarray
+        Cuentas por intervalo observadas
+    n_experiments, seed, batch_size, n_jobs, min_expected :
+        Ver `simulate_null`
+
+    Returns:
+    --------
+    results : dict
+        Para 'chi2', 'dispersion' y 'runs': dict con 'observed', 'p_value'
+        y 'null' (distribución simulada). También 'lambda' y 'n'.
+    """
+    data = np.asarray(data, dtype=np.int64)
+    lam = float(data.mean())
+    observed = poisson_statistics(data, min_expected)
+    null = simulate_null(lam, data.size, n_experiments, seed, batch_size, n_jobs, min_expected)
+
+    alternatives = {'chi2': 'greater', 'dispersion': 'two-sided', 'runs': 'two-sided'}
+    results = {'lambda': lam, 'n': data.size}
+    for key, alternative in alternatives.items():
+        value = float(observed[key])
+        results[key] = {
+            'observed': value,
+            'p_value': _p_value(null[key], value, alternative),
+            'null': null[key],
+        }
+    return results
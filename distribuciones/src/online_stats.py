@@ -0,0 +1,253 @@
+"""
+Estadísticas de Poisson en línea para el monitoreo del contador Geiger.
+
+`OnlinePoissonStats` se alimenta intervalo por intervalo (o por bloques) y no
+guarda la serie: mantiene la media y la varianza con el algoritmo de Welford
+y un histograma de cuentas enteras. Como las cuentas son enteros pequeños, los
+cuartiles y los límites IQR de outliers se obtienen exactamente del histograma
+(igual que `np.percentile` del notebook), y también las estadísticas de los
+datos sin outliers. Así `snapshot()` da en cualquier momento los números de la
+tabla resumen sin volver a recorrer el historial.
+"""
+
+import numpy as np
+from scipy import stats
+
+from .geiger_io import iter_interval_counts
+
+
+# Parámetros de la tabla resumen del notebook
+IQR_FACTOR = 1.5
+PROBABILITY_RANGE = (2, 5)
+WINDOW_INTERVALS = 18  # 3 minutos = 18 intervalos de 10 s
+
+
+def histogram_quantile(histogram, q):
+    """
+    Cuantil `q` (0-1) de los datos descritos por un histograma de enteros.
+
+    Usa la interpolación lineal de `np.percentile`, así que coincide con
+    `np.percentile(datos, 100*q)` sobre la serie completa.
+
+    Parameters:
+    -----------
+    histogram : numpy.ndarray
+        histogram[k] = número de intervalos con k cuentas
+    q : float
+        Cuantil entre 0 y 1
+
+    Returns:
+    --------
+    value : float
+        Valor del cuantil
+    """
+    cumulative = np.cumsum(histogram)
+    n = int(cumulative[-1]) if cumulative.size else 0
+    if n == 0:
+        return np.nan
+
+    position = (n - 1) * q
+    lower = int(np.floor(position))
+    upper = min(lower + 1, n - 1)
+    # El i-ésimo dato ordenado es el primer k con más de i datos acumulados
+    x_lower, x_upper = np.searchsorted(cumulative, [lower, upper], side='right')
+    return float(x_lower + (position - lower) * (x_upper - x_lower))
+
+
+class OnlinePoissonStats:
+    """
+    Estadísticas incrementales de cuentas por intervalo.
+
+    Parameters:
+    -----------
+    iqr_factor : float
+        Factor del criterio de outliers Q1 - f·IQR, Q3 + f·IQR
+    probability_range : tuple of int
+        Rango (k_min, k_max) de la probabilidad P(k_min ≤ k ≤ k_max)
+    window_intervals : int
+        Intervalos de la ventana para los eventos esperados (3 min = 18)
+    """
+
+    def __init__(self, iqr_factor=IQR_FACTOR, probability_range=PROBABILITY_RANGE,
+                 window_intervals=WINDOW_INTERVALS):
+        self.iqr_factor = iqr_factor
+        self.probability_range = probability_range
+        self.window_intervals = window_intervals
+
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.histogram = np.zeros(0, dtype=np.int64)
+        self._previous = None
+
+    def __len__(self):
+        return self.n
+
+    @classmethod
+    def from_file(cls, path, chunk_bytes=None, **kwargs):
+        """Estadísticas de un registro completo, leído por bloques"""
+        online = cls(**kwargs)
+        options = {} if chunk_bytes is None else {'chunk_bytes': chunk_bytes}
+        for counts in iter_interval_counts(path, **options):
+            online.update_many(counts)
+        return online
+
+    def _grow(self, size):
+        """Amplía el histograma hasta `size` bins"""
+        if size > self.histogram.size:
+            self.histogram = np.pad(self.histogram, (0, size - self.histogram.size))
+
+    def update(self, count):
+        """
+        Agrega las cuentas de un intervalo (actualización de Welford).
+
+        Parameters:
+        -----------
+        count : int
+            Cuentas del intervalo (no negativas)
+        """
+        count = int(count)
+        if count < 0:
+            raise ValueError(f"Cuentas negativas: {count}")
+
+        self.n += 1
+        delta = count - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (count - self.mean)
+
+        self._grow(count + 1)
+        self.histogram[count] += 1
+
+    def update_many(self, counts):
+        """
+        Agrega un bloque de intervalos: se combinan la media y la varianza
+        del bloque con las acumuladas (fórmula de Chan et al.).
+
+        Parameters:
+        -----------
+        counts : numpy.ndarray
+            Cuentas por intervalo (enteros no negativos)
+        """
+        counts = np.asarray(counts, dtype=np.int64)
+        if counts.size == 0:
+            return
+        if counts.min() < 0:
+            raise ValueError("Cuentas negativas en el bloque")
+
+        n_block = counts.size
+        mean_block = counts.mean()
+        m2_block = float(np.sum((counts - mean_block) ** 2))
+
+        n = self.n + n_block
+        delta = mean_block - self.mean
+        self.mean += delta * n_block / n
+        self._m2 += m2_block + delta ** 2 * self.n * n_block / n
+        self.n = n
+
+        block_histogram = np.bincount(counts)
+        self._grow(block_histogram.size)
+        self.histogram[:block_histogram.size] += block_histogram
+
+    def update_cumulative(self, value):
+        """
+        Agrega una lectura acumulada del contador (monitoreo en vivo).
+
+        La primera lectura solo sirve de referencia. Si el contador se
+        reinicia (valor menor que el anterior), las cuentas del intervalo son
+        el nuevo valor, como en `geiger_io.splice_resets`.
+        """
+        value = int(value)
+        if self._previous is not None:
+            count = value - self._previous
+            self.update(value if count < 0 else count)
+        self._previous = value
+
+    def merge(self, other):
+        """Combina con las estadísticas de otra serie (p. ej. otro proceso)"""
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self._m2 += other._m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+
+        self._grow(other.histogram.size)
+        self.histogram[:other.histogram.size] += other.histogram
+        return self
+
+    @property
+    def variance(self):
+        """Varianza muestral (ddof=1) de todos los intervalos"""
+        return self._m2 / (self.n - 1) if self.n > 1 else np.nan
+
+    def quartiles(self):
+        """Cuartiles Q1, Q2 y Q3 de todos los intervalos"""
+        return tuple(histogram_quantile(self.histogram, q) for q in (0.25, 0.5, 0.75))
+
+    def outlier_bounds(self):
+        """Límites inferior y superior del criterio IQR"""
+        q1, _, q3 = self.quartiles()
+        iqr = q3 - q1
+        return q1 - self.iqr_factor * iqr, q3 + self.iqr_factor * iqr
+
+    def cleaned_histogram(self):
+        """Histograma de los intervalos dentro de los límites IQR"""
+        lower, upper = self.outlier_bounds()
+        k = np.arange(self.histogram.size)
+        return np.where((k >= lower) & (k <= upper), self.histogram, 0)
+
+    def snapshot(self):
+        """
+        Números de la tabla resumen del notebook con los datos hasta ahora.
+
+        Las estadísticas 'lambda' a 'events_window' son de los datos sin
+        outliers, como en el notebook; 'raw_mean' y 'raw_std' son de todos
+        los intervalos.
+
+        Returns:
+        --------
+        summary : dict
+            'n_total', 'n_outliers', 'lambda', 'std', 'variance',
+            'dispersion' (varianza/media), 'prob_range', 'events_window',
+            'quartiles', 'bounds', 'raw_mean', 'raw_std' y 'theoretical'
+            (dict con 'lambda', 'std', 'variance', 'dispersion',
+            'prob_range' y 'events_window' de la Poisson con el λ medido)
+        """
+        cleaned = self.cleaned_histogram()
+        n_clean = int(cleaned.sum())
+        k = np.arange(cleaned.size)
+
+        if n_clean > 0:
+            lam = float(np.dot(k, cleaned) / n_clean)
+            variance = float(np.dot((k - lam) ** 2, cleaned) / (n_clean - 1)) \
+                if n_clean > 1 else np.nan
+        else:
+            lam = variance = np.nan
+
+        k_min, k_max = self.probability_range
+        prob = float(cleaned[k_min:k_max + 1].sum() / n_clean) if n_clean else np.nan
+        prob_theoretical = float(stats.poisson.cdf(k_max, lam) - stats.poisson.cdf(k_min - 1, lam))
+
+        return {
+            'n_total': n_clean,
+            'n_outliers': self.n - n_clean,
+            'lambda': lam,
+            'std': float(np.sqrt(variance)),
+            'variance': variance,
+            'dispersion': variance / lam if lam else np.nan,
+            'prob_range': prob,
+            'events_window': prob * self.window_intervals,
+            'quartiles': self.quartiles(),
+            'bounds': self.outlier_bounds(),
+            'raw_mean': float(self.mean) if self.n else np.nan,
+            'raw_std': float(np.sqrt(self.variance)),
+            'theoretical': {
+                'lambda': lam,
+                'std': float(np.sqrt(lam)),
+                'variance': lam,
+                'dispersion': 1.0,
+                'prob_range': prob_theoretical,
+                'events_window': prob_theoretical * self.window_intervals,
+            },
+        }
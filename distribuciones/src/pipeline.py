@@ -0,0 +1,146 @@
+"""
+Análisis de Poisson del notebook `Actividad1_Poisson.ipynb` como pipeline.
+
+Genera los mismos ocho archivos que el notebook (datos limpios y simulados,
+tabla resumen en CSV y LaTeX y las cuatro figuras) sin arrancar un kernel de
+Jupyter ni reescribir el notebook.
+
+Cada archivo lleva una clave: el hash SHA-256 del archivo de datos junto con
+los parámetros de los que depende. Las claves se guardan en un manifiesto
+(`.pipeline_manifest.json`) en el directorio de salida; al volver a ejecutar
+solo se reconstruyen los archivos que faltan o cuya clave cambió. Si todo
+está al día no se lee el archivo de datos más que para el hash, y el módulo
+`report` (pandas, scipy y matplotlib) ni siquiera se importa.
+"""
+
+import hashlib
+import importlib
+import json
+from pathlib import Path
+
+from .geiger_io import load_interval_counts
+
+
+# Cambiar al modificar el análisis o las figuras (invalida todas las salidas)
+PIPELINE_VERSION = 1
+
+MANIFEST_NAME = '.pipeline_manifest.json'
+
+# Parámetros por defecto (los del notebook)
+DEFAULT_PARAMETERS = {
+    'seed': 42,
+    'iqr_factor': 1.5,
+    'probability_range': (2, 5),
+    'window_intervals': 18,
+    'dpi': 300,
+}
+
+# Parámetros de los que dependen todos los archivos
+ANALYSIS_PARAMETERS = ('seed', 'iqr_factor', 'probability_range', 'window_intervals')
+
+# Estilo de las figuras (equivale a sns.set_style('whitegrid') del notebook)
+FIGURE_STYLE = 'seaborn-v0_8-whitegrid'
+FIGURE_RC = {'font.size': 12}
+
+
+def file_hash(path, chunk_bytes=2 ** 20):
+    """Hash SHA-256 de un archivo, leído por bloques"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_bytes), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def artifact_key(data_hash, parameters, keys):
+    """Clave de un archivo de salida: hash de los datos y de sus parámetros"""
+    relevant = {key: parameters[key] for key in sorted(keys)}
+    payload = json.dumps([PIPELINE_VERSION, data_hash, relevant], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# Archivo de salida -> (función de `report` que lo genera, parámetros
+# adicionales de los que depende)
+ARTIFACTS = {
+    'datos_experimentales_limpios.txt': ('save_cleaned_data', ()),
+    'datos_simulados_poisson.txt': ('save_simulated_data', ()),
+    'resumen_resultados.csv': ('save_summary_csv', ()),
+    'resumen_resultados.tex': ('save_summary_tex', ()),
+    'boxplot_outliers.png': ('plot_boxplot', ('dpi',)),
+    'comparacion_series_temporales.png': ('plot_time_series', ('dpi',)),
+    'analisis_residuos.png': ('plot_residuals', ('dpi',)),
+    'histogramas_poisson.png': ('plot_histograms', ('dpi',)),
+}
+
+
+def _load_manifest(path):
+    """Claves guardadas de la ejecución anterior (vacío si no hay manifiesto)"""
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def run_pipeline(data_file, output_dir='.', force=False, **parameters):
+    """
+    Ejecuta el análisis y genera solo los archivos desactualizados.
+
+    Parameters:
+    -----------
+    data_file : str or pathlib.Path
+        Archivo del contador Geiger
+    output_dir : str or pathlib.Path
+        Directorio de los archivos generados
+    force : bool
+        Si True, se regeneran todos los archivos
+    **parameters :
+        Cambios a `DEFAULT_PARAMETERS` (seed, iqr_factor, probability_range,
+        window_intervals, dpi)
+
+    Returns:
+    --------
+    report : dict
+        'built' y 'skipped' (nombres de archivo) y 'results' (resultados
+        de `report.analyze`, o None si no hubo que calcular nada)
+    """
+    unknown = set(parameters) - set(DEFAULT_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Parámetros desconocidos: {sorted(unknown)}")
+    parameters = {**DEFAULT_PARAMETERS, **parameters}
+    parameters['probability_range'] = list(parameters['probability_range'])
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = _load_manifest(manifest_path)
+
+    data_hash = file_hash(data_file)
+    keys = {name: artifact_key(data_hash, parameters, ANALYSIS_PARAMETERS + extra)
+            for name, (_, extra) in ARTIFACTS.items()}
+    stale = [name for name in ARTIFACTS
+             if force or manifest.get(name) != keys[name] or not (output_dir / name).exists()]
+
+    report = {'built': [], 'skipped': [name for name in ARTIFACTS if name not in stale],
+              'results': None}
+    if not stale:
+        return report
+
+    # Importación diferida: solo se paga si hay algo que regenerar
+    builders = importlib.import_module('.report', __package__)
+    from matplotlib import style
+
+    counts, _ = load_interval_counts(data_file)
+    results = builders.analyze(counts, parameters)
+    report['results'] = results
+
+    with style.context([FIGURE_STYLE, FIGURE_RC]):
+        for name in stale:
+            builder = getattr(builders, ARTIFACTS[name][0])
+            builder(results, output_dir / name, parameters)
+            # El manifiesto se guarda tras cada archivo: si algo falla, lo ya
+            # generado no se repite
+            manifest[name] = keys[name]
+            manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+            report['built'].append(name)
+
+    return report
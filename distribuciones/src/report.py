@@ -0,0 +1,282 @@
+"""
+Cálculos, tablas y figuras del notebook `Actividad1_Poisson.ipynb`.
+
+Cada función `save_*`/`plot_*` genera uno de los ocho archivos del análisis a
+partir de los resultados de `analyze`; `pipeline.run_pipeline` decide cuáles
+hay que regenerar. Las figuras se construyen sin pyplot (no se abren
+ventanas ni se cambia el backend global).
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from scipy import stats
+
+from .online_stats import OnlinePoissonStats
+
+
+def analyze(counts, parameters):
+    """
+    Cálculos del notebook: outliers por IQR, estadísticas, simulación de
+    Poisson con semilla fija y probabilidades.
+
+    Parameters:
+    -----------
+    counts : numpy.ndarray
+        Cuentas por intervalo
+    parameters : dict
+        Ver `DEFAULT_PARAMETERS`
+
+    Returns:
+    --------
+    results : dict
+        'counts', 'cleaned', 'outliers', 'simulated', 'summary'
+        (`OnlinePoissonStats.snapshot` de los datos) y 'simulated_summary'
+    """
+    online = OnlinePoissonStats(iqr_factor=parameters['iqr_factor'],
+                                probability_range=tuple(parameters['probability_range']),
+                                window_intervals=parameters['window_intervals'])
+    online.update_many(counts)
+    summary = online.snapshot()
+
+    lower, upper = summary['bounds']
+    inside = (counts >= lower) & (counts <= upper)
+    cleaned = counts[inside]
+
+    # Igual que np.random.seed(seed) seguido de stats.poisson.rvs en el notebook
+    random_state = np.random.RandomState(parameters['seed'])
+    simulated = stats.poisson.rvs(mu=summary['lambda'], size=cleaned.size,
+                                  random_state=random_state)
+
+    k_min, k_max = parameters['probability_range']
+    lambda_sim = simulated.mean()
+    variance_sim = np.var(simulated, ddof=1)
+    prob_sim = np.mean((simulated >= k_min) & (simulated <= k_max))
+
+    return {
+        'counts': counts,
+        'cleaned': cleaned,
+        'outliers': counts[~inside],
+        'simulated': simulated,
+        'summary': summary,
+        'simulated_summary': {
+            'n_total': simulated.size,
+            'lambda': lambda_sim,
+            'std': np.sqrt(variance_sim),
+            'variance': variance_sim,
+            'dispersion': variance_sim / lambda_sim,
+            'prob_range': prob_sim,
+            'events_window': prob_sim * parameters['window_intervals'],
+        },
+    }
+
+
+def summary_table(results, parameters):
+    """Tabla resumen del notebook (Parámetro, Experimental, Simulado, Teórico)"""
+    exp = results['summary']
+    sim = results['simulated_summary']
+    theo = exp['theoretical']
+    k_min, k_max = parameters['probability_range']
+    minutes = parameters['window_intervals'] * 10 / 60
+
+    def column(s):
+        return [f"{s['lambda']:.3f}", f"{s['std']:.3f}", f"{s['variance']:.3f}",
+                f"{s['dispersion']:.3f}", f"{s['prob_range']:.4f}", f"{s['events_window']:.2f}"]
+
+    return pd.DataFrame({
+        'Parámetro': ['Total de datos', 'Outliers removidos', 'Media (λ)', 'Desviación estándar',
+                      'Varianza', 'Varianza/Media', f'P({k_min}≤k≤{k_max})',
+                      f'Eventos en {minutes:g} min'],
+        'Experimental': [exp['n_total'], exp['n_outliers']] + column(exp),
+        'Simulado': [sim['n_total'], '-'] + column(sim),
+        'Teórico': ['-', '-'] + column(theo),
+    })
+
+
+def save_cleaned_data(results, path, parameters):
+    """Cuentas por intervalo sin outliers"""
+    np.savetxt(path, results['cleaned'], fmt='%d',
+               header='Cuentas por intervalo de 10s (outliers removidos)')
+
+
+def save_simulated_data(results, path, parameters):
+    """Serie simulada de Poisson"""
+    np.savetxt(path, results['simulated'], fmt='%d',
+               header=f"Datos simulados Poisson con lambda={results['summary']['lambda']:.3f}")
+
+
+def save_summary_csv(results, path, parameters):
+    """Tabla resumen en CSV"""
+    summary_table(results, parameters).to_csv(path, index=False)
+
+
+def save_summary_tex(results, path, parameters):
+    """
+    Tabla resumen como `tabular` de LaTeX (mismo formato que `to_latex` del
+    notebook, sin depender de jinja2).
+    """
+    table = summary_table(results, parameters)
+    lines = [r'\begin{tabular}{' + 'l' * table.shape[1] + '}', r'\toprule',
+             ' & '.join(table.columns) + r' \\', r'\midrule']
+    lines += [' & '.join(str(value) for value in row) + r' \\'
+              for row in table.itertuples(index=False)]
+    lines += [r'\bottomrule', r'\end{tabular}']
+    Path(path).write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def _save_figure(fig, path, parameters):
+    """Ajusta y guarda una figura con el estilo del notebook"""
+    fig.tight_layout()
+    fig.savefig(path, dpi=parameters['dpi'], bbox_inches='tight')
+
+
+def _integer_bins(data):
+    """Bins de ancho 1 entre el mínimo y el máximo (como el notebook)"""
+    return range(int(np.min(data)), int(np.max(data)) + 2)
+
+
+def plot_boxplot(results, path, parameters):
+    """Boxplot e histograma con los límites IQR (`boxplot_outliers.png`)"""
+    counts, outliers = results['counts'], results['outliers']
+    lower, upper = results['summary']['bounds']
+
+    fig = Figure(figsize=(14, 5))
+    ax1, ax2 = fig.subplots(1, 2)
+
+    ax1.boxplot(counts, vert=True, patch_artist=True,
+                boxprops=dict(facecolor='lightblue', alpha=0.7),
+                medianprops=dict(color='red', linewidth=2),
+                whiskerprops=dict(linewidth=1.5),
+                capprops=dict(linewidth=1.5))
+    ax1.set_ylabel('Cuentas por intervalo de 10s')
+    ax1.set_title('Boxplot de Datos Experimentales\n(Antes de remover outliers)')
+    ax1.grid(True, alpha=0.3)
+    ax1.axhline(y=lower, color='orange', linestyle='--', linewidth=1.5,
+                label=f'Límite inferior: {lower:.1f}')
+    ax1.axhline(y=upper, color='orange', linestyle='--', linewidth=1.5,
+                label=f'Límite superior: {upper:.1f}')
+    ax1.legend()
+
+    ax2.hist(counts, bins=30, alpha=0.7, color='blue', edgecolor='black', label='Todos los datos')
+    if len(outliers) > 0:
+        ax2.hist(outliers, bins=10, alpha=0.9, color='red', edgecolor='black', label='Outliers')
+    ax2.axvline(x=lower, color='orange', linestyle='--', linewidth=2, label='Límites IQR')
+    ax2.axvline(x=upper, color='orange', linestyle='--', linewidth=2)
+    ax2.set_xlabel('Cuentas por intervalo de 10s')
+    ax2.set_ylabel('Frecuencia')
+    ax2.set_title('Distribución de Datos y Outliers')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+
+    _save_figure(fig, path, parameters)
+
+
+def plot_time_series(results, path, parameters):
+    """Series experimental y simulada (`comparacion_series_temporales.png`)"""
+    series = [
+        (results['cleaned'], results['summary'], 'blue', 'Datos experimentales',
+         'Datos Experimentales - Radiación Natural'),
+        (results['simulated'], results['simulated_summary'], 'green', 'Datos simulados (Poisson)',
+         'Datos Simulados - Distribución de Poisson'),
+    ]
+
+    fig = Figure(figsize=(14, 10))
+    axes = fig.subplots(3, 1)
+
+    for ax, (data, summary, color, label, title) in zip(axes, series):
+        lam, std = summary['lambda'], summary['std']
+        ax.plot(data, 'o-', markersize=4, linewidth=0.5, alpha=0.7, color=color, label=label)
+        ax.axhline(y=lam, color='red', linestyle='--', linewidth=2, label=f'Media λ = {lam:.2f}')
+        ax.fill_between(range(len(data)), lam - std, lam + std, alpha=0.2, color='red',
+                        label=f'±1σ = {std:.2f}')
+        ax.set_ylabel('Cuentas/10s')
+        ax.set_title(title)
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    ax3 = axes[2]
+    ax3.plot(results['cleaned'], 'o-', markersize=3, linewidth=0.5, alpha=0.6, color='blue',
+             label='Experimentales')
+    ax3.plot(results['simulated'], 's-', markersize=3, linewidth=0.5, alpha=0.6, color='green',
+             label='Simulados')
+    ax3.set_xlabel('Número de intervalo')
+    ax3.set_ylabel('Cuentas/10s')
+    ax3.set_title('Comparación: Experimental vs Simulado')
+    ax3.legend()
+    ax3.grid(True, alpha=0.3)
+
+    _save_figure(fig, path, parameters)
+
+
+def plot_residuals(results, path, parameters):
+    """Residuos respecto a λ y sus histogramas (`analisis_residuos.png`)"""
+    series = [
+        (results['cleaned'], results['summary'], 'blue', 'Experimentales', 'Experimental'),
+        (results['simulated'], results['simulated_summary'], 'green', 'Simulados', 'Simulado'),
+    ]
+
+    fig = Figure(figsize=(14, 10))
+    axes = fig.subplots(2, 2)
+
+    for col, (data, summary, color, plural, singular) in enumerate(series):
+        residuals = data - summary['lambda']
+        std = summary['std']
+
+        ax = axes[0, col]
+        ax.plot(residuals, 'o', markersize=4, alpha=0.6, color=color)
+        ax.axhline(y=0, color='red', linestyle='--', linewidth=2)
+        ax.axhline(y=std, color='orange', linestyle=':', linewidth=1.5, label='+1σ')
+        ax.axhline(y=-std, color='orange', linestyle=':', linewidth=1.5, label='-1σ')
+        ax.set_ylabel('Residuo (cuentas - λ)')
+        ax.set_title(f'Residuos - Datos {plural}')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+        ax = axes[1, col]
+        ax.hist(residuals, bins=20, alpha=0.7, color=color, edgecolor='black', density=True)
+        ax.axvline(x=0, color='red', linestyle='--', linewidth=2)
+        ax.set_xlabel('Residuo')
+        ax.set_ylabel('Densidad de probabilidad')
+        ax.set_title(f'Distribución de Residuos - {singular}')
+        ax.grid(True, alpha=0.3)
+
+    _save_figure(fig, path, parameters)
+
+
+def plot_histograms(results, path, parameters):
+    """Histogramas normalizados frente a la Poisson teórica (`histogramas_poisson.png`)"""
+    cleaned, simulated = results['cleaned'], results['simulated']
+    lam = results['summary']['lambda']
+
+    k_values = np.arange(0, max(np.max(cleaned), np.max(simulated)) + 1)
+    poisson_pmf = stats.poisson.pmf(k_values, lam)
+    theory_label = f'Poisson teórica (λ={lam:.2f})'
+
+    fig = Figure(figsize=(18, 5))
+    ax1, ax2, ax3 = fig.subplots(1, 3)
+
+    panels = [
+        (ax1, cleaned, 'blue', 'Datos experimentales', 'Datos Experimentales vs Poisson Teórica'),
+        (ax2, simulated, 'green', 'Datos simulados', 'Datos Simulados vs Poisson Teórica'),
+    ]
+    for ax, data, color, label, title in panels:
+        ax.hist(data, bins=_integer_bins(data), alpha=0.7, color=color, edgecolor='black',
+                density=True, label=label)
+        ax.set_title(title)
+
+    ax3.hist(cleaned, bins=_integer_bins(cleaned), alpha=0.5, color='blue', edgecolor='black',
+             density=True, label='Experimental')
+    ax3.hist(simulated, bins=_integer_bins(simulated), alpha=0.5, color='green',
+             edgecolor='black', density=True, label='Simulado')
+    ax3.set_title('Comparación Completa')
+
+    for ax in (ax1, ax2, ax3):
+        ax.plot(k_values, poisson_pmf, 'ro-', linewidth=2, markersize=6, label=theory_label)
+        ax.set_xlabel('Cuentas por intervalo de 10s')
+        ax.set_ylabel('Probabilidad')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    _save_figure(fig, path, parameters)
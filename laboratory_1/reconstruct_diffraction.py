@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Reconstrucción por lotes de objetos a partir de fotografías de patrones de
+difracción de Fraunhofer (flujo de `Práctica_FisExpIII.ipynb`).
+
+Para cada imagen: se toma un canal de color (por rebanado, sin bucles), se
+convierte la intensidad en amplitud (u2 = √I), se aplica una sola vez el
+propagador de Fraunhofer inverso y se guarda el módulo normalizado junto con
+sus ejes. Las imágenes de un directorio se procesan en paralelo.
+
+Uso:
+    python reconstruct_diffraction.py imgs --pattern "*_patron.png" -o resultados
+    python reconstruct_diffraction.py imgs --pixel-size estrella=0.00318 -j 0
+"""
+
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Sin ventanas: las figuras solo se guardan a disco
+import matplotlib.pyplot as plt
+from PIL import Image
+
+
+# Parámetros del experimento (como en el notebook)
+WAVELENGTH = 632.8E-9  # m, láser HeNe
+DISTANCE = 5e-2 / np.tan(np.arcsin(WAVELENGTH / 5e-2))  # m, distancia a la pantalla
+
+# Calibraciones del notebook (cm por píxel), por prefijo del nombre de archivo
+PIXEL_SIZES_CM = {
+    'estrella': 4.3 / 1350,
+    'rejilla': 5 / 185,
+    'combinacion': 4.3 / 410,
+}
+
+
+def load_channel(image_path, channel=0):
+    """
+    Carga un canal de color de la imagen.
+
+    Parameters:
+    -----------
+    image_path : str or pathlib.Path
+        Ruta a la imagen
+    channel : int
+        Canal de color (0 = rojo, 1 = verde, 2 = azul); se ignora si la
+        imagen está en escala de grises
+
+    Returns:
+    --------
+    image : numpy.ndarray
+        Canal seleccionado (filas × columnas)
+    """
+    with Image.open(image_path) as img:
+        pixels = np.asarray(img)
+
+    if pixels.ndim == 3:
+        return pixels[..., channel]
+    return pixels
+
+
+def inverse_propFF(u2, dx2, lam, z, dy2=None):
+    """
+    Propagador de Fraunhofer inverso: del plano de observación al de la fuente.
+
+    Admite imágenes no cuadradas: el tamaño de píxel es el mismo en ambos
+    ejes (salvo que se dé `dy2`) y los lados del plano de observación son
+    L2x = Nx·dx2 y L2y = Ny·dy2, por lo que cada eje tiene su propio paso
+    dx1 = λz/L2x, dy1 = λz/L2y en el plano de la fuente.
+
+    Parameters:
+    -----------
+    u2 : numpy.ndarray
+        Campo en el plano de observación (Ny × Nx)
+    dx2 : float
+        Tamaño de píxel en x en el plano de observación (m)
+    lam : float
+        Longitud de onda (m)
+    z : float
+        Distancia de propagación (m)
+    dy2 : float, optional
+        Tamaño de píxel en y (por defecto igual a dx2)
+
+    Returns:
+    --------
+    u1 : numpy.ndarray
+        Campo en el plano de la fuente (Ny × Nx)
+    x1 : numpy.ndarray
+        Coordenadas x de las columnas de u1 (m)
+    y1 : numpy.ndarray
+        Coordenadas y de las filas de u1 (m)
+    """
+    dy2 = dx2 if dy2 is None else dy2
+    Ny, Nx = u2.shape
+    k = 2 * np.pi / lam
+
+    dx1 = lam * z / (Nx * dx2)
+    dy1 = lam * z / (Ny * dy2)
+
+    x2 = (np.arange(Nx) - Nx // 2) * dx2
+    y2 = (np.arange(Ny) - Ny // 2) * dy2
+
+    # u2/(c·dx1·dy1) con c = 1/(iλz)·exp(ik(x2² + y2²)/(2z)); el factor de fase
+    # es separable y se aplica como producto de dos vectores
+    chirp_x = np.exp(-1j * k / (2 * z) * x2 ** 2)
+    chirp_y = np.exp(-1j * k / (2 * z) * y2 ** 2)
+    field = u2 * (chirp_y[:, np.newaxis] * chirp_x[np.newaxis, :])
+    field *= 1j * lam * z / (dx1 * dy1)
+
+    u1 = np.fft.fftshift(np.fft.ifft2(np.fft.ifftshift(field)))
+
+    x1 = (np.arange(Nx) - Nx // 2) * dx1
+    y1 = (np.arange(Ny) - Ny // 2) * dy1
+    return u1, x1, y1
+
+
+def reconstruct(image, pixel_size, lam=WAVELENGTH, z=DISTANCE):
+    """
+    Reconstruye el módulo normalizado del objeto a partir del patrón.
+
+    Parameters:
+    -----------
+    image : numpy.ndarray
+        Canal de la fotografía del patrón (0-255)
+    pixel_size : float
+        Tamaño de píxel en la pantalla (m)
+    lam : float
+        Longitud de onda (m)
+    z : float
+        Distancia de propagación (m)
+
+    Returns:
+    --------
+    modulus : numpy.ndarray
+        |u1| normalizado a su máximo (float32)
+    x1 : numpy.ndarray
+        Coordenadas x del plano del objeto (m)
+    y1 : numpy.ndarray
+        Coordenadas y del plano del objeto (m)
+    """
+    u2 = np.sqrt(image / 255.0)
+    u1, x1, y1 = inverse_propFF(u2, pixel_size, lam, z)
+
+    modulus = np.abs(u1).astype(np.float32)
+    modulus /= modulus.max()
+    return modulus, x1, y1
+
+
+def pixel_size_for(image_path, overrides, default_cm):
+    """Tamaño de píxel en metros según el prefijo del nombre de archivo"""
+    stem = Path(image_path).stem
+    for sizes in (overrides, PIXEL_SIZES_CM):
+        for prefix, size_cm in sizes.items():
+            if stem.startswith(prefix):
+                return size_cm * 1e-2
+    return default_cm * 1e-2
+
+
+def save_reconstruction(modulus, x1, y1, stem, output_dir, zoom=1.0, vmax=None):
+    """
+    Guarda la reconstrucción: arreglo con ejes (.npz) y figura (.png).
+
+    Parameters:
+    -----------
+    modulus : numpy.ndarray
+        Módulo normalizado del objeto
+    x1, y1 : numpy.ndarray
+        Ejes del plano del objeto (m)
+    stem : str
+        Nombre base de los archivos de salida
+    output_dir : pathlib.Path
+        Directorio de salida
+    zoom : float
+        Fracción del plano que se muestra en la figura (1 = completo)
+    vmax : float, optional
+        Máximo de la escala de color (contraste)
+
+    Returns:
+    --------
+    paths : tuple of pathlib.Path
+        Rutas del .npz y del .png
+    """
+    npz_path = output_dir / f"{stem}_reconstruccion.npz"
+    np.savez_compressed(npz_path, modulus=modulus, x=x1, y=y1)
+
+    dx1 = x1[1] - x1[0]
+    dy1 = y1[1] - y1[0]
+    extent = [x1[0] - dx1 / 2, x1[-1] + dx1 / 2, y1[-1] + dy1 / 2, y1[0] - dy1 / 2]
+
+    fig, ax = plt.subplots(figsize=(8, 8))
+    im = ax.imshow(modulus, cmap='gray', extent=extent, vmax=vmax)
+    ax.set_title('Imagen del objeto')
+    ax.set_xlabel('x (m)')
+    ax.set_ylabel('y (m)')
+    if zoom < 1:
+        ax.set_xlim(zoom * x1[0], zoom * x1[-1])
+        ax.set_ylim(zoom * y1[-1], zoom * y1[0])
+    fig.colorbar(im, ax=ax)
+
+    png_path = output_dir / f"{stem}_reconstruida.png"
+    fig.savefig(png_path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
+    return npz_path, png_path
+
+
+def process_image(image_path, output_dir, pixel_size, channel=0, lam=WAVELENGTH,
+                  z=DISTANCE, zoom=1.0, vmax=None):
+    """
+    Reconstruye una imagen y guarda los resultados (usable en un pool de
+    procesos).
+
+    Returns:
+    --------
+    summary : dict
+        'image', 'shape', 'pixel_size' (m), 'dx1', 'dy1' (m) y 'outputs'
+    """
+    image = load_channel(image_path, channel=channel)
+    modulus, x1, y1 = reconstruct(image, pixel_size, lam=lam, z=z)
+    outputs = save_reconstruction(modulus, x1, y1, Path(image_path).stem, Path(output_dir),
+                                  zoom=zoom, vmax=vmax)
+
+    return {
+        'image': Path(image_path).name,
+        'shape': modulus.shape,
+        'pixel_size': pixel_size,
+        'dx1': x1[1] - x1[0],
+        'dy1': y1[1] - y1[0],
+        'outputs': outputs,
+    }
+
+
+def parse_args(argv=None):
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Reconstrucción por lotes de objetos a partir de patrones de difracción")
+    parser.add_argument("input_dir", help="Directorio con las fotografías de los patrones")
+    parser.add_argument("--pattern", default="*_patron.*",
+                        help="Patrón de nombres de archivo (por defecto: *_patron.*)")
+    parser.add_argument("-o", "--output-dir", default="resultados",
+                        help="Directorio de salida (por defecto: resultados)")
+    parser.add_argument("--pixel-size", action="append", default=[], metavar="PREFIJO=CM",
+                        help="Calibración en cm por píxel para los archivos que empiezan "
+                             "por PREFIJO (se puede repetir)")
+    parser.add_argument("--default-pixel-size", type=float, default=4.3 / 1350,
+                        help="Calibración en cm por píxel si ningún prefijo coincide")
+    parser.add_argument("--channel", type=int, default=0, choices=(0, 1, 2),
+                        help="Canal de color: 0 = R, 1 = G, 2 = B (por defecto: 0)")
+    parser.add_argument("--wavelength", type=float, default=WAVELENGTH,
+                        help="Longitud de onda en metros")
+    parser.add_argument("--distance", type=float, default=DISTANCE,
+                        help="Distancia de propagación en metros")
+    parser.add_argument("--zoom", type=float, default=1.0,
+                        help="Fracción del plano del objeto mostrada en la figura")
+    parser.add_argument("--vmax", type=float, default=None,
+                        help="Máximo de la escala de color de la figura")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Procesos en paralelo (0 = todos los núcleos)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Función principal"""
+    args = parse_args(argv)
+
+    overrides = {}
+    for item in args.pixel_size:
+        prefix, _, value = item.partition('=')
+        overrides[prefix] = float(value)
+
+    image_files = sorted(Path(args.input_dir).glob(args.pattern))
+    if not image_files:
+        print(f"❌ No se encontraron imágenes '{args.pattern}' en {args.input_dir}")
+        return
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+    print(f"\n🔬 Reconstruyendo {len(image_files)} imagen(es) con {jobs} proceso(s)...")
+
+    options = dict(channel=args.channel, lam=args.wavelength, z=args.distance,
+                   zoom=args.zoom, vmax=args.vmax)
+    pixel_sizes = [pixel_size_for(path, overrides, args.default_pixel_size)
+                   for path in image_files]
+
+    # Un error en una imagen (archivo dañado, canal inexistente...) se
+    # reporta y no detiene el resto del lote: (ruta, resumen o excepción)
+    outcomes = []
+    if jobs == 1:
+        for path, size in zip(image_files, pixel_sizes):
+            try:
+                outcomes.append((path, process_image(path, output_dir, size, **options)))
+            except Exception as e:
+                outcomes.append((path, e))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(process_image, path, output_dir, size, **options)
+                       for path, size in zip(image_files, pixel_sizes)]
+            for path, future in zip(image_files, futures):
+                try:
+                    outcomes.append((path, future.result()))
+                except Exception as e:
+                    outcomes.append((path, e))
+
+    failures = 0
+    for path, summary in outcomes:
+        if isinstance(summary, Exception):
+            failures += 1
+            print(f"  ❌ Error procesando {path.name}: {summary}")
+            continue
+        ny, nx = summary['shape']
+        print(f"  ✓ {summary['image']}: {nx}×{ny} px, "
+              f"dx1 = {summary['dx1']:.3e} m, dy1 = {summary['dy1']:.3e} m")
+
+    if failures:
+        print(f"\n⚠️  {failures} de {len(image_files)} imagen(es) con error")
+    print(f"\n💾 Resultados guardados en {output_dir}/")
+
+
+if __name__ == "__main__":
+    main()
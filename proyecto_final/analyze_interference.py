@@ -7,90 +7,438 @@ Autores: Santiago Silva Estacio, Gabriela Ruiz, Sean Paul Perdomo, Juan David Ru
 """
 
 import os
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
-from src.image_processing import load_and_preprocess_image, extract_line_profile
-from src.fft_analysis import analyze_fringe_pattern, calculate_wavelength, calculate_speed_of_light
+from src.image_processing import (load_and_preprocess_image, extract_line_profile,
+                                  extract_oriented_profile, ImageSpectrum)
+from src.fft_analysis import (analyze_fringe_pattern, analyze_fringe_estimators,
+                              calculate_wavelength, calculate_speed_of_light)
+from src.out_of_core import OutOfCoreSpectrum
+from src.rendering import prepare_plot_data, render_analysis, RenderQueue
+from src.results_store import ResultsStore, STORE_NAME
+from src import spectral
+
+
+# Parámetros conocidos del experimento
+LASER_FREQUENCY = 4.74e14  # Hz (frecuencia del láser He-Ne)
+NOMINAL_WAVELENGTH = 632.8e-9  # m (longitud de onda nominal del láser)
+THEORETICAL_SPEED_OF_LIGHT = 3.0e8  # m/s
+
+# NOTA: Este es un valor de ejemplo. En un experimento real, necesitas
+# la distancia física real correspondiente a los píxeles
+PIXEL_TO_METER = 1e-5  # 10 micrómetros por píxel (AJUSTAR SEGÚN CALIBRACIÓN)
+
+# Datos de las figuras diferidas pendientes (dentro de --results-dir)
+PLOT_QUEUE_DIR = ".plot_queue"
+
+# Tareas en vuelo por proceso en modo paralelo: acota los resultados (con sus
+# datos de figura) que esperan en memoria a ser recogidos
+TASKS_PER_WORKER = 2
+
+
+def parse_args(argv=None):
+    """Lee los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Análisis de patrones de interferencia del Interferómetro de Michelson")
+    parser.add_argument("--imgs-dir", default="imgs",
+                        help="Directorio con las imágenes JPEG (por defecto: imgs)")
+    parser.add_argument("--results-dir", default="results",
+                        help="Directorio de salida (por defecto: results)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Procesos para el análisis; 1 = modo serial, 0 = todos los núcleos")
+    parser.add_argument("--plots", choices=["inline", "deferred", "none"], default="inline",
+                        help="Gráficas: inline (a medida que se analiza), deferred (todas al "
+                             "final, sin frenar el análisis) o none (por defecto: inline)")
+    parser.add_argument("--plot-jobs", type=int, default=None,
+                        help="Procesos dedicados a las gráficas en modo paralelo o diferido "
+                             "(por defecto: la mitad de --jobs)")
+    parser.add_argument("--refine", choices=["none", "parabolic", "czt"], default="none",
+                        help="Refinamiento sub-bin de la frecuencia dominante (por defecto: none)")
+    parser.add_argument("--profile", choices=["horizontal", "vertical", "average", "oriented"],
+                        default="horizontal",
+                        help="Extracción del perfil; 'oriented' sigue el ángulo detectado "
+                             "en el espectro 2D (por defecto: horizontal)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Caché de imágenes decodificadas (.npy); evita decodificar "
+                             "los JPEG de nuevo en ejecuciones posteriores")
+    parser.add_argument("--fft-backend", choices=["scipy", "numpy"], default="scipy",
+                        help="Backend de FFT (por defecto: scipy)")
+    parser.add_argument("--fft-workers", type=int, default=None,
+                        help="Hilos por FFT con scipy (por defecto: todos en modo serial, "
+                             "1 por proceso en modo paralelo)")
+    parser.add_argument("--precision", choices=["double", "single"], default="double",
+                        help="Precisión de los datos y las FFT: double (float64) o single "
+                             "(float32, mitad de memoria)")
+    parser.add_argument("--max-memory-mb", type=float, default=None,
+                        help="Memoria máxima (MB) para el espectro 2D; si se supera, se "
+                             "calcula por bloques sobre disco (imágenes muy grandes)")
+    parser.add_argument("--store", default=None,
+                        help=f"Almacén CSV de resultados por imagen (por defecto: "
+                             f"{STORE_NAME} en --results-dir)")
+    parser.add_argument("--rerun", action="store_true",
+                        help="Vuelve a analizar todas las imágenes aunque ya tengan "
+                             "resultado en el almacén")
+    return parser.parse_args(argv)
+
+
+def make_spectrum(img_gray, max_memory_mb=None):
+    """
+    Crea el espectro 2D de la imagen: en memoria (`ImageSpectrum`) o por
+    bloques sobre disco (`OutOfCoreSpectrum`) si supera `max_memory_mb`.
+    """
+    if max_memory_mb is not None:
+        h, w = img_gray.shape
+        max_memory = int(max_memory_mb * 2 ** 20)
+        if h * (w // 2 + 1) * np.dtype(spectral.complex_dtype()).itemsize > max_memory:
+            return OutOfCoreSpectrum(img_gray, max_memory=max_memory)
+    return ImageSpectrum(img_gray)
+
+
+def analyze_image(img_path, refine=None, profile_method='horizontal', cache_dir=None,
+                  max_memory_mb=None, plot=True):
+    """
+    Ejecuta el análisis completo de una imagen (carga, perfil, FFT, λ y c).
+
+    Nunca lanza excepciones: los errores se devuelven en el resultado para que
+    una imagen defectuosa no detenga el análisis del resto (ni el pool de
+    procesos en modo paralelo).
+
+    Parameters:
+    -----------
+    img_path : pathlib.Path
+        Ruta a la imagen
+    refine : str or None
+        Refinamiento sub-bin de la frecuencia (ver `analyze_fringe_pattern`)
+    profile_method : str
+        'horizontal', 'vertical', 'average' (ver `extract_line_profile`) u
+        'oriented' (ver `extract_oriented_profile`)
+    cache_dir : str, optional
+        Caché de imágenes decodificadas (ver `load_and_preprocess_image`)
+    max_memory_mb : float, optional
+        Si el espectro 2D ocupa más de esta memoria (MB), se calcula fuera de
+        memoria por bloques (ver `OutOfCoreSpectrum`)
+    plot : bool
+        Si True, se preparan los datos de la figura (imágenes ya reducidas a
+        la resolución de la figura, ver `prepare_plot_data`)
+
+    Returns:
+    --------
+    outcome : dict
+        'status' ('ok', 'no_fringes' o 'error'), 'image', 'timings'
+        (segundos por etapa: 'load', 'profile', 'fft', 'plot_data' y
+        'total'), y según el caso 'result' (métricas y espaciados de los
+        tres estimadores de `analyze_fringe_estimators`), 'plot_data'
+        (datos para `render_plot`, si plot=True) o 'error'
+    """
+    outcome = {'image': img_path.name}
+    timings = outcome['timings'] = {}
+    spectrum = None
+    start = stage_start = time.perf_counter()
+
+    def lap(stage):
+        nonlocal stage_start
+        now = time.perf_counter()
+        timings[stage] = now - stage_start
+        stage_start = now
+
+    try:
+        # 1. Cargar y preprocesar la imagen
+        img_gray = load_and_preprocess_image(str(img_path), cache_dir=cache_dir)
+        lap('load')
+
+        # Espectro 2D perezoso: se calcula una sola vez si alguien lo usa
+        spectrum = make_spectrum(img_gray, max_memory_mb)
+
+        # 2. Extraer perfil de línea (promedio a lo largo de las franjas)
+        if profile_method == 'oriented':
+            line_profile = extract_oriented_profile(img_gray, spectrum=spectrum)
+        else:
+            line_profile = extract_line_profile(img_gray, method=profile_method)
+        lap('profile')
+
+        # 3. Analizar patrón de franjas con FFT
+        fringe_spacing_pixels, dominant_freq, power_spectrum = analyze_fringe_pattern(line_profile, refine=refine)
+        # Estimadores alternativos (FFT rellenada, autocorrelación y cruces por cero)
+        estimates = analyze_fringe_estimators(
+            line_profile, refine='parabolic' if refine == 'parabolic' else None)
+        lap('fft')
+
+        if fringe_spacing_pixels is None:
+            outcome['status'] = 'no_fringes'
+            timings['total'] = time.perf_counter() - start
+            return outcome
+
+        # 4. Calcular longitud de onda (requiere calibración física)
+        wavelength = calculate_wavelength(fringe_spacing_pixels, PIXEL_TO_METER)
+
+        # 5. Calcular velocidad de la luz
+        speed_of_light = calculate_speed_of_light(wavelength, LASER_FREQUENCY)
+        error_percentage = abs(speed_of_light - THEORETICAL_SPEED_OF_LIGHT) / THEORETICAL_SPEED_OF_LIGHT * 100
+
+        outcome['status'] = 'ok'
+        outcome['result'] = {
+            'image': img_path.name,
+            'fringe_spacing_pixels': fringe_spacing_pixels,
+            'dominant_freq': dominant_freq,
+            'wavelength_nm': wavelength * 1e9,
+            'speed_of_light': speed_of_light,
+            'error_percentage': error_percentage,
+            'spacing_fft': float(estimates['fft']),
+            'spacing_autocorrelation': float(estimates['autocorrelation']),
+            'spacing_zero_crossing': float(estimates['zero_crossing']),
+        }
+        if plot:
+            # El panel 2D reutiliza el espectro compartido con el perfil orientado
+            # (la vista previa del espectro solo se calcula si hay figura)
+            outcome['plot_data'] = prepare_plot_data(img_gray, line_profile, power_spectrum,
+                                                     dominant_freq, spectrum=spectrum)
+            lap('plot_data')
+
+    except Exception as e:
+        outcome['status'] = 'error'
+        outcome['error'] = str(e)
+
+    finally:
+        # Se borra el espectro sobre disco también si no hubo franjas o error
+        if isinstance(spectrum, OutOfCoreSpectrum):
+            spectrum.close()
+
+    timings['total'] = time.perf_counter() - start
+    return outcome
+
+
+def report_image(outcome):
+    """Imprime el resultado del análisis de una imagen"""
+    if outcome['status'] == 'error':
+        print(f"❌ Error procesando {outcome['image']}: {outcome['error']}")
+        return
 
+    if outcome['status'] == 'no_fringes':
+        print(f"⚠️  No se pudo determinar el espaciado de franjas")
+        return
 
-def main():
-    """Función principal para el análisis de patrones de interferencia"""
+    r = outcome['result']
+    print(f"   ✓ Espaciado de franjas: {r['fringe_spacing_pixels']:.2f} píxeles")
+    print(f"   ✓ Frecuencia dominante: {r['dominant_freq']:.4f} ciclos/píxel")
+    print(f"   ✓ Longitud de onda calculada: {r['wavelength_nm']:.2f} nm")
+    print(f"   ✓ Velocidad de la luz: {r['speed_of_light']:.3e} m/s")
+    print(f"   ✓ Error porcentual: {r['error_percentage']:.2f}%")
 
-    # Configuración
-    imgs_dir = Path("imgs")
-    results_dir = Path("results")
-    results_dir.mkdir(exist_ok=True)
 
-    # Parámetros conocidos del experimento
-    LASER_FREQUENCY = 4.74e14  # Hz (frecuencia del láser He-Ne)
-    NOMINAL_WAVELENGTH = 632.8e-9  # m (longitud de onda nominal del láser)
-    THEORETICAL_SPEED_OF_LIGHT = 3.0e8  # m/s
+def plot_path(filename, output_dir):
+    """Ruta de la figura del análisis de una imagen"""
+    return Path(output_dir) / f"analysis_{Path(filename).stem}.png"
 
-    # Buscar imágenes JPEG en el directorio
-    image_files = sorted(imgs_dir.glob("*.jpeg"))
 
-    if not image_files:
-        print("❌ No se encontraron imágenes en el directorio 'imgs/'")
-        return
+def render_plot(plot_data, filename, output_dir):
+    """Guarda la figura de una imagen (reutiliza la figura del proceso)"""
+    output_path = plot_path(filename, output_dir)
+    render_analysis(plot_data, output_path)
+    print(f"   ✓ Visualización guardada: {output_path}")
 
-    print(f"📊 Encontradas {len(image_files)} imágenes para analizar\n")
-    print("="*70)
 
+def flush_plots(queue):
+    """Genera las figuras diferidas de la cola e informa los errores"""
+    if not len(queue):
+        return
+    print(f"\n🎨 Generando {len(queue)} visualización(es) diferida(s)...")
+    rendered = queue.flush()
+    for path, error in rendered:
+        if error is not None:
+            print(f"❌ Error graficando {path.name}: {error}")
+    saved = sum(error is None for _, error in rendered)
+    print(f"   ✓ {saved} visualización(es) guardada(s)")
+
+
+def run_serial(image_files, results_dir, analysis_options=None, plots='inline', plot_jobs=1,
+               store=None):
+    """
+    Analiza las imágenes una tras otra en el proceso actual.
+    `analysis_options` son argumentos adicionales para `analyze_image`;
+    `plots` es 'inline', 'deferred' o 'none' (ver `parse_args`). Si se da
+    `store` (ResultsStore), cada imagen se guarda en cuanto se analiza.
+    """
+    analysis_options = {**(analysis_options or {}), 'plot': plots != 'none'}
+    queue = RenderQueue(jobs=plot_jobs or 1, spill_dir=Path(results_dir) / PLOT_QUEUE_DIR)
     results = []
 
     for idx, img_path in enumerate(image_files, 1):
         print(f"\n🔬 Analizando imagen {idx}/{len(image_files)}: {img_path.name}")
         print("-"*70)
 
-        try:
-            # 1. Cargar y preprocesar la imagen
-            img_gray = load_and_preprocess_image(str(img_path))
+        outcome = analyze_image(img_path, **analysis_options)
+        report_image(outcome)
+        if store is not None:
+            store.append(img_path, outcome)
+
+        if outcome['status'] != 'ok':
+            continue
 
-            # 2. Extraer perfil de línea (promedio a lo largo de las franjas)
-            line_profile = extract_line_profile(img_gray)
+        # Guardar resultados
+        results.append(outcome['result'])
+
+        # 6. Generar visualizaciones (o dejarlas para el final)
+        if plots == 'deferred':
+            queue.submit(outcome['plot_data'], plot_path(img_path.name, results_dir))
+        elif plots == 'inline':
+            try:
+                render_plot(outcome['plot_data'], img_path.name, results_dir)
+            except Exception as e:
+                print(f"❌ Error graficando {img_path.name}: {str(e)}")
+
+    flush_plots(queue)
+    return results
+
+
+def run_parallel(image_files, results_dir, jobs, plot_jobs=None, analysis_options=None,
+                 fft_backend=('scipy', 1, 'double'), plots='inline', store=None):
+    """
+    Analiza las imágenes en un pool de procesos y grafica en otro pool aparte.
+
+    Los resultados se recogen en el mismo orden de `image_files`, por lo que
+    coinciden con los del modo serial. Como mucho hay TASKS_PER_WORKER×jobs
+    análisis en vuelo (se envía uno nuevo por cada resultado recogido), así
+    que la memoria no crece con el número de imágenes. Con plots='inline'
+    las gráficas se envían a su propio pool a medida que llegan los análisis
+    (también con un máximo de TASKS_PER_WORKER×plot_jobs en vuelo); con
+    'deferred' se generan al terminar el análisis y con 'none' no se generan. `fft_backend` es la terna (nombre, hilos,
+    precisión) que se configura en cada proceso. Si se da `store`
+    (ResultsStore), cada imagen se guarda en cuanto llega su resultado.
+    """
+    analysis_options = {**(analysis_options or {}), 'plot': plots != 'none'}
+    if plot_jobs is None:
+        plot_jobs = max(1, jobs // 2)
 
-            # 3. Analizar patrón de franjas con FFT
-            fringe_spacing_pixels, dominant_freq, power_spectrum = analyze_fringe_pattern(line_profile)
+    results = []
+    plot_futures = deque()
+    queue = RenderQueue(jobs=plot_jobs, spill_dir=Path(results_dir) / PLOT_QUEUE_DIR)
 
-            if fringe_spacing_pixels is None:
-                print(f"⚠️  No se pudo determinar el espaciado de franjas")
+    def wait_plot():
+        """Espera la gráfica en vuelo más antigua e informa si falló"""
+        img_path, future = plot_futures.popleft()
+        try:
+            future.result()
+        except Exception as e:
+            print(f"❌ Error graficando {img_path.name}: {str(e)}")
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=spectral.set_backend,
+                             initargs=fft_backend) as analysis_pool, \
+            ProcessPoolExecutor(max_workers=plot_jobs, initializer=spectral.set_backend,
+                                initargs=fft_backend) as plot_pool:
+        remaining = iter(image_files)
+        in_flight = deque()
+
+        def submit_next():
+            img_path = next(remaining, None)
+            if img_path is not None:
+                in_flight.append(analysis_pool.submit(analyze_image, img_path,
+                                                      **analysis_options))
+
+        for _ in range(TASKS_PER_WORKER * jobs):
+            submit_next()
+
+        for idx, img_path in enumerate(image_files, 1):
+            print(f"\n🔬 Analizando imagen {idx}/{len(image_files)}: {img_path.name}")
+            print("-"*70)
+
+            future = in_flight.popleft()
+            submit_next()
+            try:
+                outcome = future.result()
+            except Exception as e:
+                # El proceso trabajador murió (p. ej. sin memoria)
+                outcome = {'image': img_path.name, 'status': 'error', 'error': str(e)}
+
+            report_image(outcome)
+            if store is not None:
+                store.append(img_path, outcome)
+
+            if outcome['status'] != 'ok':
                 continue
 
-            print(f"   ✓ Espaciado de franjas: {fringe_spacing_pixels:.2f} píxeles")
-            print(f"   ✓ Frecuencia dominante: {dominant_freq:.4f} ciclos/píxel")
+            results.append(outcome['result'])
+            if plots == 'deferred':
+                queue.submit(outcome['plot_data'], plot_path(img_path.name, results_dir))
+            elif plots == 'inline':
+                if len(plot_futures) >= TASKS_PER_WORKER * plot_jobs:
+                    wait_plot()
+                plot_futures.append((img_path, plot_pool.submit(
+                    render_plot, outcome['plot_data'], img_path.name, results_dir)))
 
-            # 4. Calcular longitud de onda (requiere calibración física)
-            # NOTA: Este es un valor de ejemplo. En un experimento real, necesitas
-            # la distancia física real correspondiente a los píxeles
-            pixel_to_meter = 1e-5  # 10 micrómetros por píxel (AJUSTAR SEGÚN CALIBRACIÓN)
+        while plot_futures:
+            wait_plot()
 
-            wavelength = calculate_wavelength(fringe_spacing_pixels, pixel_to_meter)
-            print(f"   ✓ Longitud de onda calculada: {wavelength*1e9:.2f} nm")
+    flush_plots(queue)
+    return results
 
-            # 5. Calcular velocidad de la luz
-            speed_of_light = calculate_speed_of_light(wavelength, LASER_FREQUENCY)
-            error_percentage = abs(speed_of_light - THEORETICAL_SPEED_OF_LIGHT) / THEORETICAL_SPEED_OF_LIGHT * 100
 
-            print(f"   ✓ Velocidad de la luz: {speed_of_light:.3e} m/s")
-            print(f"   ✓ Error porcentual: {error_percentage:.2f}%")
+def main(argv=None):
+    """Función principal para el análisis de patrones de interferencia"""
 
-            # Guardar resultados
-            results.append({
-                'image': img_path.name,
-                'fringe_spacing_pixels': fringe_spacing_pixels,
-                'wavelength_nm': wavelength * 1e9,
-                'speed_of_light': speed_of_light,
-                'error_percentage': error_percentage
-            })
+    args = parse_args(argv)
 
-            # 6. Generar visualizaciones
-            plot_analysis(img_gray, line_profile, power_spectrum, dominant_freq,
-                         img_path.name, results_dir)
+    # Configuración
+    imgs_dir = Path(args.imgs_dir)
+    results_dir = Path(args.results_dir)
+    results_dir.mkdir(exist_ok=True)
 
-        except Exception as e:
-            print(f"❌ Error procesando {img_path.name}: {str(e)}")
-            continue
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    analysis_options = {
+        'refine': None if args.refine == "none" else args.refine,
+        'profile_method': args.profile,
+        'cache_dir': args.cache_dir,
+        'max_memory_mb': args.max_memory_mb,
+    }
+
+    # En modo paralelo ya hay un proceso por núcleo: una sola hebra por FFT
+    fft_workers = args.fft_workers
+    if fft_workers is None:
+        fft_workers = 1 if jobs > 1 else -1
+    spectral.set_backend(args.fft_backend, fft_workers, args.precision)
+
+    # Buscar imágenes JPEG en el directorio
+    image_files = sorted(imgs_dir.glob("*.jpeg"))
+
+    if not image_files:
+        print(f"❌ No se encontraron imágenes en el directorio '{imgs_dir}/'")
+        return
+
+    print(f"📊 Encontradas {len(image_files)} imágenes para analizar\n")
+
+    # Almacén de resultados: solo se reutilizan los obtenidos con los mismos
+    # parámetros. La caché y la memoria máxima no cambian los resultados: el
+    # espectro fuera de memoria da el mismo pico que el espectro en memoria
+    # (ver `benchmarks/check_out_of_core.py`)
+    store = ResultsStore(args.store or results_dir / STORE_NAME, {
+        'refine': analysis_options['refine'],
+        'profile_method': args.profile,
+        'precision': args.precision,
+        'pixel_to_meter': PIXEL_TO_METER,
+        'laser_frequency': LASER_FREQUENCY,
+    })
+    # Una imagen con resultado pero sin figura (p. ej. ejecución interrumpida
+    # antes de generar las figuras diferidas) se vuelve a analizar
+    figure = None if args.plots == 'none' else (lambda p: plot_path(p.name, results_dir))
+    pending = image_files if args.rerun else store.pending(image_files, figure)
+    if len(pending) < len(image_files):
+        print(f"⏭️  {len(image_files) - len(pending)} imagen(es) ya analizada(s) en "
+              f"'{store.path}' (se omiten)")
+    if jobs > 1:
+        print(f"⚙️  Modo paralelo: {jobs} procesos de análisis")
+    print("="*70)
+
+    if pending and jobs > 1:
+        run_parallel(pending, results_dir, jobs, args.plot_jobs, analysis_options,
+                     (args.fft_backend, fft_workers, args.precision), args.plots, store)
+    elif pending:
+        run_serial(pending, results_dir, analysis_options, args.plots, args.plot_jobs, store)
+
+    # El resumen incluye las imágenes analizadas en ejecuciones anteriores
+    results = store.results(image_files)
 
     # Resumen de resultados
     print("\n" + "="*70)
@@ -120,52 +468,17 @@ def main():
     print(f"\n✅ Análisis completado. Resultados guardados en '{results_dir}/'")
 
 
-def plot_analysis(img_gray, line_profile, power_spectrum, dominant_freq, filename, output_dir):
-    """Genera visualizaciones del análisis"""
-
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-
-    # 1. Imagen original
-    axes[0, 0].imshow(img_gray, cmap='gray')
-    axes[0, 0].set_title('Patrón de Interferencia Original')
-    axes[0, 0].axis('off')
-
-    # 2. Perfil de intensidad
-    axes[0, 1].plot(line_profile, 'r-', linewidth=1.5)
-    axes[0, 1].set_title('Perfil de Intensidad')
-    axes[0, 1].set_xlabel('Posición (píxeles)')
-    axes[0, 1].set_ylabel('Intensidad')
-    axes[0, 1].grid(True, alpha=0.3)
-
-    # 3. Espectro de potencia (FFT)
-    # power_spectrum ya viene recortado a frecuencias positivas
-    freqs = np.fft.fftfreq(len(line_profile))
-    positive_freqs = freqs[:len(freqs)//2]
-    axes[1, 0].plot(positive_freqs, power_spectrum, 'b-')
-    axes[1, 0].axvline(dominant_freq, color='r', linestyle='--',
-                       label=f'Freq. dominante: {dominant_freq:.4f}')
-    axes[1, 0].set_title('Espectro de Potencia (FFT)')
-    axes[1, 0].set_xlabel('Frecuencia espacial (ciclos/píxel)')
-    axes[1, 0].set_ylabel('Potencia')
-    axes[1, 0].legend()
-    axes[1, 0].grid(True, alpha=0.3)
-    axes[1, 0].set_xlim(0, 0.5)
-
-    # 4. FFT 2D de la imagen
-    fft_2d = np.fft.fft2(img_gray)
-    fft_2d_shifted = np.fft.fftshift(fft_2d)
-    magnitude_spectrum = np.log(np.abs(fft_2d_shifted) + 1)
-
-    axes[1, 1].imshow(magnitude_spectrum, cmap='hot')
-    axes[1, 1].set_title('Espectro de Fourier 2D')
-    axes[1, 1].axis('off')
-
-    plt.tight_layout()
-    output_path = output_dir / f"analysis_{Path(filename).stem}.png"
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
-
-    print(f"   ✓ Visualización guardada: {output_path}")
+def plot_analysis(img_gray, line_profile, power_spectrum, dominant_freq, filename, output_dir,
+                  spectrum=None):
+    """
+    Genera visualizaciones del análisis.
+    Si se da `spectrum` (ImageSpectrum), el panel 2D reutiliza su FFT. Las
+    imágenes se reducen a la resolución de la figura y la figura del proceso
+    se reutiliza (ver `src.rendering`).
+    """
+    plot_data = prepare_plot_data(img_gray, line_profile, power_spectrum, dominant_freq,
+                                  spectrum=spectrum)
+    render_plot(plot_data, filename, output_dir)
 
 
 def save_results_to_file(results, wavelengths, speeds, errors,
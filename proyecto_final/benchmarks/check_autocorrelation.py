@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Verificación de la autocorrelación por FFT contra `np.correlate`.
+
+La autocorrelación se calcula con una rfft rellenada hasta una longitud rápida
+>= 2N-1 (ver `fft_analysis.autocorrelation_fft`). Esa longitud puede ser
+impar (p. ej. N=541 → 1125), así que se prueban longitudes con longitud
+rápida par e impar, en la versión de un perfil, en lote y dentro de
+`analyze_fringe_estimators`. Termina con código 1 si alguna diferencia
+supera la tolerancia.
+
+Uso:
+    python benchmarks/check_autocorrelation.py
+    python benchmarks/check_autocorrelation.py --lengths 541 901 --tolerance 1e-12
+
+Autores: Santiago Silva Estacio, Gabriela Ruiz, Sean Paul Perdomo, Juan David Ruiz
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+from scipy import signal
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from src import spectral  # noqa: E402
+from src.fft_analysis import (autocorrelation_fft, analyze_fringe_estimators,  # noqa: E402
+                              _first_peak_lag)
+
+
+# Longitudes con longitud rápida impar (541, 901) y par (600, 1024)
+DEFAULT_LENGTHS = [541, 600, 901, 1024]
+
+
+def reference_autocorrelation(profile):
+    """Autocorrelación normalizada (lags >= 0) con `np.correlate`, O(N²)"""
+    centered = profile - profile.mean()
+    autocorr = np.correlate(centered, centered, mode='full')[len(profile) - 1:]
+    return autocorr / autocorr[0]
+
+
+def make_profiles(n, count=4, seed=0):
+    """Perfiles de franjas con ruido y espaciados distintos"""
+    rng = np.random.default_rng(seed)
+    x = np.arange(n)
+    spacings = np.linspace(17.3, 41.9, count)[:, np.newaxis]
+    return 128 + 60 * np.cos(2 * np.pi * x / spacings) + rng.normal(0, 10, (count, n))
+
+
+def check_length(n):
+    """
+    Máxima diferencia contra la referencia para una longitud.
+
+    Returns:
+    --------
+    differences : dict
+        'single' y 'batch' (autocorrelación) y 'estimator' (espaciado del
+        estimador de autocorrelación, en píxeles)
+    """
+    profiles = make_profiles(n)
+    reference = np.array([reference_autocorrelation(p) for p in profiles])
+
+    single = np.array([autocorrelation_fft(p) for p in profiles])
+    batch = autocorrelation_fft(profiles)
+
+    # `analyze_fringe_estimators` usa el perfil sin tendencia y con ventana
+    windowed = signal.detrend(profiles, axis=-1) * spectral.hann_window(n)
+    expected_lag = _first_peak_lag(np.array([reference_autocorrelation(p) for p in windowed]))
+    lag = analyze_fringe_estimators(profiles)['autocorrelation']
+
+    return {
+        'single': float(np.max(np.abs(single - reference))),
+        'batch': float(np.max(np.abs(batch - reference))),
+        'estimator': float(np.nanmax(np.abs(lag - expected_lag))),
+    }
+
+
+def main(argv=None):
+    """Función principal de la verificación"""
+    parser = argparse.ArgumentParser(description="Autocorrelación por FFT contra np.correlate")
+    parser.add_argument("--lengths", type=int, nargs="+", default=DEFAULT_LENGTHS,
+                        help=f"Longitudes de perfil (por defecto: {DEFAULT_LENGTHS})")
+    parser.add_argument("--tolerance", type=float, default=1e-9,
+                        help="Diferencia absoluta máxima (por defecto: 1e-9)")
+    args = parser.parse_args(argv)
+
+    print(f"{'N':>6} {'n_fft':>6} {'perfil':>10} {'lote':>10} {'estimador':>10}")
+    print("-"*46)
+
+    failures = []
+    for n in args.lengths:
+        differences = check_length(n)
+        print(f"{n:>6} {spectral.next_fast_len(2 * n - 1):>6} {differences['single']:10.2e} "
+              f"{differences['batch']:10.2e} {differences['estimator']:10.2e}")
+        failures += [(n, key, diff) for key, diff in differences.items() if diff > args.tolerance]
+
+    if failures:
+        print(f"\n❌ {len(failures)} caso(s) superan la tolerancia {args.tolerance:.0e}:")
+        for n, key, diff in failures:
+            print(f"   N={n}: {key} ({diff:.2e})")
+        sys.exit(1)
+
+    print(f"\n✅ Autocorrelación por FFT dentro de la tolerancia {args.tolerance:.0e}")
+
+
+if __name__ == "__main__":
+    main()
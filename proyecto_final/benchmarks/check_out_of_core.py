@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Verificación del espectro fuera de memoria contra el espectro en memoria.
+
+Compara `OutOfCoreSpectrum.dominant_peak` y `fringe_angle` con los de
+`ImageSpectrum` en imágenes de formas aleatorias (lados pares e impares,
+incluidas imágenes menores que la máscara central), con franjas y con ruido
+puro. La memoria de los bloques se reduce para recorrer el espectro en
+varios bloques. Termina con código 1 si algún caso no coincide.
+
+Uso:
+    python benchmarks/check_out_of_core.py
+    python benchmarks/check_out_of_core.py --cases 500 --seed 1
+
+Autores: Santiago Silva Estacio, Gabriela Ruiz, Sean Paul Perdomo, Juan David Ruiz
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from src.image_processing import ImageSpectrum  # noqa: E402
+from src.out_of_core import OutOfCoreSpectrum  # noqa: E402
+
+
+def make_image(rng, shape, fringes):
+    """Imagen uint8 con franjas inclinadas y ruido, o solo ruido"""
+    h, w = shape
+    if not fringes:
+        return rng.integers(0, 256, size=shape, dtype=np.uint8)
+
+    y, x = np.mgrid[:h, :w]
+    angle = rng.uniform(0, np.pi)
+    spacing = rng.uniform(3, 40)
+    pattern = 128 + 60 * np.cos(2 * np.pi * (x * np.cos(angle) + y * np.sin(angle)) / spacing)
+    return np.clip(pattern + rng.normal(0, 20, shape), 0, 255).astype(np.uint8)
+
+
+def main(argv=None):
+    """Función principal de la verificación"""
+    parser = argparse.ArgumentParser(description="Espectro fuera de memoria contra ImageSpectrum")
+    parser.add_argument("--cases", type=int, default=200,
+                        help="Número de imágenes aleatorias (por defecto: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla (por defecto: 0)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    failures = []
+    for case in range(args.cases):
+        shape = (int(rng.integers(16, 320)), int(rng.integers(16, 320)))
+        img = make_image(rng, shape, fringes=case % 2 == 0)
+        mask_size = int(rng.choice([5, 20]))
+
+        in_memory = ImageSpectrum(img)
+        with OutOfCoreSpectrum(img, max_memory=64 * 2 ** 10) as out_of_core:
+            expected = (in_memory.dominant_peak(mask_size), in_memory.fringe_angle(mask_size))
+            obtained = (out_of_core.dominant_peak(mask_size), out_of_core.fringe_angle(mask_size))
+        if expected != obtained:
+            failures.append((shape, mask_size, expected, obtained))
+
+    if failures:
+        print(f"❌ {len(failures)} de {args.cases} caso(s) no coinciden:")
+        for shape, mask_size, expected, obtained in failures[:20]:
+            print(f"   {shape[0]}×{shape[1]} (máscara {mask_size}): en memoria {expected}, "
+                  f"fuera de memoria {obtained}")
+        sys.exit(1)
+
+    print(f"✅ Pico dominante y ángulo idénticos en los {args.cases} casos")
+
+
+if __name__ == "__main__":
+    main()
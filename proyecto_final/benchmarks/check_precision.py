@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Verificación de exactitud de la precisión simple (float32/complex64).
+
+Analiza los mismos patrones sintéticos en precisión doble y simple (ver
+`spectral.set_precision`) y compara el espaciado de franjas, la longitud de
+onda y el ángulo de las franjas. Termina con código 1 si alguna diferencia
+relativa entre precisiones supera la tolerancia.
+
+Uso:
+    python benchmarks/check_precision.py
+    python benchmarks/check_precision.py --sizes 3 12 --tolerance 1e-5
+
+Autores: Santiago Silva Estacio, Gabriela Ruiz, Sean Paul Perdomo, Juan David Ruiz
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from src import spectral  # noqa: E402
+from src.synthetic_fringes import IMAGE_SIZES_MP, generate_fringe_pattern  # noqa: E402
+from src.image_processing import extract_line_profile, ImageSpectrum  # noqa: E402
+from src.fft_analysis import (analyze_fringe_pattern, analyze_fringe_estimators,  # noqa: E402
+                              calculate_wavelength)
+from analyze_interference import PIXEL_TO_METER  # noqa: E402
+from run_benchmarks import SCENARIOS  # noqa: E402
+
+
+def analyze_with_precision(img, precision):
+    """
+    Ejecuta los estimadores con la precisión dada.
+
+    Returns:
+    --------
+    values : dict
+        Espaciados (px), longitudes de onda (nm) y ángulo (grados)
+    elapsed : float
+        Tiempo del perfil, los estimadores y el espectro 2D (s)
+    """
+    spectral.set_precision(precision)
+    try:
+        start = time.perf_counter()
+        profile = extract_line_profile(img)
+        spacing, _, _ = analyze_fringe_pattern(profile)
+        spacing_parabolic, _, _ = analyze_fringe_pattern(profile, refine='parabolic')
+        spacing_czt, _, _ = analyze_fringe_pattern(profile, refine='czt')
+        shared = analyze_fringe_estimators(profile)
+        angle = ImageSpectrum(img).fringe_angle()
+        elapsed = time.perf_counter() - start
+    finally:
+        spectral.set_precision('double')
+
+    values = {
+        'fft': spacing,
+        'fft_parabolic': spacing_parabolic,
+        'fft_czt': spacing_czt,
+        'autocorrelation': shared['autocorrelation'],
+        'zero_crossing': shared['zero_crossing'],
+        'wavelength_nm': calculate_wavelength(spacing_czt, PIXEL_TO_METER) * 1e9,
+        'angle_deg': angle,
+    }
+    return {k: float(v) for k, v in values.items()}, elapsed
+
+
+def compare_case(size_mp, scenario):
+    """Compara precisión doble y simple para un escenario y un tamaño"""
+    img = generate_fringe_pattern(IMAGE_SIZES_MP[size_mp], scenario['spacing'],
+                                  tilt=scenario['tilt'], curvature=scenario['curvature'],
+                                  noise_std=scenario['noise_std'], seed=0)
+
+    double, t_double = analyze_with_precision(img, 'double')
+    single, t_single = analyze_with_precision(img, 'single')
+
+    differences = {}
+    for key, reference in double.items():
+        scale = abs(reference) if reference else 1.0
+        differences[key] = abs(single[key] - reference) / scale
+
+    return double, differences, t_double, t_single
+
+
+def main(argv=None):
+    """Función principal de la verificación"""
+    parser = argparse.ArgumentParser(description="Exactitud de la precisión simple")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.3, 1, 3],
+                        help=f"Tamaños en MP (disponibles: {sorted(IMAGE_SIZES_MP)})")
+    parser.add_argument("--tolerance", type=float, default=1e-4,
+                        help="Diferencia relativa máxima entre precisiones (por defecto: 1e-4)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) if float(s).is_integer() else s for s in args.sizes]
+    unknown = [s for s in sizes if s not in IMAGE_SIZES_MP]
+    if unknown:
+        parser.error(f"Tamaños no disponibles: {unknown}")
+
+    print(f"{'MP':>5} {'escenario':<11} {'λ doble (nm)':>13} {'máx. dif. rel.':>15} "
+          f"{'peor estimador':<16} {'t doble':>8} {'t simple':>9}")
+    print("-"*84)
+
+    failures = []
+    for size_mp in sizes:
+        for scenario in SCENARIOS:
+            double, differences, t_double, t_single = compare_case(size_mp, scenario)
+            worst = max(differences, key=differences.get)
+            print(f"{size_mp:>5} {scenario['name']:<11} {double['wavelength_nm']:13.4f} "
+                  f"{differences[worst]:15.2e} {worst:<16} {t_double:8.4f} {t_single:9.4f}")
+            if differences[worst] > args.tolerance:
+                failures.append((size_mp, scenario['name'], worst, differences[worst]))
+
+    if failures:
+        print(f"\n❌ {len(failures)} caso(s) superan la tolerancia {args.tolerance:.0e}:")
+        for size_mp, name, key, diff in failures:
+            print(f"   {size_mp} MP - {name}: {key} ({diff:.2e})")
+        sys.exit(1)
+
+    print(f"\n✅ Precisión simple dentro de la tolerancia {args.tolerance:.0e} en todos los casos")
+
+
+if __name__ == "__main__":
+    main()
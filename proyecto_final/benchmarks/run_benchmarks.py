@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks de velocidad y exactitud de `proyecto_final/src`.
+
+Genera patrones de franjas sintéticos con parámetros conocidos, mide el tiempo
+de cada etapa del análisis y el error de los estimadores respecto al valor
+verdadero, y guarda los resultados en JSON para comparar versiones.
+
+Uso:
+    python benchmarks/run_benchmarks.py --sizes 0.3 1 3 --repeat 3
+    python benchmarks/run_benchmarks.py --sizes 12 24 --output results_v2.json
+
+Autores: Santiago Silva Estacio, Gabriela Ruiz, Sean Paul Perdomo, Juan David Ruiz
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import scipy
+from PIL import Image
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+import src  # noqa: E402
+from src import spectral  # noqa: E402
+from src.synthetic_fringes import IMAGE_SIZES_MP, generate_fringe_pattern  # noqa: E402
+from src.image_processing import (load_and_preprocess_image, extract_line_profile,  # noqa: E402
+                                  detect_fringe_orientation)
+from src.fft_analysis import (analyze_fringe_pattern, autocorrelation_analysis,  # noqa: E402
+                              analyze_fringe_estimators)
+import analyze_interference  # noqa: E402
+
+
+# Escenarios con valor verdadero conocido
+SCENARIOS = [
+    {'name': 'rectas', 'spacing': 24.0, 'tilt': 0.0, 'curvature': 0.0, 'noise_std': 10.0},
+    {'name': 'inclinadas', 'spacing': 24.0, 'tilt': 20.0, 'curvature': 0.0, 'noise_std': 10.0},
+    {'name': 'anillos', 'spacing': 24.0, 'tilt': 0.0, 'curvature': 2e-6, 'noise_std': 10.0},
+    {'name': 'ruidosas', 'spacing': 37.3, 'tilt': 0.0, 'curvature': 0.0, 'noise_std': 60.0},
+]
+
+
+def time_call(func, *args, repeat=3, **kwargs):
+    """Ejecuta `func` `repeat` veces y devuelve (mejor tiempo en s, resultado)"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def relative_error(estimate, truth):
+    """Error relativo |estimado - verdadero| / verdadero (None si no hay estimado)"""
+    if estimate is None or not np.isfinite(estimate):
+        return None
+    return abs(float(estimate) - truth) / truth
+
+
+def benchmark_case(size_mp, scenario, workdir, repeat):
+    """Mide tiempos y errores de un escenario para un tamaño de imagen"""
+    shape = IMAGE_SIZES_MP[size_mp]
+    img = generate_fringe_pattern(shape, scenario['spacing'], tilt=scenario['tilt'],
+                                  curvature=scenario['curvature'],
+                                  noise_std=scenario['noise_std'], seed=0)
+
+    img_path = Path(workdir) / f"sintetica_{size_mp}mp_{scenario['name']}.jpeg"
+    rgb = np.zeros(shape + (3,), dtype=np.uint8)
+    rgb[:, :, 0] = img
+    Image.fromarray(rgb).save(img_path, quality=95)
+
+    # Espaciado aparente a lo largo de x (perfil horizontal)
+    truth = scenario['spacing'] / abs(np.cos(np.radians(scenario['tilt'])))
+
+    timings = {}
+    timings['load_and_preprocess_image'], img_gray = time_call(
+        load_and_preprocess_image, str(img_path), repeat=repeat)
+    timings['extract_line_profile'], profile = time_call(
+        extract_line_profile, img_gray, repeat=repeat)
+    timings['analyze_fringe_pattern'], (spacing_fft, _, _) = time_call(
+        analyze_fringe_pattern, profile, repeat=repeat)
+    timings['analyze_fringe_pattern_czt'], (spacing_czt, _, _) = time_call(
+        analyze_fringe_pattern, profile, refine='czt', repeat=repeat)
+    timings['autocorrelation_analysis'], spacing_acf = time_call(
+        autocorrelation_analysis, profile, repeat=repeat)
+    timings['analyze_fringe_estimators'], shared = time_call(
+        analyze_fringe_estimators, profile, repeat=repeat)
+    timings['detect_fringe_orientation'], _ = time_call(
+        detect_fringe_orientation, img_gray, repeat=repeat)
+    timings['analyze_interference'], outcome = time_call(
+        analyze_interference.analyze_image, img_path, repeat=repeat)
+
+    spacing_pipeline = outcome['result']['fringe_spacing_pixels'] if outcome['status'] == 'ok' else None
+
+    estimates = {
+        'fft': spacing_fft,
+        'fft_czt': spacing_czt,
+        'autocorrelation': spacing_acf,
+        'shared_fft': shared['fft'],
+        'shared_autocorrelation': shared['autocorrelation'],
+        'shared_zero_crossing': shared['zero_crossing'],
+        'analyze_interference': spacing_pipeline,
+    }
+
+    return {
+        'size_mp': size_mp,
+        'shape': list(shape),
+        'scenario': scenario,
+        'true_spacing_px': truth,
+        'timings_s': timings,
+        'estimates_px': {k: (None if v is None else float(v)) for k, v in estimates.items()},
+        'relative_errors': {k: relative_error(v, truth) for k, v in estimates.items()},
+    }
+
+
+def environment_metadata():
+    """Información del entorno para comparar resultados entre versiones"""
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'project_version': src.__version__,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'fft_backend': spectral.get_backend(),
+    }
+
+
+def print_summary(results):
+    """Imprime una tabla resumida de tiempos y errores"""
+    print(f"\n{'MP':>5} {'escenario':<11} {'carga':>8} {'fft':>8} {'acf':>8} "
+          f"{'orient.':>8} {'pipeline':>9} {'err fft':>8} {'err czt':>8}")
+    print("-"*82)
+    for r in results:
+        t = r['timings_s']
+        e = r['relative_errors']
+        fmt_err = lambda v: f"{v*100:7.3f}%" if v is not None else "     --"
+        print(f"{r['size_mp']:>5} {r['scenario']['name']:<11} "
+              f"{t['load_and_preprocess_image']:8.4f} {t['analyze_fringe_pattern']:8.4f} "
+              f"{t['autocorrelation_analysis']:8.4f} {t['detect_fringe_orientation']:8.4f} "
+              f"{t['analyze_interference']:9.4f} {fmt_err(e['fft'])} {fmt_err(e['fft_czt'])}")
+
+
+def main(argv=None):
+    """Función principal de la suite de benchmarks"""
+    parser = argparse.ArgumentParser(description="Benchmarks de velocidad y exactitud")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.3, 1, 3],
+                        help=f"Tamaños en MP a medir (disponibles: {sorted(IMAGE_SIZES_MP)})")
+    parser.add_argument("--scenarios", nargs="+", default=[s['name'] for s in SCENARIOS],
+                        help="Escenarios a medir")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Repeticiones por medición (se reporta el mejor tiempo)")
+    parser.add_argument("--output", default=None,
+                        help="Archivo JSON de salida (por defecto: benchmarks/results/<fecha>.json)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) if float(s).is_integer() else s for s in args.sizes]
+    unknown = [s for s in sizes if s not in IMAGE_SIZES_MP]
+    if unknown:
+        parser.error(f"Tamaños no disponibles: {unknown}")
+
+    scenarios = [s for s in SCENARIOS if s['name'] in args.scenarios]
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size_mp in sizes:
+            for scenario in scenarios:
+                print(f"⏱️  {size_mp} MP - {scenario['name']}")
+                results.append(benchmark_case(size_mp, scenario, workdir, args.repeat))
+
+    print_summary(results)
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_path = Path(__file__).resolve().parent / "results" / \
+            f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({'metadata': environment_metadata(), 'results': results}, f, indent=2)
+
+    print(f"\n✅ Resultados guardados en '{output_path}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Conteo de franjas en una secuencia de cuadros del Interferómetro de Michelson.
+
+Lee un directorio de imágenes o un video local cuadro a cuadro, sigue la fase
+de las franjas y reporta el conteo acumulado y el desplazamiento del espejo.
+
+Autores: Santiago Silva Estacio, Gabriela Ruiz, Sean Paul Perdomo, Juan David Ruiz
+"""
+
+import argparse
+import csv
+from pathlib import Path
+from src.fringe_counting import iter_frames, count_fringes
+
+
+NOMINAL_WAVELENGTH = 632.8e-9  # m (longitud de onda nominal del láser)
+
+
+def main(argv=None):
+    """Función principal para el conteo de franjas"""
+    parser = argparse.ArgumentParser(description="Conteo de franjas en una secuencia de cuadros")
+    parser.add_argument("source", help="Directorio de cuadros o archivo de video")
+    parser.add_argument("--pattern", default="*.jpeg",
+                        help="Patrón de archivos si 'source' es un directorio")
+    parser.add_argument("--method", default="horizontal",
+                        help="Dirección del perfil: horizontal, vertical o average")
+    parser.add_argument("--wavelength", type=float, default=NOMINAL_WAVELENGTH,
+                        help="Longitud de onda del láser en metros")
+    parser.add_argument("--window", type=int, default=32,
+                        help="Cuadros de la ventana deslizante")
+    parser.add_argument("--output", default=None,
+                        help="Archivo CSV donde guardar el conteo por cuadro")
+    args = parser.parse_args(argv)
+
+    frames = iter_frames(args.source, pattern=args.pattern)
+    states = count_fringes(frames, method=args.method, wavelength=args.wavelength,
+                           window_size=args.window)
+
+    state = None
+    writer = None
+    output = open(args.output, 'w', newline='', encoding='utf-8') if args.output else None
+
+    try:
+        for state in states:
+            if output is not None:
+                if writer is None:
+                    writer = csv.DictWriter(output, fieldnames=list(state.keys()))
+                    writer.writeheader()
+                writer.writerow(state)
+    finally:
+        if output is not None:
+            output.close()
+
+    if state is None:
+        print(f"❌ No se encontraron cuadros en '{args.source}'")
+        return
+
+    print(f"📊 Cuadros procesados: {state['frame'] + 1}")
+    print(f"   ✓ Franjas contadas: {state['fringe_count']:.2f}")
+    print(f"   ✓ Desplazamiento del espejo: {state['displacement']*1e6:.3f} µm")
+    if args.output:
+        print(f"   ✓ Conteo por cuadro guardado: {Path(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,10 @@ import numpy as np
 from scipy import signal
 from scipy.signal import find_peaks
 
+from . import spectral
 
-def analyze_fringe_pattern(line_profile, min_distance=5):
+
+def analyze_fringe_pattern(line_profile, min_distance=5, refine=None, zoom=64):
     """
     Analiza el patrón de franjas usando FFT para determinar el espaciado.
 
@@ -20,6 +22,12 @@ def analyze_fringe_pattern(line_profile, min_distance=5):
         Perfil de intensidad 1D
     min_distance : int
         Distancia mínima entre picos en píxeles
+    refine : str or None
+        Refinamiento sub-bin de la frecuencia dominante: None (frecuencia del
+        bin de la FFT), 'parabolic' o 'czt' (ver `refine_peak_frequency`)
+    zoom : int
+        Factor de resolución del refinamiento 'czt' (equivalente a rellenar
+        con ceros la FFT `zoom` veces)
 
     Returns:
     --------
@@ -31,31 +39,28 @@ def analyze_fringe_pattern(line_profile, min_distance=5):
         Espectro de potencia del perfil
     """
     # Remover tendencia (componente DC)
-    line_profile_detrended = signal.detrend(line_profile)
+    line_profile_detrended = signal.detrend(spectral.as_real(line_profile))
 
-    # Aplicar ventana para reducir efectos de borde
-    window = signal.windows.hann(len(line_profile_detrended))
-    line_profile_windowed = line_profile_detrended * window
+    n = len(line_profile_detrended)
 
-    # Calcular FFT
-    fft_result = np.fft.fft(line_profile_windowed)
-    power_spectrum = np.abs(fft_result) ** 2
+    # Aplicar ventana para reducir efectos de borde (cacheada por tamaño)
+    window = spectral.hann_window(n)
+    line_profile_windowed = line_profile_detrended * window
 
-    # Obtener frecuencias
-    freqs = np.fft.fftfreq(len(line_profile_windowed))
+    # Calcular FFT real: la mitad negativa del espectro es redundante
+    fft_result = spectral.rfft(line_profile_windowed)
 
     # Trabajar solo con frecuencias positivas
-    positive_freqs = freqs[:len(freqs)//2]
-    positive_power = power_spectrum[:len(power_spectrum)//2]
+    positive_freqs = spectral.positive_freqs(n)
+    positive_power = np.abs(fft_result[:n // 2]) ** 2
 
     # Encontrar el pico dominante (excluyendo DC - frecuencia 0)
     # Buscar en el rango de frecuencias razonables
     min_freq = 0.01  # Evitar frecuencias muy bajas
     max_freq = 0.5   # Nyquist
 
-    freq_mask = (positive_freqs > min_freq) & (positive_freqs < max_freq)
-    masked_power = positive_power.copy()
-    masked_power[~freq_mask] = 0
+    freq_mask = spectral.band_mask(n, min_freq, max_freq)
+    masked_power = np.where(freq_mask, positive_power, 0.0)
 
     # Encontrar picos en el espectro de potencia
     peaks, properties = find_peaks(masked_power, height=np.max(masked_power)*0.1, distance=min_distance)
@@ -67,6 +72,12 @@ def analyze_fringe_pattern(line_profile, min_distance=5):
     dominant_peak_idx = peaks[np.argmax(properties['peak_heights'])]
     dominant_freq = positive_freqs[dominant_peak_idx]
 
+    # Refinar la frecuencia por debajo de la resolución del bin (1/N)
+    if refine is not None:
+        dominant_freq = refine_peak_frequency(line_profile_windowed, dominant_peak_idx,
+                                              method=refine, power_spectrum=positive_power,
+                                              zoom=zoom)
+
     # Calcular espaciado de franjas (inverso de la frecuencia)
     if dominant_freq > 0:
         fringe_spacing = 1.0 / dominant_freq
@@ -76,6 +87,172 @@ def analyze_fringe_pattern(line_profile, min_distance=5):
     return fringe_spacing, dominant_freq, positive_power
 
 
+def _parabolic_offset(power_left, power_peak, power_right):
+    """
+    Desplazamiento sub-bin del máximo interpolando una parábola sobre el
+    logaritmo de la potencia en el bin del pico y sus dos vecinos.
+    """
+    log_left = np.log(np.maximum(power_left, np.finfo(float).tiny))
+    log_peak = np.log(np.maximum(power_peak, np.finfo(float).tiny))
+    log_right = np.log(np.maximum(power_right, np.finfo(float).tiny))
+
+    denominator = log_left - 2 * log_peak + log_right
+    with np.errstate(divide='ignore', invalid='ignore'):
+        offset = 0.5 * (log_left - log_right) / denominator
+    offset = np.where(np.isfinite(offset), offset, 0.0)
+
+    return np.clip(offset, -0.5, 0.5)
+
+
+def refine_peak_frequency(line_profile_windowed, peak_idx, method='czt',
+                          power_spectrum=None, zoom=64):
+    """
+    Refina la frecuencia de un pico del espectro por debajo del bin de la FFT.
+
+    Primero se ubica el pico grueso (índice `peak_idx`) y luego solo se evalúa
+    el espectro en una banda estrecha a su alrededor, en lugar de rellenar con
+    ceros toda la FFT.
+
+    Métodos:
+    - 'parabolic': interpolación parabólica del logaritmo de la potencia en
+      los tres bins alrededor del pico. Costo O(1); exacta para el lóbulo
+      gaussiano aproximado de la ventana de Hann.
+    - 'czt': transformada zoom (chirp-z) sobre ±1 bin alrededor del pico con
+      resolución 1/(zoom·N), seguida de interpolación parabólica sobre la
+      malla fina. Precisión comparable a rellenar con ceros `zoom` veces con
+      un costo O(N log N) y memoria O(zoom).
+
+    Parameters:
+    -----------
+    line_profile_windowed : numpy.ndarray
+        Perfil sin tendencia y con ventana aplicada (el mismo usado en la FFT)
+    peak_idx : int
+        Índice del pico grueso en el espectro de frecuencias positivas
+    method : str
+        'parabolic' o 'czt'
+    power_spectrum : numpy.ndarray, optional
+        Espectro de potencia ya calculado (necesario para 'parabolic'; si no se
+        da, se calcula)
+    zoom : int
+        Factor de resolución para 'czt'
+
+    Returns:
+    --------
+    refined_freq : float
+        Frecuencia refinada (ciclos/píxel)
+    """
+    n = len(line_profile_windowed)
+    bin_width = 1.0 / n
+
+    if method == 'parabolic':
+        if power_spectrum is None:
+            power_spectrum = np.abs(spectral.rfft(line_profile_windowed)) ** 2
+        if peak_idx <= 0 or peak_idx >= len(power_spectrum) - 1:
+            return peak_idx * bin_width
+        offset = _parabolic_offset(power_spectrum[peak_idx - 1],
+                                   power_spectrum[peak_idx],
+                                   power_spectrum[peak_idx + 1])
+        return float((peak_idx + offset) * bin_width)
+
+    if method == 'czt':
+        # Banda de ±1 bin alrededor del pico grueso, con 2·zoom+1 puntos
+        m = 2 * zoom + 1
+        f_start = (peak_idx - 1) * bin_width
+        f_stop = (peak_idx + 1) * bin_width
+        band = signal.zoom_fft(line_profile_windowed, [f_start, f_stop], m=m,
+                               fs=1.0, endpoint=True)
+        band_power = np.abs(band) ** 2
+        band_freqs = np.linspace(f_start, f_stop, m)
+
+        k = int(np.argmax(band_power))
+        if 0 < k < m - 1:
+            offset = _parabolic_offset(band_power[k - 1], band_power[k], band_power[k + 1])
+        else:
+            offset = 0.0
+        return float(band_freqs[k] + offset * (band_freqs[1] - band_freqs[0]))
+
+    raise ValueError(f"Método de refinamiento desconocido: {method}")
+
+
+def analyze_fringe_patterns_batch(line_profiles, axis=-1, min_freq=0.01, max_freq=0.5,
+                                  refine=None):
+    """
+    Analiza un conjunto de perfiles de franjas en una sola llamada vectorizada.
+
+    Equivalente a aplicar `analyze_fringe_pattern` a cada perfil, pero la
+    remoción de tendencia, la ventana y la FFT real (rfft) se calculan a lo
+    largo de un eje para todos los perfiles a la vez, y el pico dominante de
+    cada perfil se selecciona con operaciones de arreglos.
+
+    Parameters:
+    -----------
+    line_profiles : numpy.ndarray
+        Arreglo 2D de perfiles de intensidad (p. ej. un perfil por fila)
+    axis : int
+        Eje a lo largo del cual se extiende cada perfil
+    min_freq : float
+        Frecuencia mínima considerada (ciclos/píxel), excluye DC
+    max_freq : float
+        Frecuencia máxima considerada (ciclos/píxel)
+    refine : str or None
+        None o 'parabolic' (refinamiento sub-bin vectorizado, ver
+        `refine_peak_frequency`)
+
+    Returns:
+    --------
+    fringe_spacings : numpy.ndarray
+        Espaciado entre franjas en píxeles por perfil (NaN si no hay pico)
+    dominant_freqs : numpy.ndarray
+        Frecuencia espacial dominante por perfil (NaN si no hay pico)
+    power_spectra : numpy.ndarray
+        Espectros de potencia de frecuencias positivas, uno por perfil
+    """
+    profiles = np.moveaxis(spectral.as_real(line_profiles), axis, -1)
+    profiles = np.atleast_2d(profiles)
+    n = profiles.shape[-1]
+
+    # Remover tendencia y aplicar ventana sobre todos los perfiles a la vez
+    profiles_detrended = signal.detrend(profiles, axis=-1)
+    window = spectral.hann_window(n)
+    profiles_windowed = profiles_detrended * window
+
+    # FFT real: solo se calcula la mitad de frecuencias no negativas
+    fft_result = spectral.rfft(profiles_windowed, axis=-1)
+    positive_power = (fft_result.real ** 2 + fft_result.imag ** 2)[..., :n // 2]
+    positive_freqs = spectral.positive_freqs(n)
+
+    freq_mask = spectral.band_mask(n, min_freq, max_freq)
+    masked_power = np.where(freq_mask, positive_power, 0.0)
+
+    # Máximos locales estrictos (mismo criterio que find_peaks) y dentro de banda
+    is_peak = np.zeros(masked_power.shape, dtype=bool)
+    center = masked_power[..., 1:-1]
+    is_peak[..., 1:-1] = (center > masked_power[..., :-2]) & (center > masked_power[..., 2:])
+    is_peak &= freq_mask
+
+    # El pico más alto de cada perfil
+    candidate_power = np.where(is_peak, masked_power, -np.inf)
+    peak_idx = np.argmax(candidate_power, axis=-1)
+    has_peak = np.any(is_peak, axis=-1)
+
+    dominant_freqs = positive_freqs[peak_idx]
+
+    if refine == 'parabolic':
+        # Los picos son máximos locales estrictos: siempre tienen dos vecinos
+        idx = np.clip(peak_idx, 1, n // 2 - 2)[..., np.newaxis]
+        neighbours = np.take_along_axis(positive_power, idx + np.array([-1, 0, 1]), axis=-1)
+        offset = _parabolic_offset(neighbours[..., 0], neighbours[..., 1], neighbours[..., 2])
+        dominant_freqs = dominant_freqs + offset / n
+    elif refine is not None:
+        raise ValueError(f"Método de refinamiento no soportado en lote: {refine}")
+
+    dominant_freqs = np.where(has_peak, dominant_freqs, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fringe_spacings = np.where(dominant_freqs > 0, 1.0 / dominant_freqs, np.nan)
+
+    return fringe_spacings, dominant_freqs, positive_power
+
+
 def calculate_wavelength(fringe_spacing_pixels, pixel_to_meter, geometry_factor=2.0):
     """
     Calcula la longitud de onda del láser a partir del espaciado de franjas.
@@ -169,11 +346,18 @@ def analyze_multiple_images(image_profiles):
     fringe_spacings = []
     dominant_freqs = []
 
-    for profile in image_profiles:
-        spacing, freq, _ = analyze_fringe_pattern(profile)
-        if spacing is not None:
-            fringe_spacings.append(spacing)
-            dominant_freqs.append(freq)
+    if len(image_profiles) > 0 and len({len(p) for p in image_profiles}) == 1:
+        # Perfiles de igual longitud: análisis vectorizado en una sola llamada
+        spacings, freqs, _ = analyze_fringe_patterns_batch(np.vstack(image_profiles))
+        valid = ~np.isnan(spacings)
+        fringe_spacings = list(spacings[valid])
+        dominant_freqs = list(freqs[valid])
+    else:
+        for profile in image_profiles:
+            spacing, freq, _ = analyze_fringe_pattern(profile)
+            if spacing is not None:
+                fringe_spacings.append(spacing)
+                dominant_freqs.append(freq)
 
     if len(fringe_spacings) == 0:
         return None
@@ -254,10 +438,75 @@ def calculate_fringe_visibility(line_profile):
     return visibility
 
 
+def autocorrelation_fft(line_profiles, axis=-1):
+    """
+    Autocorrelación normalizada (lags >= 0) calculada en el dominio de Fourier.
+
+    Por el teorema de Wiener–Khinchin la autocorrelación es la transformada
+    inversa del espectro de potencia. Rellenando con ceros hasta una longitud
+    rápida >= 2N-1 se obtiene la autocorrelación lineal (sin aliasing
+    circular) en O(N log N) en lugar del O(N²) de `np.correlate`.
+
+    Parameters:
+    -----------
+    line_profiles : numpy.ndarray
+        Perfil 1D o arreglo de perfiles (uno por fila a lo largo de `axis`)
+    axis : int
+        Eje a lo largo del cual se extiende cada perfil
+
+    Returns:
+    --------
+    autocorr : numpy.ndarray
+        Autocorrelación normalizada (autocorr[..., 0] = 1), lags 0..N-1
+    """
+    profiles = np.moveaxis(spectral.as_real(line_profiles), axis, -1)
+    n = profiles.shape[-1]
+
+    # Normalizar perfiles (media cero, varianza uno)
+    centered = profiles - profiles.mean(axis=-1, keepdims=True)
+    std = centered.std(axis=-1, keepdims=True)
+    profiles_normalized = centered / np.where(std > 0, std, 1.0)
+
+    n_fft = spectral.next_fast_len(2 * n - 1)
+    return _autocorrelation_from_spectrum(spectral.rfft(profiles_normalized, n=n_fft, axis=-1),
+                                          n, n_fft)
+
+
+def _autocorrelation_from_spectrum(fft_padded, n, n_fft):
+    """
+    Autocorrelación normalizada a partir de una rfft rellenada a `n_fft` >= 2N-1.
+
+    `n_fft` debe ser la longitud real de la transformada directa: no se puede
+    deducir del tamaño de la rfft cuando la longitud rápida es impar.
+    """
+    power = fft_padded.real ** 2 + fft_padded.imag ** 2
+    autocorr = spectral.irfft(power, n=n_fft, axis=-1)[..., :n]
+
+    zero_lag = autocorr[..., :1]
+    return autocorr / np.where(zero_lag != 0, zero_lag, 1.0)
+
+
+def _first_peak_lag(autocorr, min_height=0.3):
+    """
+    Lag del primer máximo local estricto con altura >= min_height (excluye el
+    lag 0), vectorizado por fila. NaN si no hay pico.
+    """
+    center = autocorr[..., 1:-1]
+    is_peak = (center > autocorr[..., :-2]) & (center > autocorr[..., 2:]) & (center >= min_height)
+    # El lag 1 no puede ser pico de autocorr[1:] (no tiene vecino izquierdo)
+    is_peak[..., 0] = False
+
+    has_peak = np.any(is_peak, axis=-1)
+    first = np.argmax(is_peak, axis=-1) + 1
+    return np.where(has_peak, first, np.nan)
+
+
 def autocorrelation_analysis(line_profile):
     """
     Analiza el patrón de franjas usando autocorrelación como método alternativo.
 
+    La autocorrelación se calcula con FFT (ver `autocorrelation_fft`).
+
     Parameters:
     -----------
     line_profile : numpy.ndarray
@@ -268,15 +517,7 @@ def autocorrelation_analysis(line_profile):
     fringe_spacing : float
         Espaciado entre franjas en píxeles (método de autocorrelación)
     """
-    # Normalizar perfil
-    profile_normalized = (line_profile - np.mean(line_profile)) / np.std(line_profile)
-
-    # Calcular autocorrelación
-    autocorr = np.correlate(profile_normalized, profile_normalized, mode='full')
-    autocorr = autocorr[len(autocorr)//2:]  # Solo parte positiva
-
-    # Normalizar
-    autocorr = autocorr / autocorr[0]
+    autocorr = autocorrelation_fft(line_profile)
 
     # Encontrar primer pico (excluyendo el pico en cero)
     peaks, _ = find_peaks(autocorr[1:], height=0.3)
@@ -286,3 +527,147 @@ def autocorrelation_analysis(line_profile):
         return fringe_spacing
     else:
         return None
+
+
+def autocorrelation_analysis_batch(line_profiles, axis=-1, min_height=0.3):
+    """
+    Versión vectorizada de `autocorrelation_analysis` para muchos perfiles.
+
+    Parameters:
+    -----------
+    line_profiles : numpy.ndarray
+        Arreglo 2D de perfiles de intensidad (p. ej. un perfil por fila)
+    axis : int
+        Eje a lo largo del cual se extiende cada perfil
+    min_height : float
+        Altura mínima del pico de autocorrelación
+
+    Returns:
+    --------
+    fringe_spacings : numpy.ndarray
+        Espaciado entre franjas en píxeles por perfil (NaN si no hay pico)
+    """
+    return _first_peak_lag(autocorrelation_fft(line_profiles, axis=axis), min_height)
+
+
+def _zero_crossing_spacing(signal_filtered, valid):
+    """
+    Espaciado a partir de los cruces por cero (interpolados linealmente) de
+    una señal filtrada, dentro de la región `valid`. Dos cruces por franja.
+    """
+    y0 = signal_filtered[..., :-1]
+    y1 = signal_filtered[..., 1:]
+    crossing = (np.signbit(y0) != np.signbit(y1)) & valid[:-1] & valid[1:]
+
+    n_crossings = crossing.sum(axis=-1)
+    first = np.argmax(crossing, axis=-1)
+    last = crossing.shape[-1] - 1 - np.argmax(crossing[..., ::-1], axis=-1)
+
+    def position(idx):
+        a = np.take_along_axis(y0, idx[..., np.newaxis], axis=-1)[..., 0]
+        b = np.take_along_axis(y1, idx[..., np.newaxis], axis=-1)[..., 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return idx + np.where(a != b, a / (a - b), 0.5)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spacing = 2 * (position(last) - position(first)) / (n_crossings - 1)
+    return np.where(n_crossings >= 2, spacing, np.nan)
+
+
+def analyze_fringe_estimators(line_profiles, axis=-1, min_freq=0.01, max_freq=0.5,
+                              band=0.5, refine=None):
+    """
+    Calcula tres estimadores del espaciado de franjas a partir de una sola FFT.
+
+    Se calcula una única `rfft` del perfil sin tendencia y con ventana de
+    Hann, rellenada con ceros hasta una longitud rápida >= 2N-1, y de ella se
+    derivan:
+
+    - 'fft': pico dominante del espectro de potencia (malla 2x más fina que
+      la de `analyze_fringe_pattern` gracias al relleno).
+    - 'autocorrelation': primer pico de la autocorrelación (Wiener–Khinchin,
+      |X|² → irfft). Es la autocorrelación del perfil con ventana.
+    - 'zero_crossing': cruces por cero del perfil filtrado con un pasa-banda
+      de ancho relativo `band` alrededor del pico (máscara sobre la misma FFT).
+
+    Acepta un perfil o un arreglo de perfiles; todo se calcula en lote.
+
+    Parameters:
+    -----------
+    line_profiles : numpy.ndarray
+        Perfil 1D o arreglo de perfiles (uno por fila a lo largo de `axis`)
+    axis : int
+        Eje a lo largo del cual se extiende cada perfil
+    min_freq : float
+        Frecuencia mínima considerada (ciclos/píxel), excluye DC
+    max_freq : float
+        Frecuencia máxima considerada (ciclos/píxel)
+    band : float
+        Ancho relativo del pasa-banda para el estimador de cruces por cero
+    refine : str or None
+        None o 'parabolic' para refinar el pico del estimador 'fft'
+
+    Returns:
+    --------
+    estimates : dict
+        'fft', 'autocorrelation', 'zero_crossing' (espaciados en píxeles) y
+        'dominant_freq' (ciclos/píxel). Arreglos con un valor por perfil (NaN
+        si el estimador falla), o escalares si la entrada es 1D
+    """
+    profiles = np.moveaxis(spectral.as_real(line_profiles), axis, -1)
+    single = profiles.ndim == 1
+    profiles = np.atleast_2d(profiles)
+    n = profiles.shape[-1]
+
+    window = spectral.hann_window(n)
+    profiles_windowed = signal.detrend(profiles, axis=-1) * window
+
+    # Transformada compartida por los tres estimadores
+    n_fft = spectral.next_fast_len(2 * n - 1)
+    fft_shared = spectral.rfft(profiles_windowed, n=n_fft, axis=-1)
+    power = fft_shared.real ** 2 + fft_shared.imag ** 2
+    freqs = spectral.rfftfreq(n_fft)
+
+    # 1. Pico dominante del espectro de potencia
+    freq_mask = (freqs > min_freq) & (freqs < max_freq)
+    masked_power = np.where(freq_mask, power, 0.0)
+    center = masked_power[..., 1:-1]
+    is_peak = np.zeros(power.shape, dtype=bool)
+    is_peak[..., 1:-1] = (center > masked_power[..., :-2]) & (center > masked_power[..., 2:])
+    is_peak &= freq_mask
+    has_peak = np.any(is_peak, axis=-1)
+    peak_idx = np.argmax(np.where(is_peak, masked_power, -np.inf), axis=-1)
+
+    peak_bin = peak_idx.astype(float)
+    if refine == 'parabolic':
+        idx = np.clip(peak_idx, 1, len(freqs) - 2)[..., np.newaxis]
+        neighbours = np.take_along_axis(power, idx + np.array([-1, 0, 1]), axis=-1)
+        peak_bin = peak_bin + _parabolic_offset(neighbours[..., 0], neighbours[..., 1],
+                                                neighbours[..., 2])
+    elif refine is not None:
+        raise ValueError(f"Método de refinamiento no soportado: {refine}")
+
+    dominant_freqs = np.where(has_peak, peak_bin / n_fft, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spacing_fft = 1.0 / dominant_freqs
+
+    # 2. Autocorrelación desde el mismo espectro
+    spacing_acf = _first_peak_lag(_autocorrelation_from_spectrum(fft_shared, n, n_fft))
+
+    # 3. Cruces por cero del perfil filtrado alrededor del pico
+    f0 = np.where(has_peak, dominant_freqs, 0.0)[..., np.newaxis]
+    passband = np.abs(freqs - f0) <= band * f0
+    filtered = spectral.irfft(np.where(passband, fft_shared, 0), n=n_fft, axis=-1)[..., :n]
+    spacing_zc = np.where(has_peak, _zero_crossing_spacing(filtered, window > 0.1), np.nan)
+
+    estimates = {
+        'fft': spacing_fft,
+        'autocorrelation': spacing_acf,
+        'zero_crossing': spacing_zc,
+        'dominant_freq': dominant_freqs,
+    }
+
+    if single:
+        estimates = {k: float(v[0]) for k, v in estimates.items()}
+
+    return estimates
@@ -0,0 +1,227 @@
+"""
+Módulo de conteo de franjas en secuencias de cuadros (modo streaming).
+
+En una medición real con el Interferómetro de Michelson el espejo móvil se
+desplaza y las franjas pasan por el campo de visión. Este módulo sigue la fase
+de las franjas cuadro a cuadro y acumula el número de franjas que han pasado,
+de donde se obtiene el desplazamiento del espejo (d = N·λ/2).
+
+Los cuadros se leen como un generador (directorio de imágenes o video local),
+de modo que la memoria usada no depende de la longitud de la grabación.
+"""
+
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+from .image_processing import load_and_preprocess_image, extract_line_profile
+from .fft_analysis import analyze_fringe_patterns_batch
+from . import spectral
+
+
+def iter_frames(source, pattern='*.jpeg'):
+    """
+    Recorre los cuadros de una secuencia sin cargarla completa en memoria.
+
+    Parameters:
+    -----------
+    source : str or pathlib.Path
+        Directorio con imágenes (ordenadas por nombre) o archivo de video
+    pattern : str
+        Patrón de nombres de archivo cuando `source` es un directorio
+
+    Yields:
+    -------
+    img_gray : numpy.ndarray
+        Canal rojo de cada cuadro (uint8)
+    """
+    source = Path(source)
+
+    if source.is_dir():
+        for frame_path in sorted(source.glob(pattern)):
+            yield load_and_preprocess_image(str(frame_path))
+        return
+
+    capture = cv2.VideoCapture(str(source))
+    if not capture.isOpened():
+        raise IOError(f"No se pudo abrir el video: {source}")
+
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            # OpenCV entrega BGR: el canal rojo es el índice 2
+            yield frame[:, :, 2] if frame.ndim == 3 else frame
+    finally:
+        capture.release()
+
+
+class FringeCounter:
+    """
+    Seguidor incremental de la fase de las franjas.
+
+    La fase de cada cuadro se obtiene evaluando la DFT del perfil en una sola
+    frecuencia (la frecuencia dominante de las franjas), lo que cuesta O(N)
+    por cuadro en lugar de una FFT completa. La frecuencia se re-estima cada
+    `refresh_every` cuadros con el promedio de los espectros de potencia de
+    los perfiles de una ventana deslizante de `window_size` cuadros (memoria
+    acotada). Se promedian espectros y no perfiles: el perfil promedio de
+    franjas en movimiento pierde contraste cuando se desplazan cerca de una
+    franja dentro de la ventana, mientras que el espectro de potencia no
+    depende de la fase.
+
+    Si cambia la longitud del perfil (otro tamaño de cuadro), se reinician la
+    ventana, la frecuencia y la referencia de fase; el conteo acumulado se
+    conserva.
+
+    El conteo supone que entre dos cuadros consecutivos las franjas se
+    desplazan menos de media franja; si no, la fase se envuelve y se pierden
+    franjas (aumentar la tasa de cuadros o reducir la velocidad del espejo).
+
+    Parameters:
+    -----------
+    wavelength : float
+        Longitud de onda del láser en metros (para el desplazamiento)
+    window_size : int
+        Número de cuadros de la ventana deslizante
+    refresh_every : int
+        Cada cuántos cuadros se re-estima la frecuencia de las franjas
+    """
+
+    def __init__(self, wavelength=632.8e-9, window_size=32, refresh_every=16):
+        self.wavelength = wavelength
+        self.window_size = window_size
+        self.refresh_every = refresh_every
+
+        self.dominant_freq = None
+        self.fringe_count = 0.0
+        self.n_frames = 0
+
+        self._window = deque(maxlen=window_size)
+        self._kernel = None
+        self._prev_profile = None
+        self._prev_coeff = None
+
+    @property
+    def displacement(self):
+        """Desplazamiento del espejo en metros: d = N·λ/2"""
+        return self.fringe_count * self.wavelength / 2.0
+
+    def _set_frequency(self, freq, n):
+        """Construye el núcleo de la DFT de un solo bin para la frecuencia dada"""
+        self.dominant_freq = freq
+        x = np.arange(n)
+        self._kernel = spectral.hann_window(n) * np.exp(-2j * np.pi * freq * x)
+        if self._prev_profile is not None:
+            # Recalcular la referencia con la nueva frecuencia para no
+            # introducir un salto de fase artificial
+            self._prev_coeff = self._coefficient(self._prev_profile)
+
+    def _coefficient(self, profile):
+        """Coeficiente complejo de Fourier del perfil en la frecuencia actual"""
+        return np.dot(profile - profile.mean(), self._kernel)
+
+    def _reset(self):
+        """Descarta la ventana, la frecuencia y la referencia de fase"""
+        self._window.clear()
+        self.dominant_freq = None
+        self._kernel = None
+        self._prev_profile = None
+        self._prev_coeff = None
+
+    def _estimate_frequency(self, min_freq=0.01, max_freq=0.5):
+        """
+        Frecuencia dominante (ciclos/píxel) del espectro de potencia promedio
+        de la ventana, o None si no hay pico en la banda.
+        """
+        n = len(self._window[0])
+        # Una FFT por lote para todos los perfiles de la ventana
+        _, _, power_spectra = analyze_fringe_patterns_batch(np.array(self._window))
+        mean_power = np.where(spectral.band_mask(n, min_freq, max_freq),
+                              power_spectra.mean(axis=0), 0.0)
+
+        peak = int(np.argmax(mean_power))
+        return float(spectral.positive_freqs(n)[peak]) if mean_power[peak] > 0 else None
+
+    def update(self, line_profile):
+        """
+        Procesa el perfil de un nuevo cuadro.
+
+        Parameters:
+        -----------
+        line_profile : numpy.ndarray
+            Perfil de intensidad 1D del cuadro
+
+        Returns:
+        --------
+        state : dict
+            'frame', 'phase' (rad), 'fringe_count', 'displacement' (m) y
+            'dominant_freq' (ciclos/píxel); 'phase' es None mientras no se
+            haya identificado la frecuencia de las franjas
+        """
+        profile = np.asarray(line_profile, dtype=float)
+        if self._window and len(profile) != len(self._window[0]):
+            self._reset()
+        self._window.append(profile)
+
+        needs_refresh = (self.dominant_freq is None
+                         or self.n_frames % self.refresh_every == 0)
+        if needs_refresh:
+            freq = self._estimate_frequency()
+            if freq is not None and freq != self.dominant_freq:
+                self._set_frequency(freq, len(profile))
+
+        phase = None
+        if self._kernel is not None:
+            coeff = self._coefficient(profile)
+            if self._prev_coeff is not None:
+                # Diferencia de fase envuelta a (-π, π]; positiva cuando las
+                # franjas avanzan hacia índices crecientes del perfil
+                delta = np.angle(self._prev_coeff * np.conj(coeff))
+                self.fringe_count += delta / (2 * np.pi)
+            self._prev_coeff = coeff
+            phase = float(np.angle(coeff))
+
+        self._prev_profile = profile
+        self.n_frames += 1
+
+        return {
+            'frame': self.n_frames - 1,
+            'phase': phase,
+            'fringe_count': float(self.fringe_count),
+            'displacement': float(self.displacement),
+            'dominant_freq': self.dominant_freq
+        }
+
+
+def count_fringes(frames, method='horizontal', wavelength=632.8e-9,
+                  window_size=32, refresh_every=16):
+    """
+    Cuenta franjas sobre una secuencia de cuadros como un generador.
+
+    Parameters:
+    -----------
+    frames : iterable of numpy.ndarray
+        Cuadros en escala de grises (p. ej. la salida de `iter_frames`)
+    method : str
+        Método de extracción del perfil (ver `extract_line_profile`)
+    wavelength : float
+        Longitud de onda del láser en metros
+    window_size : int
+        Número de cuadros de la ventana deslizante
+    refresh_every : int
+        Cada cuántos cuadros se re-estima la frecuencia de las franjas
+
+    Yields:
+    -------
+    state : dict
+        Estado acumulado tras cada cuadro (ver `FringeCounter.update`)
+    """
+    counter = FringeCounter(wavelength=wavelength, window_size=window_size,
+                            refresh_every=refresh_every)
+
+    for img_gray in frames:
+        yield counter.update(extract_line_profile(img_gray, method=method))
@@ -5,44 +5,110 @@ Este módulo contiene funciones para cargar, preprocesar y extraer información
 de las imágenes de patrones de interferencia del Interferómetro de Michelson.
 """
 
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import numpy as np
 from PIL import Image
 import cv2
 
+from . import spectral
+
+
+def file_digest(image_path, chunk_size=1 << 20):
+    """Hash del contenido del archivo (independiente del nombre y la fecha)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(image_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-def load_and_preprocess_image(image_path):
+
+def _decode_red_channel(image_path, roi=None, reduce=1):
+    """
+    Decodifica solo lo necesario de la imagen: reducción de resolución en la
+    propia decodificación JPEG (escalado DCT 1/2, 1/4, 1/8), recorte y
+    extracción del canal rojo sin materializar el arreglo RGB completo.
+    """
+    img = Image.open(image_path)
+    full_w, full_h = img.size
+
+    if reduce > 1:
+        if reduce in (2, 4, 8):
+            # Solo JPEG: el decodificador entrega directamente la versión reducida
+            img.draft('RGB', (full_w // reduce, full_h // reduce))
+        # Completar la reducción si el decodificador no llegó al factor pedido
+        remaining = img.size[0] // max(full_w // reduce, 1)
+        if remaining > 1:
+            img = img.reduce(remaining)
+
+    if roi is not None:
+        # ROI en coordenadas de la imagen original: (x0, y0, x1, y1)
+        scale_x = img.size[0] / full_w
+        scale_y = img.size[1] / full_h
+        x0, y0, x1, y1 = roi
+        img = img.crop((int(x0 * scale_x), int(y0 * scale_y),
+                        int(round(x1 * scale_x)), int(round(y1 * scale_y))))
+
+    # Para láser rojo, podemos usar solo el canal rojo para mejor SNR
+    if img.mode == 'L':
+        red = img
+    elif img.mode == 'RGB':
+        red = img.getchannel('R')
+    else:
+        red = img.convert('RGB').getchannel('R')
+
+    return np.asarray(red, dtype=np.uint8)
+
+
+def load_and_preprocess_image(image_path, roi=None, reduce=1, cache_dir=None):
     """
     Carga una imagen y la convierte a escala de grises para análisis.
 
+    Se usa el canal rojo (láser He-Ne). Solo se decodifica lo necesario: el
+    canal rojo, el recorte `roi` y la resolución reducida `reduce`. Si se da
+    `cache_dir`, el arreglo decodificado se guarda como `.npy` con el hash del
+    contenido del archivo y los parámetros como clave, y las siguientes cargas
+    lo leen con mapeo en memoria sin volver a decodificar el JPEG.
+
     Parameters:
     -----------
     image_path : str
         Ruta al archivo de imagen
+    roi : tuple of int, optional
+        Región (x0, y0, x1, y1) en píxeles de la imagen original
+    reduce : int
+        Factor de reducción de resolución (1, 2, 4 u 8 usan el escalado del
+        decodificador JPEG; otros factores promedian bloques)
+    cache_dir : str or pathlib.Path, optional
+        Directorio de la caché de arreglos decodificados
 
     Returns:
     --------
     img_gray : numpy.ndarray
-        Imagen en escala de grises (valores entre 0-255)
+        Imagen en escala de grises (valores entre 0-255, uint8). Si viene de
+        la caché es un `numpy.memmap` de solo lectura
     """
-    # Cargar imagen
-    img = Image.open(image_path)
+    if cache_dir is None:
+        return _decode_red_channel(image_path, roi=roi, reduce=reduce)
 
-    # Convertir a RGB si es necesario
-    if img.mode != 'RGB':
-        img = img.convert('RGB')
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
 
-    # Convertir a numpy array
-    img_array = np.array(img)
+    roi_key = 'full' if roi is None else '-'.join(str(int(v)) for v in roi)
+    cache_file = cache_dir / f"{file_digest(image_path)}_r{reduce}_{roi_key}.npy"
 
-    # Convertir a escala de grises
-    # Para láser rojo, podemos usar solo el canal rojo para mejor SNR
-    if len(img_array.shape) == 3:
-        # Usar el canal rojo (índice 0) ya que es láser He-Ne (rojo)
-        img_gray = img_array[:, :, 0]
-    else:
-        img_gray = img_array
+    if not cache_file.exists():
+        img_gray = _decode_red_channel(image_path, roi=roi, reduce=reduce)
+        # Escritura atómica: otros procesos nunca ven un archivo a medias
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_file, 'wb') as f:
+            np.save(f, img_gray)
+        os.replace(tmp_file, cache_file)
 
-    return img_gray
+    return np.load(cache_file, mmap_mode='r')
 
 
 def extract_line_profile(img_gray, method='horizontal'):
@@ -59,20 +125,24 @@ def extract_line_profile(img_gray, method='horizontal'):
     Returns:
     --------
     line_profile : numpy.ndarray
-        Perfil de intensidad 1D
+        Perfil de intensidad 1D (en el tipo real de la precisión actual, ver
+        `spectral.set_precision`)
     """
+    # Acumular directamente en la precisión pedida (sin pasar por float64)
+    dtype = spectral.real_dtype()
+
     if method == 'horizontal':
         # Promediar a lo largo del eje vertical (promedio de todas las filas)
-        line_profile = np.mean(img_gray, axis=0)
+        line_profile = np.mean(img_gray, axis=0, dtype=dtype)
 
     elif method == 'vertical':
         # Promediar a lo largo del eje horizontal (promedio de todas las columnas)
-        line_profile = np.mean(img_gray, axis=1)
+        line_profile = np.mean(img_gray, axis=1, dtype=dtype)
 
     elif method == 'average':
         # Promediar ambas direcciones
-        h_profile = np.mean(img_gray, axis=0)
-        v_profile = np.mean(img_gray, axis=1)
+        h_profile = np.mean(img_gray, axis=0, dtype=dtype)
+        v_profile = np.mean(img_gray, axis=1, dtype=dtype)
 
         # Usar el perfil con mayor varianza (más información de franjas)
         if np.var(h_profile) > np.var(v_profile):
@@ -82,34 +152,144 @@ def extract_line_profile(img_gray, method='horizontal'):
 
     else:
         # Por defecto, usar horizontal
-        line_profile = np.mean(img_gray, axis=0)
+        line_profile = np.mean(img_gray, axis=0, dtype=dtype)
 
     return line_profile
 
 
-def apply_preprocessing_filters(img_gray, denoise=True, enhance_contrast=True):
+def _denoise_nlmeans(img):
+    """Non-local means de OpenCV (ventana de búsqueda de 21 píxeles)"""
+    return cv2.fastNlMeansDenoising(img, None, h=10, templateWindowSize=7, searchWindowSize=21)
+
+
+def _denoise_gaussian(img, sigma=1.5):
+    """Suavizado gaussiano separable (una pasada por filas y otra por columnas)"""
+    kernel = cv2.getGaussianKernel(2 * int(np.ceil(3 * sigma)) + 1, sigma)
+    return cv2.sepFilter2D(img, -1, kernel, kernel, borderType=cv2.BORDER_REFLECT)
+
+
+def _denoise_bandpass(img, fringe_freq=None, bandwidth=0.5):
+    """
+    Pasa-banda en el dominio de Fourier alrededor de la frecuencia radial de
+    las franjas. Conserva DC (brillo medio) y una banda gaussiana de ancho
+    relativo `bandwidth` centrada en `fringe_freq` (ciclos/píxel).
+    """
+    # La misma rfft2 sirve para estimar la frecuencia y para filtrar
+    spectrum = ImageSpectrum(img)
+    if fringe_freq is None:
+        # Estimar la frecuencia de las franjas a partir del pico del espectro
+        h, w = img.shape
+        dy, dx = spectrum.dominant_peak()
+        fringe_freq = np.hypot(dy / h, dx / w)
+
+    radial_freq = spectral.rfft2_radial_freq(img.shape)
+    sigma_f = max(bandwidth * fringe_freq, 1.0 / max(img.shape))
+    transfer = np.exp(-0.5 * ((radial_freq - fringe_freq) / sigma_f) ** 2)
+    transfer = transfer.astype(spectral.real_dtype(), copy=False)
+    transfer[0, 0] = 1.0
+
+    filtered = spectral.irfft2(spectrum.half_spectrum * transfer, s=img.shape)
+    return np.clip(np.rint(filtered), 0, 255).astype(np.uint8)
+
+
+# Solape de las teselas de `_apply_tiled`: debe cubrir el radio de influencia
+# del filtro. Non-local means (búsqueda de 21 y plantilla de 7) depende de los
+# píxeles a 21//2 + 7//2 = 13 píxeles; el gaussiano, de ceil(3σ) = 5 píxeles
+# con σ = 1.5 (y hasta σ = 5). Con ese solape el resultado por teselas es
+# idéntico al de la imagen completa.
+TILE_OVERLAP = 16
+
+
+def _apply_tiled(func, img, tile_size=512, overlap=TILE_OVERLAP, n_threads=None):
+    """
+    Aplica un filtro local por teselas solapadas en varios hilos (las
+    funciones de OpenCV liberan el GIL). El solape evita costuras en los
+    bordes de las teselas y debe ser al menos el radio de influencia del
+    filtro (ver `TILE_OVERLAP`).
+    """
+    h, w = img.shape
+    output = np.empty_like(img)
+    tiles = [(y, x) for y in range(0, h, tile_size) for x in range(0, w, tile_size)]
+
+    def process(tile):
+        y, x = tile
+        y0, x0 = max(y - overlap, 0), max(x - overlap, 0)
+        y1, x1 = min(y + tile_size + overlap, h), min(x + tile_size + overlap, w)
+        filtered = func(np.ascontiguousarray(img[y0:y1, x0:x1]))
+        ty, tx = min(tile_size, h - y), min(tile_size, w - x)
+        output[y:y+ty, x:x+tx] = filtered[y-y0:y-y0+ty, x-x0:x-x0+tx]
+
+    with ThreadPoolExecutor(max_workers=n_threads or os.cpu_count()) as pool:
+        list(pool.map(process, tiles))
+
+    return output
+
+
+def apply_preprocessing_filters(img_gray, denoise=True, enhance_contrast=True,
+                                fringe_freq=None, bandwidth=0.5, sigma=1.5,
+                                tile_size=512, n_threads=None):
     """
     Aplica filtros de preprocesamiento para mejorar la calidad del análisis.
 
+    Modos de reducción de ruido (costo aproximado por megapíxel y calidad):
+
+    ==============  ===================  ========================================
+    Modo            Costo                Calidad / uso
+    ==============  ===================  ========================================
+    'nlmeans'       muy alto (segundos)  Mejor preservación de bordes; no apto
+                                         para imágenes completas en producción
+    'nlmeans_tiled' alto / n_hilos       Idéntico a 'nlmeans' (teselas solapadas
+                                         de `tile_size` en varios hilos)
+    'gaussian'      muy bajo (ms)        Suaviza ruido de alta frecuencia; atenúa
+                                         franjas con periodo cercano a `sigma`
+    'bandpass'      bajo (2 FFT reales)  Conserva solo la banda de las franjas;
+                                         el más fiel al modelo físico
+    ==============  ===================  ========================================
+
     Parameters:
     -----------
     img_gray : numpy.ndarray
-        Imagen en escala de grises
-    denoise : bool
-        Si True, aplica filtro de reducción de ruido
+        Imagen en escala de grises (uint8)
+    denoise : bool or str
+        Modo de reducción de ruido: True ('nlmeans'), False/None (ninguno) o
+        uno de los modos de la tabla
     enhance_contrast : bool
         Si True, mejora el contraste
+    fringe_freq : float, optional
+        Frecuencia radial esperada de las franjas (ciclos/píxel) para
+        'bandpass'; si es None se estima del espectro 2D
+    bandwidth : float
+        Ancho relativo de la banda de 'bandpass' (fracción de `fringe_freq`)
+    sigma : float
+        Desviación estándar (píxeles) de 'gaussian'
+    tile_size : int
+        Tamaño de tesela de 'nlmeans_tiled'
+    n_threads : int, optional
+        Hilos de 'nlmeans_tiled' (por defecto, todos los núcleos)
 
     Returns:
     --------
     img_processed : numpy.ndarray
         Imagen procesada
     """
-    img_processed = img_gray.copy()
+    img_processed = np.array(img_gray, copy=True)
+
+    if denoise is True:
+        denoise = 'nlmeans'
 
     # Reducción de ruido
-    if denoise:
-        img_processed = cv2.fastNlMeansDenoising(img_processed, None, h=10, templateWindowSize=7, searchWindowSize=21)
+    if denoise == 'nlmeans':
+        img_processed = _denoise_nlmeans(img_processed)
+    elif denoise == 'nlmeans_tiled':
+        img_processed = _apply_tiled(_denoise_nlmeans, img_processed, tile_size=tile_size,
+                                     n_threads=n_threads)
+    elif denoise == 'gaussian':
+        img_processed = _denoise_gaussian(img_processed, sigma=sigma)
+    elif denoise == 'bandpass':
+        img_processed = _denoise_bandpass(img_processed, fringe_freq=fringe_freq,
+                                          bandwidth=bandwidth)
+    elif denoise:
+        raise ValueError(f"Modo de reducción de ruido desconocido: {denoise}")
 
     # Mejora de contraste
     if enhance_contrast:
@@ -120,7 +300,90 @@ def apply_preprocessing_filters(img_gray, denoise=True, enhance_contrast=True):
     return img_processed
 
 
-def detect_fringe_orientation(img_gray):
+class ImageSpectrum:
+    """
+    Espectro de Fourier 2D de una imagen, calculado una sola vez y compartido.
+
+    La transformada se calcula con `rfft2` (la imagen es real, así que la
+    mitad negativa del último eje es redundante) y de forma perezosa: solo la
+    primera vez que algún consumidor la pide. La detección de orientación, la
+    extracción de perfiles orientados y el panel del espectro en las gráficas
+    reutilizan el mismo objeto en lugar de recalcular `fft2` cada uno.
+
+    Parameters:
+    -----------
+    img_gray : numpy.ndarray
+        Imagen en escala de grises
+    """
+
+    def __init__(self, img_gray):
+        self.img_gray = img_gray
+        self.shape = img_gray.shape
+        self._half = None
+        self._magnitude = None
+
+    @property
+    def half_spectrum(self):
+        """Transformada `rfft2` de la imagen (forma H x (W//2 + 1))"""
+        if self._half is None:
+            self._half = spectral.rfft2(spectral.as_real(self.img_gray))
+        return self._half
+
+    @property
+    def magnitude(self):
+        """
+        Magnitud del espectro completo centrado (equivalente a
+        `abs(fftshift(fft2(img)))`), reconstruida por simetría hermítica.
+        """
+        if self._magnitude is None:
+            h, w = self.shape
+            half_magnitude = np.abs(self.half_spectrum)
+            n_half = half_magnitude.shape[1]
+
+            full = np.empty((h, w), dtype=half_magnitude.dtype)
+            full[:, :n_half] = half_magnitude
+            # |F[ky, kx]| = |F[-ky, -kx]| para imágenes reales
+            rows = (-np.arange(h)) % h
+            cols = w - np.arange(n_half, w)
+            full[:, n_half:] = half_magnitude[rows][:, cols]
+
+            self._magnitude = np.fft.fftshift(full)
+        return self._magnitude
+
+    def log_magnitude(self):
+        """Magnitud en escala logarítmica para visualización: log(|F| + 1)"""
+        return np.log(self.magnitude + 1)
+
+    def dominant_peak(self, mask_size=20):
+        """
+        Posición del pico dominante del espectro centrado, excluyendo un
+        cuadrado de lado 2·mask_size alrededor de DC.
+
+        Returns:
+        --------
+        dy, dx : int
+            Desplazamiento del pico respecto al centro (en bins)
+        """
+        center_y, center_x = np.array(self.shape) // 2
+        mask = spectral.center_mask(self.shape, mask_size)
+        masked_spectrum = np.where(mask, self.magnitude, 0)
+
+        max_idx = np.unravel_index(np.argmax(masked_spectrum), masked_spectrum.shape)
+        return int(max_idx[0] - center_y), int(max_idx[1] - center_x)
+
+    def fringe_angle(self, mask_size=20):
+        """
+        Ángulo (grados) de la dirección de variación de las franjas en el
+        espacio de la imagen, a partir de la frecuencia del pico en
+        ciclos/píxel (corrige la diferencia de bins entre ejes en imágenes no
+        cuadradas).
+        """
+        dy, dx = self.dominant_peak(mask_size)
+        h, w = self.shape
+        return float(np.degrees(np.arctan2(dy / h, dx / w)))
+
+
+def detect_fringe_orientation(img_gray, spectrum=None):
     """
     Detecta la orientación dominante de las franjas de interferencia.
 
@@ -128,6 +391,8 @@ def detect_fringe_orientation(img_gray):
     -----------
     img_gray : numpy.ndarray
         Imagen en escala de grises
+    spectrum : ImageSpectrum, optional
+        Espectro 2D ya calculado de la imagen, para no recalcular la FFT
 
     Returns:
     --------
@@ -136,29 +401,12 @@ def detect_fringe_orientation(img_gray):
     angle : float
         Ángulo de orientación en grados
     """
-    # Calcular FFT 2D
-    fft_2d = np.fft.fft2(img_gray)
-    fft_2d_shifted = np.fft.fftshift(fft_2d)
-    magnitude_spectrum = np.abs(fft_2d_shifted)
-
-    # Encontrar el pico dominante (excluyendo el centro)
-    center_y, center_x = np.array(magnitude_spectrum.shape) // 2
-    mask = np.ones_like(magnitude_spectrum, dtype=bool)
-
-    # Enmascarar región central
-    mask_size = 20
-    mask[center_y-mask_size:center_y+mask_size, center_x-mask_size:center_x+mask_size] = False
+    if spectrum is None:
+        spectrum = ImageSpectrum(img_gray)
 
-    masked_spectrum = magnitude_spectrum.copy()
-    masked_spectrum[~mask] = 0
-
-    # Encontrar coordenadas del máximo
-    max_idx = np.unravel_index(np.argmax(masked_spectrum), masked_spectrum.shape)
-    dy = max_idx[0] - center_y
-    dx = max_idx[1] - center_x
-
-    # Calcular ángulo
-    angle = np.degrees(np.arctan2(dy, dx))
+    # Ángulo del pico dominante (excluyendo el centro) en ciclos/píxel: en
+    # imágenes no cuadradas los bins de cada eje tienen distinto tamaño
+    angle = spectrum.fringe_angle(mask_size=20)
 
     # Determinar orientación
     if abs(angle) < 45 or abs(angle) > 135:
@@ -169,6 +417,60 @@ def detect_fringe_orientation(img_gray):
     return orientation, angle
 
 
+def extract_oriented_profile(img_gray, angle=None, spectrum=None, block_rows=512):
+    """
+    Extrae un perfil de línea a lo largo de una dirección arbitraria.
+
+    Cada píxel se proyecta sobre la dirección de variación de las franjas y
+    se promedian los píxeles que caen en el mismo bin de 1 píxel, es decir,
+    se promedia a lo largo de las franjas inclinadas. Generaliza los modos
+    'horizontal' (0°) y 'vertical' (90°) de `extract_line_profile`.
+
+    Parameters:
+    -----------
+    img_gray : numpy.ndarray
+        Imagen en escala de grises
+    angle : float, optional
+        Dirección del perfil en grados (eje x hacia la derecha, eje y hacia
+        abajo). Si es None, se usa `ImageSpectrum.fringe_angle`
+    spectrum : ImageSpectrum, optional
+        Espectro 2D ya calculado de la imagen (se usa si `angle` es None)
+    block_rows : int
+        Filas procesadas por bloque, para acotar la memoria temporal
+
+    Returns:
+    --------
+    line_profile : numpy.ndarray
+        Perfil de intensidad 1D a lo largo de la dirección dada
+    """
+    if angle is None:
+        if spectrum is None:
+            spectrum = ImageSpectrum(img_gray)
+        angle = spectrum.fringe_angle()
+
+    theta = np.radians(angle)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    h, w = img_gray.shape
+
+    # Rango de la coordenada proyectada s = x·cosθ + y·sinθ
+    corners_s = np.array([0, (w - 1) * cos_t, (h - 1) * sin_t, (w - 1) * cos_t + (h - 1) * sin_t])
+    s_min = corners_s.min()
+    n_bins = int(np.rint(corners_s.max() - s_min)) + 1
+
+    sums = np.zeros(n_bins)
+    counts = np.zeros(n_bins)
+    x_term = np.arange(w) * cos_t - s_min
+
+    for start in range(0, h, block_rows):
+        rows = np.arange(start, min(start + block_rows, h))
+        bins = np.rint(x_term[np.newaxis, :] + rows[:, np.newaxis] * sin_t).astype(np.intp).ravel()
+        sums += np.bincount(bins, weights=img_gray[rows].ravel(), minlength=n_bins)
+        counts += np.bincount(bins, minlength=n_bins)
+
+    valid = counts > 0
+    return (sums[valid] / counts[valid]).astype(spectral.real_dtype(), copy=False)
+
+
 def extract_roi(img_gray, roi_percentage=0.8):
     """
     Extrae una región de interés (ROI) del centro de la imagen.
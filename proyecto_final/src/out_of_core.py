@@ -0,0 +1,250 @@
+"""
+Espectro 2D fuera de memoria para imágenes muy grandes.
+
+Un escaneo de 16k×16k necesita unos 4 GB por copia compleja de su FFT. Aquí
+la transformada `rfft2` se escribe en un archivo `.npy` abierto con
+`np.memmap` y se calcula en dos pasadas por bloques (FFT de filas y luego de
+columnas), de modo que la memoria pico queda acotada por `max_memory` y no
+por el tamaño de la imagen.
+
+`OutOfCoreSpectrum` tiene la misma interfaz que `ImageSpectrum`
+(`half_spectrum`, `dominant_peak`, `fringe_angle`, `log_magnitude`), así que
+se puede pasar a `detect_fringe_orientation`, `extract_oriented_profile` y
+`prepare_plot_data` en su lugar.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from . import spectral
+
+
+# Memoria pico por defecto para los bloques (bytes)
+DEFAULT_MAX_MEMORY = 256 * 2 ** 20
+
+# Copias temporales por bloque (entrada convertida, FFT y escritura)
+_BLOCK_COPIES = 3
+
+
+def _block_length(n_lines, bytes_per_line, max_memory):
+    """Número de filas (o columnas) por bloque para no superar `max_memory`"""
+    return int(np.clip(max_memory // (_BLOCK_COPIES * bytes_per_line), 1, n_lines))
+
+
+def rfft2_memmap(image, path, max_memory=DEFAULT_MAX_MEMORY, dtype=None):
+    """
+    Transformada `rfft2` de una imagen real escrita en un archivo `.npy`.
+
+    Primera pasada: `rfft` de bloques de filas de la imagen, escritos en el
+    archivo. Segunda pasada: `fft` de bloques de columnas, leídos y escritos
+    en el mismo archivo. La imagen puede ser a su vez un memmap (p. ej. la
+    caché `.npy` de `load_and_preprocess_image`).
+
+    Parameters:
+    -----------
+    image : numpy.ndarray
+        Imagen 2D real (alto × ancho)
+    path : str
+        Archivo `.npy` de salida
+    max_memory : int
+        Memoria máxima para los bloques en bytes
+    dtype : numpy.dtype, optional
+        Tipo complejo del espectro (por defecto, el de la precisión actual)
+
+    Returns:
+    --------
+    half_spectrum : numpy.memmap
+        Espectro de forma (alto, ancho//2 + 1), igual a `rfft2(image)`
+    """
+    dtype = spectral.complex_dtype() if dtype is None else dtype
+    h, w = image.shape
+    n_half = w // 2 + 1
+    itemsize = np.dtype(dtype).itemsize
+
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(h, n_half))
+
+    rows = _block_length(h, n_half * itemsize, max_memory)
+    for r0 in range(0, h, rows):
+        block = np.asarray(image[r0:r0 + rows], dtype=np.finfo(dtype).dtype)
+        out[r0:r0 + rows] = spectral.rfft(block, axis=1)
+
+    cols = _block_length(n_half, h * itemsize, max_memory)
+    for c0 in range(0, n_half, cols):
+        out[:, c0:c0 + cols] = spectral.fft(out[:, c0:c0 + cols], axis=0)
+
+    out.flush()
+    return out
+
+
+class OutOfCoreSpectrum:
+    """
+    Espectro 2D de una imagen calculado por bloques sobre un archivo.
+
+    Se calcula de forma perezosa como `ImageSpectrum`. Si no se da `path`, el
+    espectro va a un archivo temporal que se borra con `close()`; con `path`
+    el archivo `.npy` se conserva. Al serializar el objeto (p. ej. para
+    enviarlo al pool de gráficas) no se copia el espectro: se envía la vista
+    previa ya calculada y, si hace falta, el espectro se recalcula.
+
+    Parameters:
+    -----------
+    img_gray : numpy.ndarray
+        Imagen en escala de grises (puede ser un memmap)
+    path : str, optional
+        Archivo `.npy` donde guardar el espectro
+    max_memory : int
+        Memoria máxima para los bloques en bytes
+    preview_size : int
+        Lado máximo de la vista previa de `log_magnitude`
+    """
+
+    def __init__(self, img_gray, path=None, max_memory=DEFAULT_MAX_MEMORY, preview_size=1024):
+        self.img_gray = img_gray
+        self.shape = img_gray.shape
+        self.path = path
+        self.max_memory = max_memory
+        self.preview_size = preview_size
+
+        self._half = None
+        self._temp_path = None
+        self._preview = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_half'] = None
+        state['_temp_path'] = None
+        return state
+
+    @property
+    def half_spectrum(self):
+        """Transformada `rfft2` de la imagen como memmap (alto × (ancho//2 + 1))"""
+        if self._half is None:
+            path = self.path
+            if path is None:
+                fd, path = tempfile.mkstemp(suffix='.npy')
+                os.close(fd)
+                self._temp_path = path
+            self._half = rfft2_memmap(self.img_gray, path, self.max_memory)
+        return self._half
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Libera el memmap y borra el archivo temporal (si lo hay). No calcula
+        nada: si se necesita la vista previa (`log_magnitude`), hay que
+        pedirla antes de cerrar.
+        """
+        self._half = None
+        if self._temp_path is not None:
+            os.remove(self._temp_path)
+            self._temp_path = None
+
+    def _row_blocks(self):
+        """Recorre el espectro en bloques de filas: (fila inicial, |bloque|)"""
+        half = self.half_spectrum
+        rows = _block_length(half.shape[0], half.shape[1] * half.itemsize, self.max_memory)
+        for r0 in range(0, half.shape[0], rows):
+            yield r0, np.abs(half[r0:r0 + rows])
+
+    def dominant_peak(self, mask_size=20):
+        """
+        Posición del pico dominante del espectro centrado, excluyendo un
+        cuadrado de lado 2·mask_size alrededor de DC; da el mismo resultado
+        que `ImageSpectrum.dominant_peak`.
+
+        Se busca por bloques en la mitad `rfft2` del espectro. Cada bin de la
+        mitad representa dos posiciones del espectro centrado con la misma
+        magnitud (él y su conjugado reflejado); es candidato si alguna de las
+        dos queda fuera de la máscara, y representa la primera de ellas en el
+        orden del espectro centrado, que es la que elige `np.argmax` en
+        `ImageSpectrum`.
+
+        Returns:
+        --------
+        dy, dx : int
+            Desplazamiento del pico respecto al centro (en bins)
+        """
+        h, w = self.shape
+        cy, cx = h // 2, w // 2
+        n_half = self.half_spectrum.shape[1]
+
+        # La máscara de `spectral.center_mask` es el producto de una franja de
+        # filas y una de columnas (mismo rebanado, también en imágenes pequeñas)
+        masked_rows = np.zeros(h, dtype=bool)
+        masked_rows[cy - mask_size:cy + mask_size] = True
+        masked_cols = np.zeros(w, dtype=bool)
+        masked_cols[cx - mask_size:cx + mask_size] = True
+
+        # Posiciones centradas (columna) del bin y de su conjugado; las
+        # columnas kx = 0 y kx = W/2 contienen ya a sus conjugados, que
+        # `ImageSpectrum` toma de la mitad y no del espejo
+        kx = np.arange(n_half)
+        x_direct = (kx + cx) % w
+        x_conj = (-kx + cx) % w
+        mirrored = (kx >= 1) & (kx <= w - n_half)
+
+        no_candidate = h * w
+        best_value, best_position = -1.0, no_candidate
+
+        for r0, magnitude in self._row_blocks():
+            ky = np.arange(r0, r0 + magnitude.shape[0])
+            y_direct = ((ky + cy) % h)[:, np.newaxis]
+            y_conj = ((-ky + cy) % h)[:, np.newaxis]
+
+            # Índice plano en el espectro centrado de cada posición permitida
+            direct = np.where(masked_rows[y_direct] & masked_cols[x_direct],
+                              no_candidate, y_direct * w + x_direct)
+            conj = np.where(masked_rows[y_conj] & masked_cols[x_conj] | ~mirrored,
+                            no_candidate, y_conj * w + x_conj)
+            position = np.minimum(direct, conj)
+
+            values = np.where(position < no_candidate, magnitude, -1.0)
+            block_best = values.max()
+            if block_best < best_value:
+                continue
+            block_position = int(position[values == block_best].min())
+            if block_best > best_value or block_position < best_position:
+                best_value, best_position = block_best, block_position
+
+        y, x = divmod(best_position, w) if best_position < no_candidate else (0, 0)
+        return int(y - cy), int(x - cx)
+
+    def fringe_angle(self, mask_size=20):
+        """Ángulo (grados) de la variación de las franjas (ver `ImageSpectrum`)"""
+        dy, dx = self.dominant_peak(mask_size)
+        h, w = self.shape
+        return float(np.degrees(np.arctan2(dy / h, dx / w)))
+
+    def log_magnitude(self):
+        """
+        Vista previa submuestreada del espectro centrado en escala
+        logarítmica, log(|F| + 1), de lado como máximo `preview_size`.
+        """
+        if self._preview is None:
+            h, w = self.shape
+            half = self.half_spectrum
+            n_half = half.shape[1]
+            step = max(1, int(np.ceil(max(h, w) / self.preview_size)))
+
+            # Índices sin centrar de las posiciones submuestreadas del espectro centrado
+            ky = (np.arange(0, h, step) - h // 2) % h
+            kx = (np.arange(0, w, step) - w // 2) % w
+
+            preview = np.empty((len(ky), len(kx)))
+            direct = kx < n_half
+            preview[:, direct] = np.abs(half[ky[:, np.newaxis], kx[direct]])
+            # |F[ky, kx]| = |F[-ky, -kx]| para imágenes reales
+            preview[:, ~direct] = np.abs(half[((-ky) % h)[:, np.newaxis], w - kx[~direct]])
+
+            self._preview = np.log(preview + 1)
+        return self._preview
@@ -0,0 +1,301 @@
+"""
+Generación rápida de las figuras del análisis, separada del análisis.
+
+Crear una figura 2×2 nueva por imagen, con `imshow` de la imagen completa y
+del espectro 2D a resolución completa, suele costar más que el análisis. Aquí:
+
+- `prepare_plot_data` reduce la imagen y el espectro a la resolución de la
+  figura (por bloques, sin interpolar) antes de graficar. Los datos quedan
+  pequeños, así que se pueden enviar entre procesos o acumular en una cola.
+- `AnalysisFigure` construye la figura y sus artistas una sola vez por
+  proceso; cada imagen nueva solo actualiza los datos con `set_data`.
+- `RenderQueue` acumula las figuras para generarlas al final (o en un pool
+  de procesos), de modo que el bucle de análisis no espera a matplotlib. Los
+  datos pendientes se guardan en `.npz` y no en memoria: con cientos de
+  imágenes grandes ocuparían varios GB.
+"""
+
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from . import spectral
+from .image_processing import ImageSpectrum
+
+
+# Lado máximo (píxeles) de las imágenes mostradas: cada panel ocupa menos de
+# 1000 píxeles en una figura de 14×10 pulgadas a 150 dpi
+DISPLAY_SIZE = 1024
+
+FIGURE_SIZE = (14, 10)
+FIGURE_DPI = 150
+
+# Compresión PNG rápida: la compresión por defecto (6) tarda más que dibujar
+# la figura y solo reduce un poco el tamaño del archivo
+PNG_COMPRESS_LEVEL = 1
+
+
+def downsample(image, max_size=DISPLAY_SIZE, reduce=np.mean):
+    """
+    Reduce una imagen por bloques enteros hasta que su lado mayor no supere
+    `max_size` (se descartan las filas y columnas sobrantes del borde).
+
+    Parameters:
+    -----------
+    image : numpy.ndarray
+        Imagen 2D
+    max_size : int
+        Lado máximo de la imagen reducida
+    reduce : callable
+        Reducción de cada bloque (np.mean para la imagen; np.max conserva
+        los picos angostos del espectro)
+
+    Returns:
+    --------
+    reduced : numpy.ndarray
+        Imagen reducida (float32), o la original si ya es pequeña
+    """
+    h, w = image.shape
+    step = int(np.ceil(max(h, w) / max_size))
+    if step <= 1:
+        return image
+
+    hh, ww = h // step * step, w // step * step
+    blocks = image[:hh, :ww].reshape(hh // step, step, ww // step, step)
+    return reduce(blocks, axis=(1, 3)).astype(np.float32)
+
+
+def prepare_plot_data(img_gray, line_profile, power_spectrum, dominant_freq, spectrum=None,
+                      max_size=DISPLAY_SIZE):
+    """
+    Datos de la figura del análisis, con las imágenes ya reducidas.
+
+    Parameters:
+    -----------
+    img_gray : numpy.ndarray
+        Imagen en escala de grises
+    line_profile : numpy.ndarray
+        Perfil de intensidad
+    power_spectrum : numpy.ndarray
+        Espectro de potencia del perfil (frecuencias positivas)
+    dominant_freq : float
+        Frecuencia dominante (ciclos/píxel)
+    spectrum : ImageSpectrum or OutOfCoreSpectrum, optional
+        Espectro 2D ya calculado (si no se da, se calcula)
+    max_size : int
+        Lado máximo de las imágenes mostradas
+
+    Returns:
+    --------
+    plot_data : dict
+        'image', 'image_shape', 'profile', 'freqs', 'power_spectrum',
+        'dominant_freq', 'spectrum_image' y 'spectrum_shape'
+    """
+    if spectrum is None:
+        spectrum = ImageSpectrum(img_gray)
+    log_magnitude = spectrum.log_magnitude()
+
+    return {
+        'image': downsample(img_gray, max_size),
+        'image_shape': img_gray.shape,
+        'profile': np.asarray(line_profile),
+        'freqs': spectral.positive_freqs(len(line_profile)),
+        'power_spectrum': np.asarray(power_spectrum),
+        'dominant_freq': dominant_freq,
+        'spectrum_image': downsample(log_magnitude, max_size, reduce=np.max),
+        'spectrum_shape': log_magnitude.shape,
+    }
+
+
+def _pixel_extent(shape):
+    """Extensión de `imshow` en píxeles de la imagen original"""
+    h, w = shape
+    return (-0.5, w - 0.5, h - 0.5, -0.5)
+
+
+class AnalysisFigure:
+    """
+    Figura 2×2 del análisis (imagen, perfil, espectro del perfil y espectro
+    2D) que se construye una vez y se reutiliza para todas las imágenes.
+
+    No usa pyplot: la figura tiene su propio lienzo Agg, así que no se abren
+    ventanas ni se acumulan figuras en el estado global de matplotlib.
+    """
+
+    def __init__(self, figsize=FIGURE_SIZE, dpi=FIGURE_DPI):
+        self.dpi = dpi
+        self.fig = Figure(figsize=figsize, layout='constrained')
+        FigureCanvasAgg(self.fig)
+        axes = self.fig.subplots(2, 2)
+        self.ax_image, self.ax_profile = axes[0]
+        self.ax_power, self.ax_spectrum = axes[1]
+
+        empty = np.zeros((1, 1))
+        self.image = self.ax_image.imshow(empty, cmap='gray')
+        self.ax_image.set_title('Patrón de Interferencia Original')
+        self.ax_image.axis('off')
+
+        self.profile_line, = self.ax_profile.plot([], [], 'r-', linewidth=1.5)
+        self.ax_profile.set_title('Perfil de Intensidad')
+        self.ax_profile.set_xlabel('Posición (píxeles)')
+        self.ax_profile.set_ylabel('Intensidad')
+        self.ax_profile.grid(True, alpha=0.3)
+
+        self.power_line, = self.ax_power.plot([], [], 'b-')
+        self.dominant_line = self.ax_power.axvline(0, color='r', linestyle='--')
+        self.ax_power.set_title('Espectro de Potencia (FFT)')
+        self.ax_power.set_xlabel('Frecuencia espacial (ciclos/píxel)')
+        self.ax_power.set_ylabel('Potencia')
+        self.ax_power.grid(True, alpha=0.3)
+
+        self.spectrum = self.ax_spectrum.imshow(empty, cmap='hot')
+        self.ax_spectrum.set_title('Espectro de Fourier 2D')
+        self.ax_spectrum.axis('off')
+
+    @staticmethod
+    def _update_image(artist, data, shape):
+        """Nuevos datos, extensión y escala de color de un `imshow`"""
+        artist.set_data(data)
+        artist.set_extent(_pixel_extent(shape))
+        artist.set_clim(float(np.min(data)), float(np.max(data)))
+
+    @staticmethod
+    def _update_line(ax, line, x, y):
+        """Nuevos datos de una curva y reajuste de los ejes"""
+        line.set_data(x, y)
+        ax.relim()
+        ax.autoscale_view()
+
+    def render(self, plot_data, output_path):
+        """
+        Actualiza los artistas con los datos de una imagen y guarda la figura.
+
+        Parameters:
+        -----------
+        plot_data : dict
+            Resultado de `prepare_plot_data`
+        output_path : str or pathlib.Path
+            Archivo PNG de salida
+        """
+        self._update_image(self.image, plot_data['image'], plot_data['image_shape'])
+        self._update_image(self.spectrum, plot_data['spectrum_image'],
+                           plot_data['spectrum_shape'])
+
+        profile = plot_data['profile']
+        self._update_line(self.ax_profile, self.profile_line, np.arange(len(profile)), profile)
+        self._update_line(self.ax_power, self.power_line, plot_data['freqs'],
+                          plot_data['power_spectrum'])
+        self.ax_power.set_xlim(0, 0.5)
+
+        dominant_freq = plot_data['dominant_freq']
+        self.dominant_line.set_xdata([dominant_freq, dominant_freq])
+        self.dominant_line.set_label(f'Freq. dominante: {dominant_freq:.4f}')
+        self.ax_power.legend()
+
+        self.fig.savefig(output_path, dpi=self.dpi,
+                         pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
+
+
+# Figura reutilizada por cada proceso (se crea en el primer uso)
+_figure = None
+
+
+def render_analysis(plot_data, output_path):
+    """Guarda la figura del análisis con la figura reutilizable del proceso"""
+    global _figure
+    if _figure is None:
+        _figure = AnalysisFigure()
+    _figure.render(plot_data, output_path)
+    return output_path
+
+
+def save_plot_data(plot_data, path):
+    """Guarda los datos de una figura en un `.npz` (sin comprimir)"""
+    np.savez(path, **plot_data)
+
+
+def load_plot_data(path):
+    """Lee los datos de una figura guardados con `save_plot_data`"""
+    with np.load(path) as data:
+        plot_data = {key: data[key] for key in data.files}
+    plot_data['image_shape'] = tuple(plot_data['image_shape'])
+    plot_data['spectrum_shape'] = tuple(plot_data['spectrum_shape'])
+    plot_data['dominant_freq'] = float(plot_data['dominant_freq'])
+    return plot_data
+
+
+def _render_safely(data_path, output_path):
+    """
+    Genera la figura guardada en `data_path` y borra el `.npz`; devuelve el
+    error en lugar de lanzarlo
+    """
+    try:
+        render_analysis(load_plot_data(data_path), output_path)
+        Path(data_path).unlink()
+        return None
+    except Exception as e:
+        return str(e)
+
+
+class RenderQueue:
+    """
+    Cola de figuras pendientes que se generan todas juntas con `flush`.
+
+    Los datos de cada figura se guardan en un `.npz` al encolarla, así que la
+    memoria usada no crece con la cola.
+
+    Parameters:
+    -----------
+    jobs : int
+        Procesos para generar las figuras (1 = en el proceso actual). Cada
+        proceso reutiliza su propia figura.
+    spill_dir : str or pathlib.Path, optional
+        Directorio de los `.npz` pendientes (por defecto, uno temporal). Se
+        borra al vaciar la cola si no quedan figuras con error.
+    """
+
+    def __init__(self, jobs=1, spill_dir=None):
+        self.jobs = jobs
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.pending = []
+
+    def __len__(self):
+        return len(self.pending)
+
+    def submit(self, plot_data, output_path):
+        """Agrega una figura a la cola (sus datos se guardan en disco)"""
+        if self.spill_dir is None:
+            self.spill_dir = Path(tempfile.mkdtemp(prefix='plot_queue_'))
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        data_path = self.spill_dir / f"{Path(output_path).stem}_{len(self.pending)}.npz"
+        save_plot_data(plot_data, data_path)
+        self.pending.append((data_path, output_path))
+
+    def flush(self):
+        """
+        Genera todas las figuras pendientes y vacía la cola.
+
+        Returns:
+        --------
+        rendered : list of tuple
+            (ruta, error) por figura, en orden; error es None si se guardó
+        """
+        pending, self.pending = self.pending, []
+        if not pending:
+            return []
+
+        if self.jobs <= 1:
+            errors = [_render_safely(*job) for job in pending]
+        else:
+            chunksize = max(1, len(pending) // (4 * self.jobs))
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                errors = list(pool.map(_render_safely, *zip(*pending), chunksize=chunksize))
+
+        if all(error is None for error in errors):
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+        return [(path, error) for (_, path), error in zip(pending, errors)]
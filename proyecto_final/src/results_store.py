@@ -0,0 +1,193 @@
+"""
+Almacén incremental de resultados del análisis de interferencia.
+
+Cada imagen analizada agrega una fila a un CSV (`resultados.csv`) en cuanto
+termina su análisis: el hash del contenido de la imagen, la clave de los
+parámetros del análisis, todas las salidas de los estimadores y el tiempo de
+cada etapa. Si la ejecución se interrumpe, lo ya analizado queda guardado;
+al volver a ejecutar se omiten las imágenes cuyo hash ya tiene resultado con
+los mismos parámetros (y, si se pide, cuya figura ya existe), y el resumen
+se recalcula desde el almacén.
+
+Si la misma imagen aparece varias veces con los mismos parámetros (p. ej.
+con `--rerun`), vale la última fila. Las imágenes con error no cuentan como
+analizadas y se vuelven a intentar.
+"""
+
+import csv
+import datetime
+import hashlib
+import json
+from pathlib import Path
+
+from .image_processing import file_digest
+
+
+# Cambiar al modificar el análisis (invalida los resultados guardados)
+STORE_VERSION = 1
+
+STORE_NAME = 'resultados.csv'
+
+# Métricas numéricas de cada imagen (claves de `outcome['result']`)
+RESULT_FIELDS = ('fringe_spacing_pixels', 'dominant_freq', 'wavelength_nm',
+                 'speed_of_light', 'error_percentage', 'spacing_fft',
+                 'spacing_autocorrelation', 'spacing_zero_crossing')
+
+# Etapas cronometradas (claves de `outcome['timings']`, en segundos)
+TIMING_FIELDS = ('load', 'profile', 'fft', 'plot_data', 'total')
+
+COLUMNS = (('image', 'file_hash', 'parameters_key', 'status', 'error')
+           + RESULT_FIELDS
+           + tuple(f'time_{stage}' for stage in TIMING_FIELDS)
+           + ('timestamp',))
+
+# Estados que cuentan como imagen ya analizada
+DONE_STATUSES = ('ok', 'no_fringes')
+
+
+def parameters_key(parameters):
+    """Clave corta de los parámetros del análisis (y de la versión del almacén)"""
+    payload = json.dumps([STORE_VERSION, parameters], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _format(value):
+    """Valor de una celda: vacío para None, `repr` exacto para los números"""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    return repr(float(value))
+
+
+class ResultsStore:
+    """
+    Resultados por imagen en un CSV que se escribe fila a fila.
+
+    Parameters:
+    -----------
+    path : str or pathlib.Path
+        Archivo CSV del almacén (se crea si no existe)
+    parameters : dict
+        Parámetros de los que dependen los resultados; solo se reutilizan
+        las filas guardadas con los mismos parámetros
+    """
+
+    def __init__(self, path, parameters):
+        self.path = Path(path)
+        self.parameters_key = parameters_key(parameters)
+        self.rows = {}
+        self._hashes = {}
+
+        if self.path.exists() and self.path.stat().st_size > 0:
+            self._read()
+            self._terminate_last_line()
+
+    def _read(self):
+        """Carga las filas guardadas con los parámetros actuales"""
+        with open(self.path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            if tuple(reader.fieldnames or ()) != COLUMNS:
+                raise ValueError(f"El almacén '{self.path}' tiene otras columnas; "
+                                 f"use otro archivo")
+            for row in reader:
+                # Una fila incompleta (ejecución interrumpida a mitad de escritura)
+                if None in row or None in row.values():
+                    continue
+                if row['parameters_key'] == self.parameters_key:
+                    self.rows[row['file_hash']] = row
+
+    def _terminate_last_line(self):
+        """Cierra una última línea cortada para que la siguiente fila no se pegue"""
+        with open(self.path, 'rb+') as f:
+            f.seek(-1, 2)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+
+    def file_hash(self, img_path):
+        """Hash del contenido de la imagen (calculado una vez por ruta)"""
+        key = str(img_path)
+        if key not in self._hashes:
+            self._hashes[key] = file_digest(img_path)
+        return self._hashes[key]
+
+    def is_done(self, img_path, output=None):
+        """
+        True si la imagen ya tiene resultado con los parámetros actuales.
+
+        Parameters:
+        -----------
+        img_path : pathlib.Path
+            Ruta a la imagen
+        output : callable, optional
+            Función img_path -> ruta de un archivo que también debe existir
+            para las imágenes con estado 'ok' (p. ej. su figura); si falta,
+            la imagen se vuelve a analizar
+        """
+        row = self.rows.get(self.file_hash(img_path))
+        if row is None or row['status'] not in DONE_STATUSES:
+            return False
+        return row['status'] != 'ok' or output is None or Path(output(img_path)).exists()
+
+    def pending(self, image_files, output=None):
+        """Imágenes que faltan por analizar, en el mismo orden (ver `is_done`)"""
+        return [img_path for img_path in image_files if not self.is_done(img_path, output)]
+
+    def append(self, img_path, outcome):
+        """
+        Agrega (y escribe de inmediato) la fila de una imagen analizada.
+
+        Parameters:
+        -----------
+        img_path : pathlib.Path
+            Ruta a la imagen
+        outcome : dict
+            Resultado de `analyze_image`
+        """
+        result = outcome.get('result', {})
+        timings = outcome.get('timings', {})
+        row = {
+            'image': Path(img_path).name,
+            'file_hash': self.file_hash(img_path),
+            'parameters_key': self.parameters_key,
+            'status': outcome['status'],
+            'error': outcome.get('error', ''),
+            **{field: _format(result.get(field)) for field in RESULT_FIELDS},
+            **{f'time_{stage}': _format(timings.get(stage)) for stage in TIMING_FIELDS},
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        }
+
+        new_file = not self.path.exists() or self.path.stat().st_size == 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, COLUMNS)
+            if new_file:
+                writer.writeheader()
+            writer.writerow(row)
+
+        self.rows[row['file_hash']] = row
+
+    def results(self, image_files):
+        """
+        Resultados guardados de las imágenes con estado 'ok'.
+
+        Parameters:
+        -----------
+        image_files : list of pathlib.Path
+            Imágenes a incluir (el nombre se toma de la ruta actual)
+
+        Returns:
+        --------
+        results : list of dict
+            'image' y las métricas de `RESULT_FIELDS`, en el orden de
+            `image_files`
+        """
+        results = []
+        for img_path in image_files:
+            row = self.rows.get(self.file_hash(img_path))
+            if row is None or row['status'] != 'ok':
+                continue
+            results.append({'image': Path(img_path).name,
+                            **{field: float(row[field]) if row[field] else float('nan')
+                               for field in RESULT_FIELDS}})
+        return results
@@ -0,0 +1,236 @@
+"""
+Motor espectral común para el análisis de patrones de interferencia.
+
+Centraliza las llamadas a FFT del proyecto para que todas usen el mismo
+backend y reutilicen la preparación que se repite entre imágenes del mismo
+tamaño:
+
+- Backend seleccionable: `scipy.fft` (con `workers` para FFT multihilo) o
+  `numpy.fft`. Ambos guardan internamente los planes de pocketfft por tamaño.
+- Ventanas de Hann, mallas de frecuencias y máscaras se guardan en cachés LRU
+  por tamaño. Los arreglos devueltos son de solo lectura porque se comparten
+  entre llamadas.
+- `next_fast_len` para rellenar con ceros hasta una longitud rápida.
+- Precisión seleccionable: doble (float64/complex128, por defecto) o simple
+  (float32/complex64), que reduce a la mitad la memoria y acelera las FFT.
+  `as_real` convierte los datos al tipo real de la precisión actual.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from scipy import fft as scipy_fft
+from scipy import signal
+
+
+# Número de tamaños distintos que se guardan en cada caché
+CACHE_SIZE = 32
+
+_backend = {'name': 'scipy', 'workers': -1, 'precision': 'double'}
+
+# Tipo real de cada precisión (el complejo es el correspondiente)
+_REAL_DTYPES = {'double': np.float64, 'single': np.float32}
+
+
+def set_backend(name='scipy', workers=-1, precision=None):
+    """
+    Selecciona el backend de FFT.
+
+    Parameters:
+    -----------
+    name : str
+        'scipy' (recomendado, permite FFT multihilo) o 'numpy'
+    workers : int or None
+        Hilos para `scipy.fft` (-1 = todos los núcleos); se ignora con numpy
+    precision : str, optional
+        'double' o 'single' (ver `set_precision`); None no la cambia
+    """
+    if name not in ('scipy', 'numpy'):
+        raise ValueError(f"Backend de FFT desconocido: {name}")
+
+    _backend['name'] = name
+    _backend['workers'] = workers
+    if precision is not None:
+        set_precision(precision)
+
+
+def set_precision(precision='double'):
+    """
+    Selecciona la precisión de los datos y de las FFT.
+
+    Con 'single' los perfiles, ventanas y espectros se mantienen en
+    float32/complex64 de principio a fin (`scipy.fft` conserva la precisión
+    simple; `numpy.fft` siempre calcula en doble).
+
+    Parameters:
+    -----------
+    precision : str
+        'double' (float64/complex128) o 'single' (float32/complex64)
+    """
+    if precision not in _REAL_DTYPES:
+        raise ValueError(f"Precisión desconocida: {precision}")
+    _backend['precision'] = precision
+
+
+def real_dtype():
+    """Tipo real de la precisión actual (np.float64 o np.float32)"""
+    return _REAL_DTYPES[_backend['precision']]
+
+
+def complex_dtype():
+    """Tipo complejo de la precisión actual (np.complex128 o np.complex64)"""
+    return np.result_type(real_dtype(), np.complex64).type
+
+
+def as_real(x):
+    """Convierte `x` al tipo real de la precisión actual (sin copiar si ya lo es)"""
+    return np.asarray(x, dtype=real_dtype())
+
+
+def get_backend():
+    """Devuelve el backend actual como diccionario {'name', 'workers', 'precision'}"""
+    return dict(_backend)
+
+
+def _call(func_name, x, **kwargs):
+    """Llama a la transformada `func_name` del backend actual"""
+    if _backend['name'] == 'scipy':
+        return getattr(scipy_fft, func_name)(x, workers=_backend['workers'], **kwargs)
+    return getattr(np.fft, func_name)(x, **kwargs)
+
+
+def fft(x, n=None, axis=-1):
+    """FFT compleja 1D con el backend actual"""
+    return _call('fft', x, n=n, axis=axis)
+
+
+def ifft(x, n=None, axis=-1):
+    """FFT inversa 1D con el backend actual"""
+    return _call('ifft', x, n=n, axis=axis)
+
+
+def rfft(x, n=None, axis=-1):
+    """FFT real 1D (solo frecuencias no negativas) con el backend actual"""
+    return _call('rfft', x, n=n, axis=axis)
+
+
+def irfft(x, n=None, axis=-1):
+    """FFT real inversa 1D con el backend actual"""
+    return _call('irfft', x, n=n, axis=axis)
+
+
+def fft2(x, s=None, axes=(-2, -1)):
+    """FFT compleja 2D con el backend actual"""
+    return _call('fft2', x, s=s, axes=axes)
+
+
+def ifft2(x, s=None, axes=(-2, -1)):
+    """FFT inversa 2D con el backend actual"""
+    return _call('ifft2', x, s=s, axes=axes)
+
+
+def rfft2(x, s=None, axes=(-2, -1)):
+    """FFT real 2D (mitad no negativa del último eje) con el backend actual"""
+    return _call('rfft2', x, s=s, axes=axes)
+
+
+def irfft2(x, s=None, axes=(-2, -1)):
+    """FFT real inversa 2D con el backend actual"""
+    return _call('irfft2', x, s=s, axes=axes)
+
+
+def next_fast_len(n, real=True):
+    """
+    Menor longitud >= n que la FFT calcula eficientemente (factores 2, 3, 5...).
+
+    Parameters:
+    -----------
+    n : int
+        Longitud mínima
+    real : bool
+        True si la transformada es real (rfft)
+
+    Returns:
+    --------
+    fast_n : int
+        Longitud rápida para rellenar con ceros
+    """
+    return scipy_fft.next_fast_len(int(n), real=real)
+
+
+def _read_only(array):
+    """Marca un arreglo cacheado como de solo lectura"""
+    array.setflags(write=False)
+    return array
+
+
+def hann_window(n):
+    """Ventana de Hann de longitud n en la precisión actual (cacheada)"""
+    return _hann_window(n, real_dtype())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _hann_window(n, dtype):
+    """Ventana de Hann de longitud n y tipo `dtype` (cacheada)"""
+    return _read_only(signal.windows.hann(n).astype(dtype, copy=False))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fftfreq(n, d=1.0):
+    """Malla de frecuencias de `fft` de longitud n (cacheada)"""
+    return _read_only(np.fft.fftfreq(n, d=d))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def rfftfreq(n, d=1.0):
+    """Malla de frecuencias de `rfft` de longitud n (cacheada)"""
+    return _read_only(np.fft.rfftfreq(n, d=d))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def positive_freqs(n):
+    """
+    Frecuencias positivas usadas en el análisis de franjas: las primeras n//2
+    de `fftfreq(n)` (cacheadas).
+    """
+    return _read_only(np.fft.rfftfreq(n)[:n // 2])
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def band_mask(n, min_freq, max_freq):
+    """
+    Máscara booleana de las frecuencias positivas dentro de (min_freq, max_freq)
+    para perfiles de longitud n (cacheada).
+    """
+    freqs = positive_freqs(n)
+    return _read_only((freqs > min_freq) & (freqs < max_freq))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def center_mask(shape, half_size):
+    """
+    Máscara booleana 2D que excluye un cuadrado de lado 2·half_size alrededor
+    del centro de un espectro desplazado con fftshift (cacheada).
+    """
+    center_y, center_x = np.array(shape) // 2
+    mask = np.ones(shape, dtype=bool)
+    mask[center_y-half_size:center_y+half_size, center_x-half_size:center_x+half_size] = False
+    return _read_only(mask)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def rfft2_radial_freq(shape):
+    """
+    Frecuencia radial |f| (ciclos/píxel) de cada coeficiente de `rfft2` para
+    una imagen de forma `shape` (cacheada).
+    """
+    fy = np.fft.fftfreq(shape[0])[:, np.newaxis]
+    fx = np.fft.rfftfreq(shape[1])[np.newaxis, :]
+    return _read_only(np.sqrt(fy ** 2 + fx ** 2))
+
+
+def clear_caches():
+    """Vacía todas las cachés de ventanas, mallas y máscaras"""
+    for cached in (_hann_window, fftfreq, rfftfreq, positive_freqs, band_mask, center_mask,
+                   rfft2_radial_freq):
+        cached.cache_clear()
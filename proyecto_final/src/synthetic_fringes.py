@@ -0,0 +1,76 @@
+"""
+Generador de patrones de franjas sintéticos del Interferómetro de Michelson.
+
+Produce imágenes con parámetros conocidos (espaciado, inclinación, curvatura
+de anillos, visibilidad y ruido) para medir la exactitud y la velocidad del
+análisis contra un valor verdadero.
+"""
+
+import numpy as np
+
+
+# Tamaños de imagen (alto, ancho) en relación 4:3, por megapíxeles
+IMAGE_SIZES_MP = {
+    0.3: (480, 640),
+    1: (864, 1152),
+    3: (1500, 2000),
+    6: (2121, 2828),
+    12: (3000, 4000),
+    24: (4243, 5657),
+}
+
+
+def generate_fringe_pattern(shape, spacing, tilt=0.0, curvature=0.0, visibility=0.8,
+                            mean_intensity=127.0, noise_std=0.0, phase=0.0, seed=None):
+    """
+    Genera un patrón de franjas sintético (vectorizado, sin bucles).
+
+    I(x, y) = I₀[1 + V·cos(2π·s/d + κ·r² + φ)] + ruido,
+    con s = x·cosθ + y·sinθ y r la distancia al centro de la imagen.
+
+    Parameters:
+    -----------
+    shape : tuple of int
+        Forma (alto, ancho) de la imagen
+    spacing : float
+        Espaciado verdadero entre franjas en píxeles (d)
+    tilt : float
+        Dirección de variación de las franjas en grados (θ); 0 = franjas
+        verticales que varían a lo largo de x
+    curvature : float
+        Curvatura de anillos κ en rad/píxel² (0 = franjas rectas)
+    visibility : float
+        Visibilidad V de las franjas (0-1)
+    mean_intensity : float
+        Intensidad media I₀
+    noise_std : float
+        Desviación estándar del ruido gaussiano aditivo
+    phase : float
+        Fase inicial φ en radianes
+    seed : int, optional
+        Semilla del generador de ruido
+
+    Returns:
+    --------
+    img_gray : numpy.ndarray
+        Imagen uint8 con el patrón de franjas
+    """
+    h, w = shape
+    theta = np.radians(tilt)
+
+    # Coordenadas como vectores que se combinan por broadcasting
+    y = np.arange(h, dtype=np.float32)[:, np.newaxis]
+    x = np.arange(w, dtype=np.float32)[np.newaxis, :]
+
+    arg = (2 * np.pi / spacing) * (x * np.float32(np.cos(theta)) + y * np.float32(np.sin(theta)))
+    arg = arg + np.float32(phase)
+    if curvature:
+        arg = arg + np.float32(curvature) * ((x - w / 2) ** 2 + (y - h / 2) ** 2)
+
+    img = mean_intensity * (1 + visibility * np.cos(arg))
+
+    if noise_std > 0:
+        rng = np.random.default_rng(seed)
+        img += rng.standard_normal((h, w), dtype=np.float32) * np.float32(noise_std)
+
+    return np.clip(np.rint(img), 0, 255).astype(np.uint8)
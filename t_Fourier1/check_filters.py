@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Verificación de las máscaras de `fourier_optics.filters`.
+
+Comprueba que las rendijas a múltiplos de 90° son exactamente las de 0° y
+180° transpuestas (sin bordes corridos por el redondeo de cos y sin), en
+formas pares e impares. Termina con código 1 si algún caso falla.
+
+Uso:
+    python check_filters.py
+    python check_filters.py --sizes 255 256 --widths 3 10 30
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from fourier_optics.filters import slit
+
+
+def check_slit(size, width, offset=0.0):
+    """
+    Casos que fallan para un espectro size×size.
+
+    Returns:
+    --------
+    failures : list of str
+        Descripción de cada igualdad que no se cumple
+    """
+    shape = (size, size)
+    cases = {
+        '90° = 0°ᵀ': (slit(shape, width, 90, offset), slit(shape, width, 0, offset).T),
+        '270° = 180°ᵀ': (slit(shape, width, 270, offset), slit(shape, width, 180, offset).T),
+        '360° = 0°': (slit(shape, width, 360, offset), slit(shape, width, 0, offset)),
+    }
+    return [name for name, (mask, expected) in cases.items()
+            if not np.array_equal(mask, expected)]
+
+
+def main(argv=None):
+    """Función principal de la verificación"""
+    parser = argparse.ArgumentParser(description="Verificación de las rendijas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[255, 256],
+                        help="Lados de los espectros (por defecto: 255 256)")
+    parser.add_argument("--widths", type=float, nargs="+", default=[3, 10, 30, 31],
+                        help="Anchos de rendija en píxeles (por defecto: 3 10 30 31)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for size in args.sizes:
+        for width in args.widths:
+            for offset in (0.0, 7.0):
+                failures += [(size, width, offset, name)
+                             for name in check_slit(size, width, offset)]
+
+    if failures:
+        print(f"❌ {len(failures)} caso(s) fallan:")
+        for size, width, offset, name in failures:
+            print(f"   {size}×{size}, ancho {width}, desplazamiento {offset}: {name}")
+        sys.exit(1)
+
+    print("✅ Rendijas a múltiplos de 90° exactas en todos los casos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Módulo de óptica de Fourier: propagadores de Fresnel y Fraunhofer, aperturas y
+filtros espaciales en el dominio de frecuencias.
+
+Implementación importable de los propagadores del notebook
+`Implementacion_propagadores_Fesnel-Fraunhofer_20221.ipynb`
+(Voelz, D. G. (2011). Computational Fourier Optics: a MATLAB tutorial).
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,70 @@
+"""
+Funciones de apertura vectorizadas para simulaciones de óptica de Fourier.
+
+Reemplazan las versiones con bucles anidados de los notebooks: se evalúan
+sobre toda la malla con operaciones de arreglos, para cualquier forma de
+entrada (incluidas mallas no cuadradas).
+"""
+
+import numpy as np
+
+
+def rect2D(x):
+    """
+    Función rectángulo: 1 donde |x| <= 1/2 y 0 en otro caso.
+
+    Parameters:
+    -----------
+    x : numpy.ndarray
+        Coordenadas normalizadas (p. ej. X/(2w))
+
+    Returns:
+    --------
+    out : numpy.ndarray
+        Arreglo de 0 y 1 (float64) con la forma de `x`
+    """
+    return (np.abs(x) <= 0.5).astype(float)
+
+
+def circ(x, y, d):
+    """
+    Función círculo: 1 donde sqrt(x² + y²)/d <= 1 y 0 en otro caso.
+
+    Parameters:
+    -----------
+    x, y : numpy.ndarray
+        Mallas de coordenadas (p. ej. de `np.meshgrid`)
+    d : float
+        Radio del círculo
+
+    Returns:
+    --------
+    out : numpy.ndarray
+        Arreglo de 0 y 1 (float64) con la forma de `x`
+    """
+    return (np.hypot(x, y) <= d).astype(float)
+
+
+def rect_aperture(X, Y, wx, wy=None):
+    """
+    Apertura rectangular de semianchos (wx, wy) centrada en el origen.
+
+    Equivale a `rect2D(X/(2*wx)) * rect2D(Y/(2*wy))` del notebook.
+
+    Parameters:
+    -----------
+    X, Y : numpy.ndarray
+        Mallas de coordenadas
+    wx : float
+        Semiancho en x
+    wy : float, optional
+        Semiancho en y (por defecto igual a wx: apertura cuadrada)
+
+    Returns:
+    --------
+    out : numpy.ndarray
+        Transmitancia de la apertura (0 o 1)
+    """
+    if wy is None:
+        wy = wx
+    return ((np.abs(X) <= wx) & (np.abs(Y) <= wy)).astype(float)
@@ -0,0 +1,216 @@
+"""
+Banco de filtros en el dominio de frecuencias para filtrado espacial.
+
+Reemplaza `rendija` del notebook `Ejemplo_filtrado_espacial_en_2D_v2.ipynb`,
+que construye cada rendija horizontal como un arreglo N×N y luego la gira con
+`scipy.ndimage.rotate` (lento e interpola los bordes de la máscara):
+
+- Las máscaras (rendija, agujero, anillo, pasa-bajas y pasa-altas) se evalúan
+  analíticamente sobre la malla de frecuencias, a cualquier ángulo, y se
+  guardan en cachés LRU por geometría (forma y parámetros).
+- `apply_filter_bank` calcula la FFT de la imagen una sola vez y aplica todo
+  el banco con transformadas inversas por lotes.
+
+Convenciones (como en el notebook): las máscaras están centradas (el origen
+de frecuencias en la fila N//2 y la columna N//2, como tras `fftshift`) y las
+distancias se miden en píxeles del espectro. Los ángulos son en grados, en
+sentido antihorario en la imagen mostrada con `imshow`, igual que `rotate`.
+"""
+
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+from scipy import fft as scipy_fft
+
+
+# Número de máscaras distintas que se guardan en caché
+CACHE_SIZE = 64
+
+# Hilos para las FFT (-1 = todos los núcleos)
+FFT_WORKERS = -1
+
+
+def _read_only(array):
+    """Marca un arreglo cacheado como de solo lectura"""
+    array.setflags(write=False)
+    return array
+
+
+def _frequency_grid(shape):
+    """Coordenadas centradas (v, u) de filas y columnas del espectro, en píxeles"""
+    v = np.arange(shape[0], dtype=float)[:, np.newaxis] - shape[0] // 2
+    u = np.arange(shape[1], dtype=float)[np.newaxis, :] - shape[1] // 2
+    return v, u
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def slit(shape, width, angle=0.0, offset=0.0):
+    """
+    Rendija de ancho `width` que pasa a distancia `offset` del centro.
+
+    Con angle=0 es la rendija horizontal de `rendija(N, offset, 0, width)`
+    del notebook; para otros ángulos equivale a girarla, sin interpolación.
+
+    Parameters:
+    -----------
+    shape : tuple of int
+        Forma (filas, columnas) del espectro
+    width : float
+        Ancho de la rendija en píxeles
+    angle : float
+        Ángulo de la rendija en grados (antihorario)
+    offset : float
+        Desplazamiento perpendicular de la rendija respecto al centro (píxeles)
+
+    Returns:
+    --------
+    mask : numpy.ndarray
+        Máscara booleana de solo lectura
+    """
+    v, u = _frequency_grid(shape)
+    theta = np.radians(angle)
+    # Se redondean cos y sin para que los múltiplos de 90° sean exactos
+    # (cos(90°) ≈ 6e-17 correría los bordes semiabiertos un píxel en la
+    # mitad de las filas)
+    distance = v * np.round(np.cos(theta), 12) + u * np.round(np.sin(theta), 12)
+    # Intervalo semiabierto, como el rebanado del notebook
+    distance -= offset
+    return _read_only((distance >= -width / 2) & (distance < width / 2))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def pinhole(shape, radius, center=(0.0, 0.0)):
+    """
+    Agujero circular de radio `radius` centrado en `center` = (u, v) píxeles
+    respecto al origen de frecuencias (selecciona una sola frecuencia y su
+    vecindad).
+
+    Returns:
+    --------
+    mask : numpy.ndarray
+        Máscara booleana de solo lectura
+    """
+    v, u = _frequency_grid(shape)
+    return _read_only((u - center[0]) ** 2 + (v - center[1]) ** 2 <= radius ** 2)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def annulus(shape, inner_radius, outer_radius):
+    """
+    Anillo centrado: pasa las frecuencias con inner_radius <= |f| <= outer_radius.
+
+    Returns:
+    --------
+    mask : numpy.ndarray
+        Máscara booleana de solo lectura
+    """
+    v, u = _frequency_grid(shape)
+    r2 = u ** 2 + v ** 2
+    return _read_only((r2 >= inner_radius ** 2) & (r2 <= outer_radius ** 2))
+
+
+def lowpass(shape, cutoff):
+    """Pasa-bajas: agujero centrado de radio `cutoff` (cacheado)"""
+    return pinhole(shape, cutoff)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def highpass(shape, cutoff):
+    """Pasa-altas: elimina el círculo central de radio `cutoff` (cacheado)"""
+    return _read_only(~lowpass(shape, cutoff))
+
+
+def slit_bank(shape, widths, angles, offset=0.0):
+    """
+    Rendijas para todas las combinaciones de ancho y ángulo (barridos).
+
+    Parameters:
+    -----------
+    shape : tuple of int
+        Forma del espectro
+    widths : iterable of float
+        Anchos en píxeles
+    angles : iterable of float
+        Ángulos en grados
+    offset : float
+        Desplazamiento común de las rendijas
+
+    Returns:
+    --------
+    masks : list of numpy.ndarray
+        Una máscara por combinación (ancho, ángulo), ancho como índice externo
+    """
+    return [slit(tuple(shape), width, angle, offset)
+            for width, angle in product(widths, angles)]
+
+
+def centered_spectrum(image):
+    """
+    Espectro centrado de la imagen, fftshift(fft2(ifftshift(image))), como
+    `TF_IM1` del notebook (para mostrarlo junto a las máscaras).
+    """
+    shifted = np.fft.ifftshift(np.asarray(image))
+    return np.fft.fftshift(scipy_fft.fft2(shifted, workers=FFT_WORKERS))
+
+
+def apply_filter_bank(image, masks, intensity=False, chunk_size=16):
+    """
+    Filtra una imagen con todo un banco de máscaras.
+
+    La FFT directa se calcula una vez; las máscaras se aplican sobre el
+    espectro sin centrar (se desplazan con ifftshift, lo que es barato) y las
+    transformadas inversas se calculan por lotes de `chunk_size` máscaras en
+    una sola llamada. Para formas pares se omiten los desplazamientos de la
+    imagen, que se cancelan como en los propagadores.
+
+    Parameters:
+    -----------
+    image : numpy.ndarray
+        Imagen (o campo complejo) a filtrar
+    masks : sequence of numpy.ndarray
+        Máscaras centradas con la forma de la imagen
+    intensity : bool
+        Si True, se devuelve |imagen filtrada|² (float) en lugar del campo
+    chunk_size : int
+        Máscaras por lote: acota el arreglo complejo temporal de las
+        transformadas inversas (chunk_size × filas × columnas), no la salida,
+        que tiene las K imágenes filtradas
+
+    Returns:
+    --------
+    filtered : numpy.ndarray
+        Arreglo (K, filas, columnas) con una imagen filtrada por máscara
+    """
+    image = np.asarray(image)
+    even = image.shape[0] % 2 == 0 and image.shape[1] % 2 == 0
+
+    source = image if even else np.fft.ifftshift(image)
+    spectrum = scipy_fft.fft2(source, workers=FFT_WORKERS)
+
+    out_dtype = spectrum.real.dtype if intensity else spectrum.dtype
+    filtered = np.empty((len(masks),) + image.shape, dtype=out_dtype)
+
+    for start in range(0, len(masks), chunk_size):
+        chunk = masks[start:start + chunk_size]
+        batch = np.empty((len(chunk),) + image.shape, dtype=spectrum.dtype)
+        for j, mask in enumerate(chunk):
+            np.multiply(spectrum, np.fft.ifftshift(mask), out=batch[j])
+
+        fields = scipy_fft.ifft2(batch, axes=(-2, -1), overwrite_x=True, workers=FFT_WORKERS)
+        if not even:
+            fields = np.fft.fftshift(fields, axes=(-2, -1))
+
+        stop = start + len(chunk)
+        if intensity:
+            filtered[start:stop] = fields.real ** 2 + fields.imag ** 2
+        else:
+            filtered[start:stop] = fields
+
+    return filtered
+
+
+def clear_caches():
+    """Vacía las cachés de máscaras"""
+    for cached in (slit, pinhole, annulus, highpass):
+        cached.cache_clear()
@@ -0,0 +1,145 @@
+"""
+Transformadas 2D y propagación de Fresnel fuera de memoria.
+
+Para campos más grandes que la memoria RAM (p. ej. 16k×16k en complex128 son
+4 GB por copia) las FFT 2D se calculan sobre archivos `.npy` abiertos con
+`np.memmap`, en pasadas por bloques de filas y de columnas. La memoria pico
+queda acotada por `max_memory`, no por el tamaño del campo.
+"""
+
+import os
+
+import numpy as np
+from scipy import fft as scipy_fft
+
+from . import propagators
+
+
+# Memoria pico por defecto para los bloques (bytes)
+DEFAULT_MAX_MEMORY = 256 * 2 ** 20
+
+# Copias temporales por bloque (lectura, FFT y escritura)
+_BLOCK_COPIES = 3
+
+
+def _block_length(n_lines, bytes_per_line, max_memory):
+    """Número de filas (o columnas) por bloque para no superar `max_memory`"""
+    return int(np.clip(max_memory // (_BLOCK_COPIES * bytes_per_line), 1, n_lines))
+
+
+def _row_pass(src, out, func, max_memory):
+    """Aplica `func` (transformada a lo largo de las filas) por bloques de filas"""
+    n_rows, n_cols = out.shape
+    rows = _block_length(n_rows, n_cols * out.itemsize, max_memory)
+    for r0 in range(0, n_rows, rows):
+        block = np.array(src[r0:r0 + rows], dtype=out.dtype)
+        out[r0:r0 + rows] = func(block, axis=1, overwrite_x=True,
+                                 workers=propagators.FFT_WORKERS)
+
+
+def _column_pass(out, func, max_memory):
+    """Aplica `func(bloque, c0)` en su lugar por bloques de columnas"""
+    n_rows, n_cols = out.shape
+    cols = _block_length(n_cols, n_rows * out.itemsize, max_memory)
+    for c0 in range(0, n_cols, cols):
+        out[:, c0:c0 + cols] = func(np.array(out[:, c0:c0 + cols]), c0)
+
+
+def _same_file(u, path):
+    """True si `u` es un memmap del archivo `path`"""
+    filename = getattr(u, 'filename', None)
+    return filename is not None and str(filename) == os.path.abspath(path)
+
+
+def fft2_memmap(u, path, inverse=False, max_memory=DEFAULT_MAX_MEMORY, dtype=np.complex128):
+    """
+    FFT 2D (sin desplazamientos) de un arreglo escrita en un archivo `.npy`.
+
+    Primera pasada: transformada de bloques de filas de `u` (que puede ser
+    otro memmap), escritos en el archivo. Segunda pasada: transformada de
+    bloques de columnas, leídos y escritos en el mismo archivo.
+
+    Parameters:
+    -----------
+    u : numpy.ndarray
+        Arreglo 2D de entrada (puede ser un memmap)
+    path : str
+        Archivo `.npy` de salida (puede ser el mismo archivo de `u` si este
+        ya es un memmap complejo de tipo `dtype`)
+    inverse : bool
+        Si True, calcula `ifft2`
+    max_memory : int
+        Memoria máxima para los bloques en bytes
+    dtype : numpy.dtype
+        np.complex128 (por defecto) o np.complex64
+
+    Returns:
+    --------
+    U : numpy.memmap
+        Transformada, igual a `fft2(u)` (o `ifft2(u)`)
+    """
+    func = scipy_fft.ifft if inverse else scipy_fft.fft
+    out = np.lib.format.open_memmap(path, mode='r+' if _same_file(u, path) else 'w+',
+                                    dtype=dtype, shape=u.shape)
+
+    _row_pass(u, out, func, max_memory)
+    _column_pass(out, lambda block, c0: func(block, axis=0, overwrite_x=True,
+                                             workers=propagators.FFT_WORKERS), max_memory)
+    out.flush()
+    return out
+
+
+def propTF_memmap(u1, L, lam, z, path, max_memory=DEFAULT_MAX_MEMORY, dtype=np.complex128):
+    """
+    Propagador de Fresnel (función de transferencia) fuera de memoria.
+
+    Equivale a `propTF`: u2 = ifft2(H·fft2(u1)). La convolución circular es
+    invariante a traslaciones, así que el par ifftshift/fftshift del notebook
+    se cancela para cualquier N y no hace falta desplazar el archivo. H es
+    separable, H = Hy(fy)·Hx(fx), y se construye por bloques de columnas.
+    Se hacen tres pasadas: FFT de filas; FFT de columnas, producto por H e
+    IFFT de columnas en la misma lectura; IFFT de filas.
+
+    Parameters:
+    -----------
+    u1 : numpy.ndarray
+        Campo en el plano fuente (N×N, puede ser un memmap)
+    L : float
+        Lado del plano fuente y de observación (m)
+    lam : float
+        Longitud de onda (m)
+    z : float
+        Distancia de propagación (m)
+    path : str
+        Archivo `.npy` donde se escribe el campo propagado
+    max_memory : int
+        Memoria máxima para los bloques en bytes
+    dtype : numpy.dtype
+        np.complex128 (por defecto) o np.complex64
+
+    Returns:
+    --------
+    u2 : numpy.memmap
+        Campo en el plano de observación
+    """
+    n_rows, n_cols = u1.shape
+    fy = np.fft.fftfreq(n_rows, d=L / n_cols)
+    fx = np.fft.fftfreq(n_cols, d=L / n_cols)
+    Hy = np.exp(-1j * np.pi * lam * z * fy ** 2).astype(dtype)
+    Hx = np.exp(-1j * np.pi * lam * z * fx ** 2).astype(dtype)
+
+    out = np.lib.format.open_memmap(path, mode='r+' if _same_file(u1, path) else 'w+',
+                                    dtype=dtype, shape=u1.shape)
+
+    _row_pass(u1, out, scipy_fft.fft, max_memory)
+
+    def filter_columns(block, c0):
+        block = scipy_fft.fft(block, axis=0, overwrite_x=True, workers=propagators.FFT_WORKERS)
+        block *= Hy[:, np.newaxis] * Hx[np.newaxis, c0:c0 + block.shape[1]]
+        return scipy_fft.ifft(block, axis=0, overwrite_x=True, workers=propagators.FFT_WORKERS)
+
+    _column_pass(out, filter_columns, max_memory)
+    _row_pass(out, out, scipy_fft.ifft, max_memory)
+
+    out.flush()
+    return out
@@ -0,0 +1,605 @@
+"""
+Propagadores de Fresnel (función de transferencia y respuesta al impulso) y
+de Fraunhofer.
+
+Versión importable de `propTF`, `propIR` y `propFF` del notebook de
+propagadores. Diferencias respecto al notebook:
+
+- La función de transferencia H, la respuesta al impulso transformada y el
+  factor de fase de Fraunhofer se guardan en cachés LRU por (N, L, lam, z,
+  dtype): en barridos de parámetros solo se calculan una vez.
+- Las mallas se construyen con `fftfreq` y coordenadas centradas (exactas
+  para N par e impar; `np.arange` con paso flotante puede dar N±1 puntos), y
+  los desplazamientos usan el par ifftshift/fftshift, correcto también para
+  N impar (para N par coincide con el del notebook).
+- Para N par se omiten los `fftshift`/`ifftshift` de `propTF` y `propIR`: en
+  el dominio de Fourier equivalen a multiplicar por (-1)^(m+n) dos veces, que
+  se cancela. El resultado es idéntico y se ahorran dos copias del campo.
+- Precisión simple (`dtype=np.complex64`) y FFT en el mismo arreglo
+  (`overwrite=True`) con `scipy.fft`.
+- `propFF_zoom` evalúa el campo de Fraunhofer solo en una ventana del plano
+  de observación (transformada chirp-z) y devuelve sus ejes.
+- `propagate` elige entre TF e IR según el muestreo (dx frente a λz/L) y
+  rellena con ceros solo hasta la longitud rápida necesaria.
+- `propTF_sweep` propaga a muchas distancias transformando la fuente una sola
+  vez (barridos de enfoque).
+
+Convenciones (como en el notebook): u1 es el campo en el plano fuente de lado
+L, muestreado uniformemente con N×N puntos; lam es la longitud de onda y z la
+distancia de propagación, todo en metros.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from scipy import fft as scipy_fft
+from scipy import signal
+
+
+# Número de geometrías (N, L, lam, z) distintas que se guardan en cada caché
+CACHE_SIZE = 16
+
+# Hilos para las FFT de scipy (-1 = todos los núcleos)
+FFT_WORKERS = -1
+
+
+def _read_only(array):
+    """Marca un arreglo cacheado como de solo lectura"""
+    array.setflags(write=False)
+    return array
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def transfer_function(N, L, lam, z, dtype=np.complex128):
+    """
+    Función de transferencia de Fresnel H(fx, fy), en el orden de salida de
+    `fft2` (sin centrar). Cacheada por geometría.
+
+    H = exp(-iπλz(fx² + fy²))
+
+    Parameters:
+    -----------
+    N : int
+        Número de muestras por lado
+    L : float
+        Lado del plano fuente (m)
+    lam : float
+        Longitud de onda (m)
+    z : float
+        Distancia de propagación (m)
+    dtype : numpy.dtype
+        np.complex128 o np.complex64
+
+    Returns:
+    --------
+    H : numpy.ndarray
+        Arreglo N×N de solo lectura
+    """
+    fx = np.fft.fftfreq(N, d=L / N)
+    fx2 = fx ** 2
+    H = np.exp(-1j * np.pi * lam * z * (fx2[:, np.newaxis] + fx2[np.newaxis, :]))
+    return _read_only(H.astype(dtype, copy=False))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def impulse_response_transfer(N, L, lam, z, dtype=np.complex128):
+    """
+    Transformada de la respuesta al impulso de Fresnel, H = FFT{h}·dx², en el
+    orden de salida de `fft2`. Cacheada por geometría.
+
+    h = 1/(iλz)·exp(ik(x² + y²)/(2z))
+
+    Parameters:
+    -----------
+    N, L, lam, z, dtype :
+        Ver `transfer_function`
+
+    Returns:
+    --------
+    H : numpy.ndarray
+        Arreglo N×N de solo lectura
+    """
+    dx = L / N
+    k = 2 * np.pi / lam
+    x = (np.arange(N) - N // 2) * dx
+    x2 = x ** 2
+    h = 1 / (1j * lam * z) * np.exp(1j * k / (2 * z) * (x2[:, np.newaxis] + x2[np.newaxis, :]))
+    H = scipy_fft.fft2(np.fft.ifftshift(h), workers=FFT_WORKERS) * dx ** 2
+    return _read_only(H.astype(dtype, copy=False))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fraunhofer_factor(N, L1, lam, z, dtype=np.complex128):
+    """
+    Factor de fase y escala de Fraunhofer en el plano de observación,
+    c·dx1² con c = 1/(iλz)·exp(ik(x2² + y2²)/(2z)). Cacheado por geometría.
+
+    Parameters:
+    -----------
+    N : int
+        Número de muestras por lado
+    L1 : float
+        Lado del plano fuente (m)
+    lam, z, dtype :
+        Ver `transfer_function`
+
+    Returns:
+    --------
+    factor : numpy.ndarray
+        Arreglo N×N de solo lectura (centrado)
+    """
+    dx1 = L1 / N
+    k = 2 * np.pi / lam
+    dx2 = lam * z / L1
+    x2 = (np.arange(N) - N // 2) * dx2
+    r2 = x2[:, np.newaxis] ** 2 + x2[np.newaxis, :] ** 2
+    factor = 1 / (1j * lam * z) * np.exp(1j * k / (2 * z) * r2) * dx1 ** 2
+    return _read_only(factor.astype(dtype, copy=False))
+
+
+def _prepare_field(u1, dtype, overwrite):
+    """Convierte el campo al tipo complejo pedido, copiando solo si hace falta"""
+    u1 = np.asarray(u1)
+    if overwrite and u1.dtype == dtype:
+        return u1
+    return u1.astype(dtype, copy=True)
+
+
+def _propagate_with(u1, H, dtype, overwrite):
+    """u2 = fftshift(ifft2(H·fft2(ifftshift(u1)))) con el mínimo de copias"""
+    N = u1.shape[-1]
+
+    if N % 2 == 0 and u1.shape[-2] % 2 == 0:
+        # Los desplazamientos se cancelan en el dominio de Fourier para N par
+        U = scipy_fft.fft2(_prepare_field(u1, dtype, overwrite), overwrite_x=True,
+                           workers=FFT_WORKERS)
+        U *= H
+        return scipy_fft.ifft2(U, overwrite_x=True, workers=FFT_WORKERS)
+
+    U = scipy_fft.fft2(np.fft.ifftshift(np.asarray(u1, dtype=dtype)), overwrite_x=True,
+                       workers=FFT_WORKERS)
+    U *= H
+    return np.fft.fftshift(scipy_fft.ifft2(U, overwrite_x=True, workers=FFT_WORKERS))
+
+
+def propTF(u1, L, lam, z, dtype=np.complex128, overwrite=False):
+    """
+    Propagador de Fresnel basado en la función de transferencia.
+
+    Parameters:
+    -----------
+    u1 : numpy.ndarray
+        Campo en el plano fuente (N×N)
+    L : float
+        Lado del plano fuente y de observación (m)
+    lam : float
+        Longitud de onda (m)
+    z : float
+        Distancia de propagación (m)
+    dtype : numpy.dtype
+        np.complex128 (por defecto) o np.complex64 para precisión simple
+    overwrite : bool
+        Si True y `u1` ya es del tipo `dtype`, su memoria se reutiliza para
+        la FFT (u1 queda sobrescrito)
+
+    Returns:
+    --------
+    u2 : numpy.ndarray
+        Campo en el plano de observación
+    """
+    N = u1.shape[-1]
+    H = transfer_function(N, float(L), float(lam), float(z), np.dtype(dtype).type)
+    return _propagate_with(u1, H, dtype, overwrite)
+
+
+def propIR(u1, L, lam, z, dtype=np.complex128, overwrite=False):
+    """
+    Propagador de Fresnel basado en la respuesta al impulso.
+
+    Parameters:
+    -----------
+    u1, L, lam, z, dtype, overwrite :
+        Ver `propTF`
+
+    Returns:
+    --------
+    u2 : numpy.ndarray
+        Campo en el plano de observación
+    """
+    N = u1.shape[-1]
+    H = impulse_response_transfer(N, float(L), float(lam), float(z), np.dtype(dtype).type)
+    return _propagate_with(u1, H, dtype, overwrite)
+
+
+def propFF(u1, L1, lam, z, dtype=np.complex128, overwrite=False):
+    """
+    Propagador de Fraunhofer (campo lejano).
+
+    Parameters:
+    -----------
+    u1 : numpy.ndarray
+        Campo en el plano fuente (N×N)
+    L1 : float
+        Lado del plano fuente (m)
+    lam : float
+        Longitud de onda (m)
+    z : float
+        Distancia de propagación (m)
+    dtype : numpy.dtype
+        np.complex128 (por defecto) o np.complex64 para precisión simple
+    overwrite : bool
+        Permite reutilizar la memoria de `u1` (ver `propTF`)
+
+    Returns:
+    --------
+    u2 : numpy.ndarray
+        Campo en el plano de observación
+    L2 : float
+        Lado del plano de observación, L2 = λz/dx1 (m)
+    """
+    N = u1.shape[-1]
+    dx1 = L1 / N
+    L2 = lam * z / dx1
+
+    shifted = np.fft.ifftshift(_prepare_field(u1, dtype, overwrite))
+    U = scipy_fft.fft2(shifted, overwrite_x=True, workers=FFT_WORKERS)
+    u2 = np.fft.fftshift(U)
+    u2 *= fraunhofer_factor(N, float(L1), float(lam), float(z), np.dtype(dtype).type)
+
+    return u2, L2
+
+
+def _zoom_dft_axis(u, dx, freqs, axis):
+    """
+    DFT de `u` a lo largo de `axis` evaluada en las frecuencias equiespaciadas
+    `freqs` (transformada chirp-z), con el origen de coordenadas en el índice
+    n//2 como en el resto del módulo.
+    """
+    n = u.shape[axis]
+    M = len(freqs)
+    df = freqs[1] - freqs[0] if M > 1 else 1.0
+    U = signal.zoom_fft(u, [freqs[0], freqs[0] + M * df], m=M, fs=1 / dx, axis=axis)
+
+    # zoom_fft toma x = n·dx; el origen centrado agrega exp(+2πi·f·(n//2)·dx)
+    shape = [1] * U.ndim
+    shape[axis] = M
+    U *= np.exp(2j * np.pi * freqs * (n // 2) * dx).reshape(shape)
+    return U
+
+
+def propFF_zoom(u1, L1, lam, z, L2_window, M=None, center=(0.0, 0.0), dtype=np.complex128):
+    """
+    Propagador de Fraunhofer evaluado solo en una ventana del plano de
+    observación, con muestreo arbitrario.
+
+    `propFF` produce siempre la malla completa de lado L2 = λz/dx1, de la que
+    las gráficas usan una fracción pequeña. Aquí la transformada de Fourier
+    se evalúa directamente en las M×M muestras de la ventana pedida mediante
+    la transformada chirp-z (`scipy.signal.zoom_fft`) por ejes, sin rellenar
+    el plano fuente con ceros. Para L2_window = λz/dx1 y M = N coincide con
+    `propFF`.
+
+    Parameters:
+    -----------
+    u1 : numpy.ndarray
+        Campo en el plano fuente (N×N)
+    L1 : float
+        Lado del plano fuente (m)
+    lam : float
+        Longitud de onda (m)
+    z : float
+        Distancia de propagación (m)
+    L2_window : float
+        Lado de la ventana de observación (m)
+    M : int, optional
+        Número de muestras por lado de la ventana (por defecto N)
+    center : tuple of float
+        Centro (x2, y2) de la ventana en el plano de observación (m)
+    dtype : numpy.dtype
+        np.complex128 (por defecto) o np.complex64
+
+    Returns:
+    --------
+    u2 : numpy.ndarray
+        Campo en la ventana de observación (M×M)
+    x2 : numpy.ndarray
+        Coordenadas x de las columnas de u2 (m)
+    y2 : numpy.ndarray
+        Coordenadas y de las filas de u2 (m)
+    """
+    u1 = np.asarray(u1, dtype=dtype)
+    N = u1.shape[-1]
+    M = N if M is None else int(M)
+    dx1 = L1 / N
+    dx2 = L2_window / M
+    k = 2 * np.pi / lam
+
+    offsets = (np.arange(M) - M // 2) * dx2
+    x2 = center[0] + offsets
+    y2 = center[1] + offsets
+
+    U = _zoom_dft_axis(u1, dx1, x2 / (lam * z), axis=-1)
+    U = _zoom_dft_axis(U, dx1, y2 / (lam * z), axis=-2)
+
+    r2 = y2[:, np.newaxis] ** 2 + x2[np.newaxis, :] ** 2
+    U *= 1 / (1j * lam * z) * np.exp(1j * k / (2 * z) * r2) * dx1 ** 2
+
+    return U.astype(dtype, copy=False), x2, y2
+
+
+def fast_even_length(n):
+    """Menor longitud par >= n que la FFT calcula eficientemente"""
+    return 2 * scipy_fft.next_fast_len((int(n) + 1) // 2)
+
+
+def _fft_cost(M, n_ffts):
+    """Costo relativo de `n_ffts` FFT 2D de M×M puntos (∝ M² log M)"""
+    return n_ffts * M * M * np.log2(max(M, 2))
+
+
+def _pad_centered(u1, M):
+    """Rellena con ceros el campo hasta M×M manteniendo el centro en M//2"""
+    N = u1.shape[-1]
+    if M == N:
+        return u1, 0
+    before = M // 2 - N // 2
+    padded = np.zeros(u1.shape[:-2] + (M, M), dtype=np.result_type(u1.dtype, np.complex64))
+    padded[..., before:before + N, before:before + N] = u1
+    return padded, before
+
+
+def select_method(N, L, lam, z, pad=True):
+    """
+    Elige el propagador de Fresnel más barato que esté bien muestreado.
+
+    Criterio de Voelz (2011): con dx = L/N, la función de transferencia (TF)
+    está bien muestreada si dx >= λz/L y la respuesta al impulso (IR) si
+    dx <= λz/L. Rellenar con ceros hasta M puntos aumenta L = M·dx; con
+    M >= λz/dx² se alcanza el muestreo crítico y TF vuelve a ser válida. Se
+    comparan las opciones válidas (TF con la longitud rápida mínima, TF en el
+    muestreo crítico, IR sin relleno adicional) por el costo de sus FFT.
+
+    Parameters:
+    -----------
+    N : int
+        Número de muestras por lado del campo fuente
+    L : float
+        Lado del plano fuente (m)
+    lam : float
+        Longitud de onda (m)
+    z : float
+        Distancia de propagación (m)
+    pad : bool
+        Si False, no se rellena: solo se elige entre TF e IR con N puntos
+
+    Returns:
+    --------
+    method : str
+        'TF' o 'IR'
+    M : int
+        Número de muestras por lado de la malla de cálculo
+    """
+    dx = L / N
+    candidates = []
+
+    M = fast_even_length(N) if pad else N
+    if dx >= lam * z / (M * dx):
+        candidates.append((_fft_cost(M, 2), 'TF', M))
+    else:
+        candidates.append((_fft_cost(M, 3), 'IR', M))
+        if pad:
+            M_crit = fast_even_length(np.ceil(lam * z / dx ** 2))
+            candidates.append((_fft_cost(M_crit, 2), 'TF', M_crit))
+
+    _, method, M = min(candidates)
+    return method, M
+
+
+def propagate(u1, L, lam, z, method='auto', pad=True, crop=True, dtype=np.complex128):
+    """
+    Propagación de Fresnel con elección automática del método y del relleno.
+
+    Con method='auto' se usa `select_method`: se rellena con ceros solo hasta
+    la longitud rápida de FFT (par) necesaria y se elige entre TF e IR según
+    el muestreo, en lugar de rellenar todo "por seguridad".
+
+    Parameters:
+    -----------
+    u1 : numpy.ndarray
+        Campo en el plano fuente (N×N)
+    L : float
+        Lado del plano fuente (m)
+    lam : float
+        Longitud de onda (m)
+    z : float
+        Distancia de propagación (m)
+    method : str
+        'auto', 'TF' o 'IR'
+    pad : bool
+        Permite rellenar con ceros hasta una longitud rápida
+    crop : bool
+        Si True, el resultado se recorta a la malla original N×N de lado L;
+        si False, se devuelve la malla de cálculo completa
+    dtype : numpy.dtype
+        np.complex128 (por defecto) o np.complex64
+
+    Returns:
+    --------
+    u2 : numpy.ndarray
+        Campo en el plano de observación
+    info : dict
+        'method', 'N' (malla original), 'M' (malla de cálculo), 'dx',
+        'dx_critical' (λz/(M·dx)), 'L' (lado del resultado) y 'regime'
+        ('TF', 'IR' o 'critical')
+    """
+    u1 = np.asarray(u1)
+    N = u1.shape[-1]
+    dx = L / N
+
+    if method == 'auto':
+        method, M = select_method(N, L, lam, z, pad=pad)
+    elif method in ('TF', 'IR'):
+        M = fast_even_length(N) if pad else N
+    else:
+        raise ValueError(f"Método de propagación desconocido: {method}")
+
+    padded, offset = _pad_centered(u1, M)
+    L_calc = M * dx
+    prop = propTF if method == 'TF' else propIR
+    u2 = prop(padded, L_calc, lam, z, dtype=dtype, overwrite=padded is not u1)
+
+    if crop and M != N:
+        u2 = u2[..., offset:offset + N, offset:offset + N]
+
+    dx_critical = lam * z / L_calc
+    if np.isclose(dx, dx_critical):
+        regime = 'critical'
+    else:
+        regime = 'TF' if dx > dx_critical else 'IR'
+
+    info = {
+        'method': method,
+        'N': N,
+        'M': M,
+        'dx': dx,
+        'dx_critical': dx_critical,
+        'L': N * dx if crop else L_calc,
+        'regime': regime,
+    }
+    return u2, info
+
+
+def _sweep_planes(U1, phase, z_chunk, dtype, intensity, odd):
+    """
+    Propaga el espectro de la fuente `U1` a todas las distancias de `z_chunk`.
+
+    H(z) = exp(-i·z·phase) con phase = πλ(fx² + fy²). Si las distancias del
+    bloque son equiespaciadas, H se avanza por recurrencia,
+    H(z + Δz) = H(z)·H(Δz), con un producto complejo por plano en lugar de una
+    exponencial; cada bloque se reinicia con H exacta para acotar el error.
+    Las transformadas inversas del bloque se calculan en una sola llamada.
+    """
+    z_chunk = np.asarray(z_chunk, dtype=float)
+    U2 = np.empty((len(z_chunk),) + U1.shape, dtype=dtype)
+
+    steps = np.diff(z_chunk)
+    if len(z_chunk) > 2 and np.allclose(steps, steps[0], rtol=1e-9, atol=0):
+        step = np.exp(-1j * steps[0] * phase).astype(dtype, copy=False)
+        np.multiply(U1, np.exp(-1j * z_chunk[0] * phase), out=U2[0], casting='unsafe')
+        for j in range(1, len(z_chunk)):
+            np.multiply(U2[j - 1], step, out=U2[j])
+    else:
+        for j, z in enumerate(z_chunk):
+            np.multiply(U1, np.exp(-1j * z * phase), out=U2[j], casting='unsafe')
+
+    u2 = scipy_fft.ifft2(U2, axes=(-2, -1), overwrite_x=True, workers=FFT_WORKERS)
+    if odd:
+        u2 = np.fft.fftshift(u2, axes=(-2, -1))
+
+    if intensity:
+        return u2.real ** 2 + u2.imag ** 2
+    return u2
+
+
+_sweep_worker_state = {}
+
+
+def _init_sweep_worker(U1, phase, dtype, intensity, odd):
+    """Inicializa un proceso del barrido con el espectro de la fuente (una vez)"""
+    _sweep_worker_state.update(U1=U1, phase=phase, dtype=dtype, intensity=intensity, odd=odd)
+    # Un hilo por proceso: el paralelismo ya lo dan los procesos
+    global FFT_WORKERS
+    FFT_WORKERS = 1
+
+
+def _sweep_worker(z_chunk):
+    """Procesa un bloque de distancias en un proceso del pool"""
+    st = _sweep_worker_state
+    return _sweep_planes(st['U1'], st['phase'], z_chunk, st['dtype'], st['intensity'], st['odd'])
+
+
+def propTF_sweep(u1, L, lam, z_values, intensity=False, chunk_size=8,
+                 dtype=np.complex128, n_jobs=None):
+    """
+    Barrido de propagación de Fresnel (función de transferencia) a muchas
+    distancias reutilizando el espectro de la fuente.
+
+    La FFT de la fuente y la malla de frecuencias se calculan una sola vez;
+    cada plano cuesta un producto por H(z) y una FFT inversa. Los planos se
+    producen como un generador, en bloques de `chunk_size` (la memoria usada
+    es de unos `chunk_size` planos, no de todo el barrido).
+
+    Parameters:
+    -----------
+    u1 : numpy.ndarray
+        Campo en el plano fuente (N×N)
+    L : float
+        Lado del plano fuente y de observación (m)
+    lam : float
+        Longitud de onda (m)
+    z_values : array_like
+        Distancias de propagación (m); si son equiespaciadas, H(z) se avanza
+        por recurrencia
+    intensity : bool
+        Si True, se producen intensidades |u2|² (float) en lugar de campos
+    chunk_size : int
+        Número de planos por bloque
+    dtype : numpy.dtype
+        np.complex128 (por defecto) o np.complex64
+    n_jobs : int, optional
+        Si es mayor que 1, los bloques se reparten en un pool de procesos
+        (con a lo sumo 2·n_jobs bloques en vuelo para acotar la memoria)
+
+    Yields:
+    -------
+    z : float
+        Distancia del plano
+    u2 : numpy.ndarray
+        Campo (o intensidad) en el plano de observación a distancia z
+    """
+    u1 = np.asarray(u1)
+    N = u1.shape[-1]
+    odd = N % 2 == 1 or u1.shape[-2] % 2 == 1
+
+    source = np.fft.ifftshift(u1) if odd else u1
+    U1 = scipy_fft.fft2(source.astype(dtype, copy=True), overwrite_x=True, workers=FFT_WORKERS)
+
+    fx2 = np.fft.fftfreq(N, d=L / N) ** 2
+    phase = np.pi * lam * (fx2[:, np.newaxis] + fx2[np.newaxis, :])
+
+    z_values = np.asarray(z_values, dtype=float).ravel()
+    chunks = [z_values[i:i + chunk_size] for i in range(0, len(z_values), chunk_size)]
+
+    if not n_jobs or n_jobs <= 1:
+        for z_chunk in chunks:
+            planes = _sweep_planes(U1, phase, z_chunk, dtype, intensity, odd)
+            for z, plane in zip(z_chunk, planes):
+                yield z, plane
+        return
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_sweep_worker,
+                             initargs=(U1, phase, dtype, intensity, odd)) as pool:
+        pending = deque()
+        chunk_iter = iter(chunks)
+
+        for z_chunk in chunk_iter:
+            pending.append((z_chunk, pool.submit(_sweep_worker, z_chunk)))
+            if len(pending) >= 2 * n_jobs:
+                break
+
+        while pending:
+            z_chunk, future = pending.popleft()
+            planes = future.result()
+            next_chunk = next(chunk_iter, None)
+            if next_chunk is not None:
+                pending.append((next_chunk, pool.submit(_sweep_worker, next_chunk)))
+            for z, plane in zip(z_chunk, planes):
+                yield z, plane
+
+
+def clear_caches():
+    """Vacía las cachés de funciones de transferencia y factores de fase"""
+    for cached in (transfer_function, impulse_response_transfer, fraunhofer_factor):
+        cached.cache_clear()